@@ -1,22 +1,50 @@
+import logging
 import os
+import time
 from datetime import timedelta
+
+import click
 from flask import Flask, session, request, g, flash, redirect, url_for
+from flask.cli import FlaskGroup
 from dotenv import load_dotenv
-
-load_dotenv()
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy.engine import make_url
 
 from flask_bootstrap import Bootstrap5
 from flask_login import LoginManager
-from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect, CSRFError
-from flask_mail import Mail  # <--- NUEVO: Importar Mail
-from models import db, User
+from models import db, User, Project, init_replica, init_passwords
+from page_cache import page_cache
+from http_cache import template_fingerprint
 import routes_public, routes_admin
+import search
+import i18n
+import assets
+import media
+import metrics
+import db_profiles
+import logging_setup
+import jobs
+import mail_transport
+import session_store
+import static_export
+import user_cache
 
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+import ratelimit_storage  # registra el esquema sqlite:// en limits
+
+logger = logging.getLogger(__name__)
+
+def _in_flask_cli() -> bool:
+    """create_app llamado desde el comando `flask` (db upgrade, create-admin...), no desde gunicorn/uvicorn."""
+    ctx = click.get_current_context(silent=True)
+    return ctx is not None and isinstance(ctx.find_root().command, FlaskGroup)
 
 def create_app() -> Flask:
+    # .env en cada arranque (gunicorn/uvicorn no lo cargan); no pisa variables ya definidas
+    load_dotenv()
+
     # --- Base config ---
     app = Flask(__name__, instance_relative_config=True)
     os.makedirs(app.instance_path, exist_ok=True)
@@ -28,6 +56,22 @@ def create_app() -> Flask:
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DB_URI", f"sqlite:///{db_path}")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+    # Réplica de lectura opcional para las vistas públicas (ver models.use_replica)
+    app.config["DB_REPLICA_URI"] = os.getenv("DB_REPLICA_URI", "")  # vacío = sin réplica
+    app.config["DB_REPLICA_PIN_SECONDS"] = int(os.getenv("DB_REPLICA_PIN_SECONDS", 10))
+
+    # Perfil del engine (ver db_profiles.py): PRAGMAs en SQLite, pool dimensionado en Postgres
+    app.config["SQLITE_JOURNAL_MODE"] = os.getenv("SQLITE_JOURNAL_MODE", "WAL")  # persistente en el archivo
+    app.config["SQLITE_BUSY_TIMEOUT_MS"] = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    app.config["SQLITE_MMAP_SIZE"] = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    app.config["DB_WORKERS"] = int(os.getenv("WEB_CONCURRENCY", 1))  # el mismo valor que lee gunicorn
+    app.config["DB_THREADS_PER_WORKER"] = int(os.getenv("WEB_THREADS", 1))
+    app.config["DB_MAX_CONNECTIONS"] = int(os.getenv("DB_MAX_CONNECTIONS", 90))
+    # Presupuesto propio de la réplica (otro servidor); 0 = mitad de DB_MAX_CONNECTIONS
+    app.config["DB_REPLICA_MAX_CONNECTIONS"] = int(os.getenv("DB_REPLICA_MAX_CONNECTIONS", 0))
+    app.config["DB_POOL_SIZE"] = int(os.getenv("DB_POOL_SIZE", 0))  # 0 = calculado
+    app.config["DB_POOL_RECYCLE"] = int(os.getenv("DB_POOL_RECYCLE", 1800))
+
     # --- CONFIGURACIÓN EMAIL (SOLUCIÓN APLICADA) ---
     app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
     app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
@@ -41,91 +85,163 @@ def create_app() -> Flask:
     app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER', app.config['MAIL_USERNAME'])
     app.config['CONTACT_RECIPIENT'] = os.getenv('CONTACT_RECIPIENT', app.config['MAIL_USERNAME'])
 
+    # Conexión SMTP reutilizada por los workers (ver mail_transport.py)
+    app.config['MAIL_MAX_EMAILS'] = int(os.getenv('MAIL_MAX_EMAILS', 100))  # reconectar cada N correos
+    app.config['MAIL_KEEPALIVE_SECONDS'] = int(os.getenv('MAIL_KEEPALIVE_SECONDS', 30))
+
+    # --- RATE LIMIT ---
+    # memory:// es por proceso; con varios workers usar sqlite:/// (mismo host) o redis://
+    app.config["RATELIMIT_STORAGE_URI"] = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+    app.config["RATELIMIT_HEADERS_ENABLED"] = True  # X-RateLimit-* y Retry-After
+    app.config["CONTACT_RATE_LIMIT"] = os.getenv("CONTACT_RATE_LIMIT", "5 per 10 minutes;20 per day")
+
+    # --- CONTRASEÑAS (ver models.py) ---
+    # Hashes con otra política se actualizan solos en el siguiente login correcto
+    app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    app.config["PASSWORD_SALT_LENGTH"] = int(os.getenv("PASSWORD_SALT_LENGTH", 16))
+    # Verificaciones simultáneas por proceso (scrypt:32768 usa 32 MB cada una) y espera máxima
+    app.config["PASSWORD_HASH_CONCURRENCY"] = int(os.getenv("PASSWORD_HASH_CONCURRENCY", 2))
+    app.config["PASSWORD_HASH_WAIT"] = float(os.getenv("PASSWORD_HASH_WAIT", 2))
+    # Ajustar junto con el costo del hash: `python -m benchmarks.passwords`
+    app.config["ADMIN_LOGIN_RATE_LIMIT"] = os.getenv("ADMIN_LOGIN_RATE_LIMIT", "5 per 10 minutes")
+
+    # Caché por proceso de la identidad del usuario logueado; 0 = consultar en cada request
+    app.config["USER_CACHE_TTL"] = int(os.getenv("USER_CACHE_TTL", 30))
+
+    # --- COLA DE TRABAJOS (correo) ---
+    # JOB_WORKER_THREADS=0 desactiva los hilos en el proceso web (usar `flask jobs-worker`)
+    app.config["JOB_WORKER_THREADS"] = int(os.getenv("JOB_WORKER_THREADS", 2))
+    app.config["JOB_MAX_ATTEMPTS"] = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+    app.config["JOB_BACKOFF_BASE"] = int(os.getenv("JOB_BACKOFF_BASE", 30))
+    app.config["JOB_BATCH_SIZE"] = int(os.getenv("JOB_BATCH_SIZE", 20))
+    app.config["JOB_FLUSH_INTERVAL"] = float(os.getenv("JOB_FLUSH_INTERVAL", 1.0))
+
+    # --- CACHÉ DE PÁGINAS PÚBLICAS ---
+    # memory:// es por proceso: con varios workers de gunicorn usar sqlite:/// o redis://
+    # para que la invalidación del admin llegue a todos.
+    app.config["PAGE_CACHE_URL"] = os.getenv("PAGE_CACHE_URL", "memory://")
+    app.config["PAGE_CACHE_TTL"] = int(os.getenv("PAGE_CACHE_TTL", 300))
+    app.config["PAGE_CACHE_MAX_ENTRIES"] = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", 512))
+    # Parte de los ETag públicos: un deploy con HTML nuevo invalida las copias del navegador
+    app.config["TEMPLATE_FINGERPRINT"] = template_fingerprint(app)
+
+    # Filas por página en el dashboard y la bandeja de mensajes del admin (paginación por cursor)
+    app.config["ADMIN_PAGE_SIZE"] = int(os.getenv("ADMIN_PAGE_SIZE", 50))
+    # Tarjetas por página en /projects (el resto llega por scroll infinito)
+    app.config["PROJECTS_PAGE_SIZE"] = int(os.getenv("PROJECTS_PAGE_SIZE", 12))
+
+    # --- Métricas (/metrics, Server-Timing en debug) ---
+    app.config["METRICS_TOKEN"] = os.getenv("METRICS_TOKEN", "")  # vacío = /metrics desactivado (404)
+    app.config["REQUEST_BUDGET_MS"] = int(os.getenv("REQUEST_BUDGET_MS", 500))
+    app.config["REQUEST_QUERY_BUDGET"] = int(os.getenv("REQUEST_QUERY_BUDGET", 20))
+
+    # --- Logging (JSON por línea, escrito desde un hilo aparte; ver logging_setup.py) ---
+    app.config["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO").upper()
+    app.config["LOG_FILE"] = os.getenv("LOG_FILE", "")  # vacío = solo stderr
+    app.config["LOG_MAX_BYTES"] = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+    app.config["LOG_BACKUP_COUNT"] = int(os.getenv("LOG_BACKUP_COUNT", 5))
+    app.config["LOG_SAMPLE_RATES"] = logging_setup.parse_rates(
+        os.getenv("LOG_SAMPLE_RATES", "contact.honeypot=0.1,contact.duplicate=0.1"))
+
     # --- SEGURIDAD DE SESIÓN ---
     app.config["SESSION_PERMANENT"] = False 
     app.config["PERMANENT_SESSION_LIFETIME"] = timedelta(minutes=30)
     app.config["SESSION_COOKIE_SECURE"] = False 
     app.config["SESSION_COOKIE_HTTPONLY"] = True 
+    # Sesiones en el servidor (ver session_store.py): vacío = cookie firmada de Flask
+    app.config["SESSION_STORE_URL"] = os.getenv("SESSION_STORE_URL", "")
+    app.config["SESSION_SWEEP_PROBABILITY"] = float(os.getenv("SESSION_SWEEP_PROBABILITY", 0.01))
 
-    print("DB URI ->", app.config["SQLALCHEMY_DATABASE_URI"])
-    print(f"📧 Mail Config: TLS={app.config['MAIL_USE_TLS']}, User={app.config['MAIL_USERNAME']}") # Debug print
+    # --- ARRANQUE RÁPIDO (cold start de cada worker) ---
+    # Plantillas compiladas a bytecode en disco: el primer render de un worker nuevo
+    # no vuelve a compilar Jinja (se invalida solo si cambia el archivo fuente)
+    app.config["JINJA_BYTECODE_CACHE_DIR"] = os.getenv(
+        "JINJA_BYTECODE_CACHE_DIR", os.path.join(app.instance_path, "jinja_cache"))  # vacío = desactivado
+    if app.config["JINJA_BYTECODE_CACHE_DIR"]:
+        os.makedirs(app.config["JINJA_BYTECODE_CACHE_DIR"], exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config["JINJA_BYTECODE_CACHE_DIR"])
 
     # --- Extensions ---
+    # Antes que nada: request_id disponible para cualquier log del request
+    logging_setup.init_app(app)
+    logger.info("App created", extra={
+        "event": "app.created",
+        "db": make_url(app.config["SQLALCHEMY_DATABASE_URI"]).render_as_string(hide_password=True),
+        "mail_tls": app.config["MAIL_USE_TLS"],
+        "mail_user": app.config["MAIL_USERNAME"],
+    })
+    # Primero: su after_request corre al final y mide todo el request
+    metrics.init_app(app)
     Bootstrap5(app)
     CSRFProtect(app)
+    # Cookie de sesión firmada o id opaco + store del servidor
+    session_store.init_app(app)
+    # Opciones del pool antes de crear el engine; los PRAGMAs se enganchan después
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = db_profiles.engine_options(
+        app.config["SQLALCHEMY_DATABASE_URI"], app.config)
+    if app.config["DB_REPLICA_URI"]:
+        app.config["DB_REPLICA_ENGINE_OPTIONS"] = db_profiles.replica_engine_options(
+            app.config["DB_REPLICA_URI"], app.config)
     db.init_app(app)
-    Migrate(app, db)
-    Mail(app) # <--- NUEVO: Inicializar Mail
+    init_replica(app)
+    init_passwords(app)
+    db_profiles.init_app(app)
+    # Alembic (~100 ms de import) solo para `flask db ...`; los workers no lo necesitan
+    if _in_flask_cli():
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    # Flask-Mail se importa en el primer envío (ver mail_transport.LazyMail)
+    app.extensions["mail"] = mail_transport.LazyMail(app)
+    page_cache.init_app(app)
+    jobs.init_app(app)
+    # Estáticos con huella (static/dist/manifest.json, generado por `flask assets-build`)
+    assets.init_app(app)
+    # Portadas subidas (instance/media, /media/<sha256>/<variant>.webp)
+    media.init_app(app)
     
     # Rate Limiter
     limiter = Limiter(
         key_func=get_remote_address,
         app=app,
-        storage_uri="memory://",
+        storage_uri=app.config["RATELIMIT_STORAGE_URI"],
         default_limits=["200 per day", "50 per hour"]
     )
+    # RATELIMIT_ENABLED=0 (benchmarks de carga). Se apaga después de init_app: con
+    # RATELIMIT_ENABLED=False en la config, Flask-Limiter no se registra en la app
+    # y los decoradores de las rutas fallan con ReferenceError.
+    limiter.enabled = os.getenv("RATELIMIT_ENABLED", "True").lower() in ['true', '1', 'yes', 'on']
+    # El scraper de /metrics no gasta (ni agota) el cupo diario de su IP
+    if "metrics" in app.view_functions:
+        limiter.exempt(app.view_functions["metrics"])
 
     # --- Login manager ---
     login_manager = LoginManager()
     login_manager.login_view = "admin_login"
     login_manager.init_app(app)
 
+    # Identidad en caché con TTL (ver user_cache.py): el admin no paga una consulta por request
+    user_cache.init_app(app)
+
     @login_manager.user_loader
     def load_user(user_id):
-        return db.session.get(User, int(user_id))
+        return user_cache.load_user(int(user_id))
 
     # --- MANEJO DE ERROR CSRF (NUEVO) ---
     # Si el token expira, redirige suavemente al contacto con un aviso
     @app.errorhandler(CSRFError)
     def handle_csrf_error(e):
+        logger.info("CSRF token rejected", extra={"event": "csrf.rejected", "path": request.path, "reason": e.description})
         flash("La sesión del formulario ha expirado. Por favor intenta de nuevo.", "error")
         return redirect(url_for('contact'))
 
     # --- Register routes ---
     # IMPORTANTE: Pasamos 'limiter' a routes_public para usar @limiter.limit
     routes_public.register(app, limiter) 
-    routes_admin.register(app)
+    routes_admin.register(app, limiter)
     
     # --- Internationalization ---
-    translations = {
-        'en': {
-            'brand_left': 'CARLOS',
-            'brand_right': '_SIBRIAN',
-            'home': 'Home',
-            'about': 'About',
-            'projects': 'Projects',
-            'contact': 'Contact',
-            'cta': 'Contact Me',
-            'hero_tagline': 'Developer building modern web experiences with Flask, Bootstrap and JS.',
-            'form_name' : 'Name',
-            'form_email': 'Email',
-            'form_message': 'Message',
-            'form_send': 'Send',
-            },
-        'es': {
-            'brand_left': 'CARLOS',
-            'brand_right': '_SIBRIAN',
-            'home': 'Inicio',
-            'about': 'Sobre mí',
-            'projects': 'Proyectos',
-            'contact': 'Contacto',
-            'cta': 'Contáctame',
-            'hero_tagline': 'Desarrollador creando experiencias web modernas con Flask, Bootstrap y JS.',
-            'form_name': 'Nombre',
-            'form_email': 'Correo',
-            'form_message': 'Mensaje',
-            'form_send': 'Enviar',
-        }
-    }
-
-    @app.context_processor
-    def inject_lang():
-        def current_lang():
-            return session.get('lang', 'en')
-        def t(key):
-            lang = session.get('lang', 'en')
-            return translations.get(lang, {}).get(key, key)
-        return {'current_lang': current_lang, 't': t}
+    # Catálogo precompilado en i18n.py; el idioma se resuelve una vez por request
+    i18n.init_app(app)
 
     # --- CLI: create admin ---
     @app.cli.command("create-admin")
@@ -148,6 +264,57 @@ def create_app() -> Flask:
         db.session.commit()
         print(f"Admin ready: {email}")
 
+    # --- CLI: backfill tech tags ---
+    @app.cli.command("backfill-techs")
+    def backfill_techs():
+        """Rebuild project_techs from the tech_stack CSV of every project."""
+        count = 0
+        for project in db.session.execute(db.select(Project)).scalars():
+            project.sync_techs()
+            count += 1
+        db.session.commit()
+        print(f"Tech tags rebuilt for {count} projects.")
+
+    # --- CLI: job worker ---
+    @app.cli.command("jobs-worker")
+    @click.option("--once", is_flag=True, help="Process ready jobs and exit.")
+    def jobs_worker(once):
+        """Consume the jobs table (dedicated process instead of in-web threads)."""
+        if once:
+            print(f"Processed {jobs.run_pending()} jobs.")
+            app.extensions["smtp_pool"].close()
+            return
+        pool = app.extensions["jobs"]
+        pool.start()
+        print("Job worker running. Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pool.stop()
+
+    # --- CLI: rebuild full-text index ---
+    @app.cli.command("search-reindex")
+    def search_reindex():
+        """Create (if missing) and rebuild the full-text search index."""
+        with db.engine.begin() as conn:
+            search.create_index(conn)
+        search.rebuild_index()
+        print("Search index rebuilt.")
+
+    # --- CLI: static export ---
+    @app.cli.command("export-static")
+    @click.argument("out_dir", required=False)
+    @click.option("--lang", "langs", multiple=True, type=click.Choice(sorted(i18n.LANGUAGES)),
+                  help="Only these languages (default: all).")
+    @click.option("--force", is_flag=True, help="Re-render every page, even unchanged ones.")
+    def export_static(out_dir, langs, force):
+        """Pre-render public pages to static HTML (only pages whose content changed)."""
+        out_dir = out_dir or os.getenv("STATIC_EXPORT_DIR") or os.path.join(app.instance_path, "static_site")
+        stats = static_export.export_site(app, out_dir, langs=langs, force=force)
+        print(f"Static site at {out_dir}: {stats['rendered']} rendered, "
+              f"{stats['unchanged']} unchanged, {stats['removed']} removed, {stats['skipped']} skipped.")
+
     # --- ANTI-CACHÉ Y SEGURIDAD ---
     @app.after_request
     def add_security_headers(response):
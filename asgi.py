@@ -0,0 +1,176 @@
+# asgi.py
+"""
+Entrada ASGI de la app (alternativa a gunicorn con workers sync):
+
+    uvicorn asgi:app --workers 2                 # ASGI_THREADS hilos por proceso
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker -w 2
+
+Las vistas siguen siendo síncronas (Flask-SQLAlchemy no tiene sesión async y no hay
+driver async instalado). Lo que cambia es quién espera: el event loop acepta y
+lee/escribe las conexiones, y cada request corre en un pool de ASGI_THREADS hilos.
+Una espera de base de datos ocupa un hilo (~100 KB de pila), no un proceso entero,
+así que con la misma memoria caben muchos más requests en vuelo que con `-k sync`.
+El envío de correo ya no está en el request (cola de jobs.py).
+
+No usa asgiref.WsgiToAsgi: su sync_to_async por defecto es thread_sensitive y
+serializa todos los requests del proceso en un único hilo.
+"""
+import asyncio
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THREADS = 32
+
+_ERROR_START = {
+    "type": "http.response.start",
+    "status": 500,
+    "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", b"21")],
+}
+
+
+class WSGIAdapter:
+    """Adaptador ASGI (http + lifespan) -> WSGI con un pool de hilos acotado."""
+
+    def __init__(self, wsgi_app, threads=DEFAULT_THREADS):
+        self.wsgi_app = wsgi_app
+        self.threads = threads
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="asgi")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        # El cuerpo se lee en el loop (no bloquea hilos con clientes lentos)
+        body = SpooledTemporaryFile(max_size=1024 * 1024)
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                body.close()
+                return
+            body.write(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        body.seek(0)
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self.executor, self._run, scope, body, send, loop)
+        finally:
+            body.close()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    def environ(scope, body) -> dict:
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        root_path = scope.get("root_path", "")
+        path = scope["path"]
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            # WSGI: str con los bytes originales en latin-1
+            "SCRIPT_NAME": root_path.encode().decode("latin-1"),
+            "PATH_INFO": path.encode().decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": str(server[0]),
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": client[0],
+            "REMOTE_PORT": str(client[1]),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": body,
+            # El cuerpo ya está completo: sin Content-Length (chunked) se lee hasta EOF
+            "wsgi.input_terminated": True,
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        for raw_name, raw_value in scope.get("headers", []):
+            name = raw_name.decode("latin-1").upper().replace("-", "_")
+            value = raw_value.decode("latin-1")
+            if name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = name
+            else:
+                key = f"HTTP_{name}"
+            if key in environ:
+                # RFC 6265: varios Cookie se unen con "; " (con "," el parser los mezcla)
+                value = f"{environ[key]}{'; ' if key == 'HTTP_COOKIE' else ','}{value}"
+            environ[key] = value
+        return environ
+
+    def _run(self, scope, body, send, loop):
+        # Corre en un hilo del pool: cada mensaje se entrega al loop y se espera
+        # (contrapresión: un cliente lento frena solo a su propio hilo)
+        def push(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response.get("sent"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response["start"] = {
+                "type": "http.response.start",
+                "status": int(status.split(" ", 1)[0]),
+                "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+            }
+            return lambda data: None  # write() obsoleto; Flask no lo usa
+
+        result = self.wsgi_app(self.environ(scope, body), start_response)
+        try:
+            for chunk in result:
+                if not chunk:
+                    continue
+                if not response.get("sent"):
+                    push(response["start"])
+                    response["sent"] = True
+                push({"type": "http.response.body", "body": chunk, "more_body": True})
+            if not response.get("sent"):
+                if "start" not in response:
+                    # La app terminó sin llamar a start_response: 500 en vez de KeyError
+                    logger.error("WSGI app returned without calling start_response",
+                                 extra={"event": "asgi.no_start_response", "path": scope["path"]})
+                    response["start"] = _ERROR_START
+                    push(response["start"])
+                    push({"type": "http.response.body", "body": b"Internal Server Error", "more_body": True})
+                else:
+                    push(response["start"])
+            push({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+
+def create_asgi_app():
+    threads = int(os.getenv("ASGI_THREADS", DEFAULT_THREADS))
+    # El pool de SQLAlchemy (db_profiles) se dimensiona con los hilos que lo usan
+    os.environ.setdefault("WEB_THREADS", str(threads))
+    from app import create_app
+    return WSGIAdapter(create_app(), threads)
+
+
+def __getattr__(name):
+    # `uvicorn asgi:app` crea la app al importar el atributo, no al importar el módulo
+    if name == "app":
+        globals()["app"] = create_asgi_app()
+        return globals()["app"]
+    raise AttributeError(name)
@@ -0,0 +1,365 @@
+# assets.py
+"""
+Pipeline de estáticos: `flask assets-build` genera static/dist/ con
+
+- nombres con huella de contenido (css/main.3f9c2a1b7d.css),
+- CSS/JS minificados (conservador: comentarios + indentación, sin reescribir código),
+- imports de los módulos ES y URLs de imágenes reescritos a sus nombres con huella,
+- copias precomprimidas .gz (y .br si está instalado `brotli`),
+- derivados WebP/AVIF por ancho de static/img (images.py, si hay Pillow),
+- static/dist/manifest.json: nombre lógico -> archivo con huella + grafo de imports.
+
+En runtime, url_for('static', filename='css/main.css') devuelve la versión con huella
+(url_defaults), y /static/dist/* se sirve con `Cache-Control: immutable` y la variante
+precomprimida que acepte el navegador. Sin manifest (desarrollo) todo funciona como antes.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+
+import click
+from flask import current_app, request, send_from_directory
+from markupsafe import Markup, escape
+
+import images
+
+try:
+    import brotli
+except ImportError:  # opcional: solo .gz
+    brotli = None
+
+DIST = "dist"
+MANIFEST = "manifest.json"
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt", ".html")
+MIN_COMPRESS_SIZE = 512
+
+_JS_IMPORT = re.compile(r"""(\bfrom\s*|\bimport\s*\(?\s*)(['"])(\.{1,2}/[^'"]+)\2""")
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_CSS_STRING = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+_CSS_STRING_OR_COMMENT = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/""", re.S)
+
+
+# --- MINIFICACIÓN ---
+
+def minify_css(source: str) -> str:
+    # Quitar comentarios sin tocar strings ("/*" dentro de content: '...')
+    source = _CSS_STRING_OR_COMMENT.sub(lambda m: m.group(1) or "", source)
+    parts = _CSS_STRING.split(source)
+    for i in range(0, len(parts), 2):  # índices impares = strings literales
+        chunk = re.sub(r"\s+", " ", parts[i])
+        # Solo alrededor de separadores que nunca son significativos ({ } ; , y ':' de declaraciones)
+        chunk = re.sub(r"\s*([{};,])\s*", r"\1", chunk)
+        parts[i] = re.sub(r":\s+", ":", chunk).replace(";}", "}")
+    return "".join(parts).strip()
+
+
+# Tras estas palabras un "/" abre una regex (return /x/.test(s)), no es una división
+_REGEX_KEYWORDS = frozenset({
+    "return", "typeof", "case", "throw", "in", "of", "yield", "await", "delete", "void",
+    "instanceof", "new", "do", "else",
+})
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "_$"
+
+
+def _regex_allowed(prev: str) -> bool:
+    """¿Un "/" después del token `prev` abre una regex?"""
+    if not prev:
+        return True
+    if _is_word_char(prev[0]):
+        return prev in _REGEX_KEYWORDS
+    return prev[-1] in "(,=:[!&|?{};+-*%<>~^"
+
+
+def minify_js(source: str) -> str:
+    """
+    Quita comentarios, indentación y líneas vacías. Conserva los saltos de línea (ASI)
+    y no toca strings, template literals ni regex. Un literal sin cerrar es un error
+    (ValueError): seguir borraría como comentario código que no lo es.
+    """
+    out = []
+    i, n = 0, len(source)
+    line_start = True
+    prev = ""  # último token significativo emitido (para distinguir regex de división)
+    while i < n:
+        ch = source[i]
+        if ch in " \t" and line_start:
+            i += 1
+            continue
+        if ch == "\n":
+            while out and out[-1] in (" ", "\t"):
+                out.pop()
+            if not line_start:
+                out.append("\n")
+            line_start = True
+            i += 1
+            continue
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+
+        start = i
+        if ch in "'\"`" or (ch == "/" and _regex_allowed(prev)):
+            # Literal: copiar tal cual hasta el delimitador sin escapar
+            i += 1
+            in_class = False
+            while i < n:
+                c = source[i]
+                if c == "\\":
+                    i += 2
+                    continue
+                if ch == "/" and c == "[":
+                    in_class = True
+                elif ch == "/" and c == "]":
+                    in_class = False
+                elif c == ch and not in_class:
+                    break
+                elif c == "\n" and ch != "`":
+                    break
+                i += 1
+            if i >= n or source[i] != ch:
+                line = source.count("\n", 0, start) + 1
+                kind = {"/": "regex", "`": "template"}.get(ch, "string")
+                raise ValueError(f"Unterminated {kind} literal at line {line}")
+            i += 1
+        elif _is_word_char(ch):
+            # Identificador / palabra clave / número completo: `return` es un token, no una "n"
+            while i < n and _is_word_char(source[i]):
+                i += 1
+        else:
+            i += 1
+        token = source[start:i]
+        out.append(token)
+        if token.strip():
+            # obj.in / obj.of son propiedades: "." + nombre ya no cuenta como palabra clave
+            prev = "." + token if prev == "." and _is_word_char(token[0]) else token
+        line_start = False
+    return "".join(out).strip() + "\n"
+
+
+# --- BUILD ---
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def _hashed_name(logical: str, data: bytes) -> str:
+    root, ext = posixpath.splitext(logical)
+    return f"{root}.{_digest(data)}{ext}"
+
+
+def _js_imports(logical: str, source: str) -> list[str]:
+    base = posixpath.dirname(logical)
+    return [posixpath.normpath(posixpath.join(base, spec)) for _, _, spec in _JS_IMPORT.findall(source)]
+
+
+def _js_order(sources: dict) -> list[str]:
+    """Orden topológico: dependencias antes que quien las importa (su huella depende de ellas)."""
+    order, seen = [], set()
+
+    def visit(name, stack=()):
+        if name in seen or name not in sources:
+            return
+        if name in stack:
+            raise ValueError(f"Import cycle: {' -> '.join(stack + (name,))}")
+        for dep in _js_imports(name, sources[name]):
+            visit(dep, stack + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for name in sorted(sources):
+        visit(name)
+    return order
+
+
+def _write(out_dir: str, name: str, data: bytes) -> None:
+    path = os.path.join(out_dir, *name.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as fh:
+        fh.write(data)
+    if name.endswith(COMPRESSIBLE) and len(data) >= MIN_COMPRESS_SIZE:
+        with open(path + ".gz", "wb") as fh:
+            fh.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(path + ".br", "wb") as fh:
+                fh.write(brotli.compress(data, quality=11))
+
+
+def build(static_folder: str, static_url_path: str = "/static", variants: bool = True) -> dict:
+    """Construir static/dist/ y devolver el manifest (variants=False: sin derivados de imagen)."""
+    out_dir = os.path.join(static_folder, DIST)
+    shutil.rmtree(out_dir, ignore_errors=True)
+
+    files, text_sources = {}, {}
+    for folder, dirs, names in os.walk(static_folder):
+        dirs[:] = sorted(d for d in dirs if os.path.join(folder, d) != out_dir)
+        for fname in sorted(names):
+            logical = os.path.relpath(os.path.join(folder, fname), static_folder).replace(os.sep, "/")
+            with open(os.path.join(folder, fname), "rb") as fh:
+                data = fh.read()
+            if logical.endswith((".css", ".js")):
+                text_sources[logical] = data.decode("utf-8")
+            else:
+                files[logical] = _hashed_name(logical, data)
+                _write(out_dir, files[logical], data)
+
+    # Derivados responsivos (AVIF/WebP por ancho) si Pillow está instalado
+    image_variants = images.build_variants(
+        static_folder, lambda name, data: _write(out_dir, name, data), list(files)) if variants else {}
+
+    def absolute(match):
+        quote, path = match.group(1), match.group(2)
+        hashed = files.get(path)
+        return f"{quote}{static_url_path}/{DIST}/{hashed}{quote}" if hashed else match.group(0)
+
+    # Rutas absolutas "/static/img/x.png" dentro de JS (AssetLoader)
+    static_literal = re.compile(r"""(['"])%s/([^'"]+)\1""" % re.escape(static_url_path))
+
+    # 1. CSS: url(...) relativo a la hoja -> nombre con huella (también relativo)
+    for logical in sorted(n for n in text_sources if n.endswith(".css")):
+        base = posixpath.dirname(logical)
+
+        def relink(match, base=base):
+            quote, ref = match.group(1), match.group(2)
+            if re.match(r"^(?:[a-z]+:|//|#|/)", ref):
+                return match.group(0)
+            target = files.get(posixpath.normpath(posixpath.join(base, ref)))
+            if target is None:
+                return match.group(0)
+            return f"url({quote}{posixpath.relpath(target, base)}{quote})"
+
+        data = minify_css(_CSS_URL.sub(relink, text_sources[logical])).encode()
+        files[logical] = _hashed_name(logical, data)
+        _write(out_dir, files[logical], data)
+
+    # 2. JS: dependencias primero, reescribiendo los especificadores de import
+    js_sources = {n: s for n, s in text_sources.items() if n.endswith(".js")}
+    imports = {}
+    for logical in _js_order(js_sources):
+        base = posixpath.dirname(logical)
+        imports[logical] = _js_imports(logical, js_sources[logical])
+
+        def respec(match, base=base):
+            prefix, quote, spec = match.groups()
+            target = files.get(posixpath.normpath(posixpath.join(base, spec)))
+            if target is None:
+                return match.group(0)
+            rel = posixpath.relpath(target, base)
+            return f"{prefix}{quote}{rel if rel.startswith('.') else './' + rel}{quote}"
+
+        source = _JS_IMPORT.sub(respec, js_sources[logical])
+        data = minify_js(static_literal.sub(absolute, source)).encode()
+        files[logical] = _hashed_name(logical, data)
+        _write(out_dir, files[logical], data)
+
+    manifest = {"files": files, "imports": {k: v for k, v in imports.items() if v},
+                "images": image_variants}
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    return manifest
+
+
+# --- RUNTIME ---
+
+def load_manifest(app) -> dict | None:
+    path = os.path.join(app.static_folder, DIST, MANIFEST)
+    if not app.config.get("ASSETS_USE_MANIFEST", True) or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _preload_closure(manifest, entry):
+    graph = manifest.get("imports", {})
+    ordered, stack = [], list(graph.get(entry, []))
+    while stack:
+        name = stack.pop(0)
+        if name not in ordered:
+            ordered.append(name)
+            stack.extend(graph.get(name, []))
+    return ordered
+
+
+def init_app(app):
+    app.config.setdefault("ASSETS_USE_MANIFEST", True)
+    manifest = load_manifest(app)
+    app.extensions["assets"] = manifest
+
+    @app.cli.command("assets-build")
+    @click.option("--no-images", is_flag=True, help="Skip WebP/AVIF image variants (faster).")
+    def assets_build(no_images):
+        """Fingerprint, minify and precompress static/ into static/dist/."""
+        result = build(app.static_folder, app.static_url_path, variants=not no_images)
+        print(f"✅ {len(result['files'])} assets, {len(result['images'])} con derivados"
+              f" -> {os.path.join(app.static_folder, DIST)}")
+        if brotli is None:
+            print("⚠️ brotli no instalado: solo .gz")
+        if not images.available():
+            print("⚠️ Pillow no instalado: sin variantes WebP/AVIF")
+
+    @app.context_processor
+    def _inject_assets():
+        return {"asset_preloads": asset_preloads, "picture": images.picture,
+                "asset_image_map": images.asset_image_map}
+
+    if manifest is None:
+        return
+    files = manifest["files"]
+
+    # url_for('static', filename='css/main.css') -> /static/dist/css/main.<hash>.css
+    @app.url_defaults
+    def _fingerprint(endpoint, values):
+        if endpoint == "static":
+            hashed = files.get(values.get("filename"))
+            if hashed:
+                values["filename"] = f"{DIST}/{hashed}"
+
+    dist_dir = os.path.join(app.static_folder, DIST)
+
+    def static(filename):
+        if not filename.startswith(DIST + "/") or filename.endswith(MANIFEST):
+            return app.send_static_file(filename)
+        name = filename[len(DIST) + 1:]
+        mimetype = mimetypes.guess_type(name)[0]
+        encodings = request.accept_encodings
+        for encoding, ext in (("br", ".br"), ("gzip", ".gz")):
+            if encodings[encoding] and os.path.isfile(os.path.join(dist_dir, *(name + ext).split("/"))):
+                response = send_from_directory(dist_dir, name + ext, mimetype=mimetype, max_age=None)
+                response.content_encoding = encoding
+                break
+        else:
+            response = send_from_directory(dist_dir, name, mimetype=mimetype, max_age=None)
+        if name.endswith(COMPRESSIBLE):
+            response.vary.add("Accept-Encoding")
+        # El nombre cambia con el contenido: el navegador nunca necesita revalidar
+        response.headers["Cache-Control"] = IMMUTABLE
+        return response
+
+    app.view_functions["static"] = static
+
+
+def asset_preloads(entry: str) -> Markup:
+    """<link rel="modulepreload"> para todo el grafo de imports de `entry` (un solo viaje)."""
+    from flask import url_for
+
+    manifest = current_app.extensions.get("assets")
+    if not manifest:
+        return Markup("")
+    links = [
+        f'<link rel="modulepreload" href="{escape(url_for("static", filename=name))}">'
+        for name in _preload_closure(manifest, entry)
+    ]
+    return Markup("\n  ".join(links))
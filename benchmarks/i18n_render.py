@@ -0,0 +1,76 @@
+# benchmarks/i18n_render.py
+"""
+Tiempo de render de plantillas: t()/get_loc_attr por llamada (antes) vs catálogo
+precompilado de i18n.py (ahora).
+
+"antes" reproduce el helper original: session.get('lang') + dos dict.get en cada t(),
+y getattr probando `*_es` en cada get_loc_attr. Ambas variantes renderizan la misma
+plantilla (la tarjeta real de proyectos + la barra de navegación traducida).
+
+Uso:
+    python -m benchmarks.i18n_render                 # 12, 100, 500 tarjetas
+    python -m benchmarks.i18n_render 50 1000
+"""
+import os
+import sys
+import tempfile
+
+from benchmarks.tech_filter import _time
+
+TEMPLATE = """
+{% for key in keys %}{{ t(key) }}{% endfor %}
+{% for project in projects %}{% include "public/projects/_card.html" %}{% endfor %}
+"""
+KEYS = ["home", "about", "projects", "contact", "cta", "search", "brand_left", "brand_right"]
+
+
+def _legacy_helpers(translations):
+    from flask import session
+
+    def t(key):
+        lang = session.get('lang', 'en')
+        return translations.get(lang, {}).get(key, key)
+
+    def get_loc_attr(obj, attr_name):
+        lang = session.get('lang', 'en')
+        if lang == 'es':
+            val = getattr(obj, f"{attr_name}_es", None)
+            if val: return val
+        return getattr(obj, attr_name)
+
+    return {"t": t, "get_loc_attr": get_loc_attr, "current_lang": lambda: session.get('lang', 'en')}
+
+
+def run(sizes):
+    from flask import render_template_string, session
+    from app import create_app
+    from models import Project
+    import i18n
+
+    translations = {lang: dict(catalog) for lang, catalog in i18n.CATALOGS.items()}
+    legacy = _legacy_helpers(translations)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("DB_URI", f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        app = create_app()
+
+    print(f"{'cards':>6} | {'lang':>4} | {'before ms':>9} | {'after ms':>9}")
+    for n in sizes:
+        projects = [
+            Project(id=i, title=f"Project {i}", slug=f"project-{i}", summary="Summary " * 8,
+                    title_es=f"Proyecto {i}" if i % 2 else "", summary_es="", tech_stack="Flask, React")
+            for i in range(n)
+        ]
+        for lang in ("en", "es"):
+            with app.test_request_context("/projects"):
+                session["lang"] = lang
+                app.preprocess_request()  # before_request: resuelve g.lang
+                before = _time(lambda: render_template_string(
+                    TEMPLATE, keys=KEYS * 4, projects=projects, **legacy))
+                after = _time(lambda: render_template_string(
+                    TEMPLATE, keys=KEYS * 4, projects=projects))
+            print(f"{n:>6} | {lang:>4} | {before:>9.2f} | {after:>9.2f}")
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or [12, 100, 500])
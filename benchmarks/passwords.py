@@ -0,0 +1,129 @@
+# benchmarks/passwords.py
+"""
+Costo de CPU de cada login de admin, para ajustar juntos la política de hash
+(PASSWORD_HASH_METHOD) y el rate limit del login (ADMIN_LOGIN_RATE_LIMIT).
+
+1. Por política: CPU y memoria de UNA verificación (check_password_hash).
+2. Capacidad: con el límite por IP dado, cuántas IPs atacando a la vez hacen
+   falta para ocupar N núcleos solo verificando contraseñas, y cuántos logins/s
+   aguanta cada núcleo.
+3. Login completo (POST al formulario, test client) con la política actual:
+   contraseña correcta, incorrecta y email inexistente (debe costar lo mismo:
+   la verificación en falso evita el oráculo de tiempos).
+
+Uso:
+    python -m benchmarks.passwords
+    python -m benchmarks.passwords --method scrypt:16384:8:1 --limit "10 per minute" --cores 4
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHODS = ["pbkdf2:sha256:600000", "scrypt:16384:8:1", "scrypt:32768:8:1", "scrypt:65536:8:1"]
+
+
+def _memory_mb(method: str) -> float:
+    # scrypt reserva 128 * r * N bytes por verificación; pbkdf2 ~ nada
+    if method.startswith("scrypt"):
+        _, n, r, _ = method.split(":")
+        return 128 * int(r) * int(n) / (1024 * 1024)
+    return 0.0
+
+
+def measure_check(method: str, runs: int) -> dict:
+    stored = generate_password_hash("correct horse battery", method=method)
+    cpu, wall = [], []
+    for _ in range(runs):
+        c0, w0 = time.process_time(), time.perf_counter()
+        check_password_hash(stored, "correct horse battery")
+        cpu.append((time.process_time() - c0) * 1000)
+        wall.append((time.perf_counter() - w0) * 1000)
+    return {"method": method, "cpu_ms": statistics.median(cpu), "wall_ms": statistics.median(wall),
+            "memory_mb": _memory_mb(method)}
+
+
+def capacity(cpu_ms: float, limit: str, cores: int) -> dict:
+    """IPs necesarias para saturar `cores` con intentos al ritmo máximo que deja el limiter."""
+    from limits import parse_many
+    # El límite más estricto de la cadena ("5 per 10 minutes;20 per day") es el que manda a largo plazo
+    per_ip = min(item.amount / item.get_expiry() for item in parse_many(limit))
+    per_core = 1000 / cpu_ms
+    return {"per_ip_per_s": per_ip, "logins_per_core_s": per_core, "ips_to_saturate": cores * per_core / per_ip}
+
+
+def measure_login(method: str, runs: int) -> dict:
+    """CPU por POST de login (con CSRF apagado) para los tres casos."""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_URI"] = f"sqlite:///{os.path.join(tmp, 'passwords.db')}"
+        os.environ.setdefault("LOG_LEVEL", "ERROR")
+        os.environ["RATELIMIT_ENABLED"] = "0"
+        from app import create_app
+        from models import db, User
+        app = create_app()
+        app.config.update(TESTING=True, WTF_CSRF_ENABLED=False, JOB_WORKER_THREADS=0,
+                          PASSWORD_HASH_METHOD=method, PASSWORD_HASH_WAIT=60)
+        with app.app_context():
+            db.create_all()
+            user = User(email="admin@example.com", name="Admin", is_admin=True)
+            user.set_password("correct horse battery")
+            db.session.add(user)
+            db.session.commit()
+
+        login_path = os.getenv("ADMIN_LOGIN_PATH", "/admin/login") or "/admin/login"
+        cases = {
+            "valid": ("admin@example.com", "correct horse battery"),
+            "wrong_password": ("admin@example.com", "nope"),
+            "unknown_email": ("nobody@example.com", "nope"),
+        }
+        result = {}
+        client = app.test_client()
+        client.post(login_path, data=dict(zip(("email", "password"), cases["unknown_email"])))  # warm-up
+        for name, (email, password) in cases.items():
+            cpu = []
+            for _ in range(runs):
+                c0 = time.process_time()
+                client.post(login_path, data={"email": email, "password": password})
+                cpu.append((time.process_time() - c0) * 1000)
+                client.get("/admin/logout")
+            result[name] = statistics.median(cpu)
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.passwords")
+    parser.add_argument("--method", action="append", help="werkzeug method string (repeatable)")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--limit", default=os.getenv("ADMIN_LOGIN_RATE_LIMIT", "5 per 10 minutes"),
+                        help="ADMIN_LOGIN_RATE_LIMIT to evaluate")
+    parser.add_argument("--cores", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-login", action="store_true", help="skip the end-to-end login measurement")
+    args = parser.parse_args(argv)
+
+    methods = args.method or DEFAULT_METHODS
+    print(f"Hash cost (median of {args.runs}) and capacity with limit '{args.limit}' on {args.cores} core(s):")
+    print(f"  {'method':<22} | {'CPU ms':>7} | {'wall ms':>7} | {'mem MB':>6} | {'logins/s/core':>13} | IPs to saturate")
+    for method in methods:
+        r = measure_check(method, args.runs)
+        cap = capacity(r["cpu_ms"], args.limit, args.cores)
+        print(f"  {method:<22} | {r['cpu_ms']:>7.1f} | {r['wall_ms']:>7.1f} | {r['memory_mb']:>6.0f} | "
+              f"{cap['logins_per_core_s']:>13.1f} | {cap['ips_to_saturate']:,.0f}")
+
+    if not args.no_login:
+        policy = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+        login = measure_login(policy, max(3, args.runs // 2))
+        print(f"\nPOST login, CPU ms per request ({policy}):")
+        for name, ms in login.items():
+            print(f"  {name:<15} {ms:>7.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# benchmarks/ratelimit.py
+"""
+Costo del rate limiter por request, por backend.
+
+1) hit() directo contra el storage (µs por hit, lo que paga cada request limitada)
+2) GET /about completo (página ya en caché) con el limiter apagado vs memory:// vs sqlite://
+
+Uso:
+    python -m benchmarks.ratelimit [requests]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+import ratelimit_storage  # noqa: F401
+
+
+def bench_storage(uri, n):
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    limit = parse("1000000 per hour")
+    start = time.perf_counter()
+    for i in range(n):
+        limiter.hit(limit, f"10.0.{i % 250}.{i % 7}")
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def bench_requests(storage_uri, n, enabled=True):
+    os.environ["RATELIMIT_STORAGE_URI"] = storage_uri
+    from app import create_app
+    app = create_app()
+    for limiter in app.extensions["limiter"]:  # Flask-Limiter guarda un set de instancias
+        limiter.enabled = enabled
+    client = app.test_client()
+    client.get("/about")  # calentar la caché de páginas
+    samples = []
+    for i in range(n):
+        # Una IP distinta por request: cada hit crea su propia ventana (peor caso)
+        start = time.perf_counter()
+        client.get("/about", environ_base={"REMOTE_ADDR": f"10.1.{i // 250 % 250}.{i % 250}"})
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples), statistics.quantiles(samples, n=100)[98]
+
+
+def main(n):
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_uri = f"sqlite:///{os.path.join(tmp, 'limits.db')}"
+        os.environ["DB_URI"] = f"sqlite:///{os.path.join(tmp, 'app.db')}"
+
+        print("storage hit()")
+        for uri in ("memory://", sqlite_uri):
+            print(f"  {uri.split(':')[0]:<8} {bench_storage(uri, n):8.1f} µs/hit")
+
+        print("GET /about (p50 / p99 µs)")
+        for label, uri, enabled in (("off", "memory://", False),
+                                    ("memory", "memory://", True),
+                                    ("sqlite", sqlite_uri, True)):
+            p50, p99 = bench_requests(uri, n, enabled)
+            print(f"  {label:<8} {p50:8.1f} / {p99:8.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
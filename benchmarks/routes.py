@@ -0,0 +1,287 @@
+# benchmarks/routes.py
+"""
+Línea base de latencia por ruta (pública y admin) con volúmenes realistas.
+
+Para cada tamaño (proyectos = mensajes de contacto = N filas) y cada backend:
+siembra la base, calienta y mide p50 / p99 / media y throughput de
+
+    index, projects_list, projects_list?tech=, project_detail,
+    contact (POST), admin_dashboard, admin_messages
+
+La caché de páginas se vacía antes de cada request (fuera del tiempo medido):
+se mide el render real contra la base, no un hit de memoria. El rate limiter
+se apaga. Los requests van por el test client de Flask (en proceso, sin red):
+mide la app, no gunicorn.
+
+Resultados a JSON (commit, backend, tamaño, ruta) para comparar entre commits:
+
+    python -m benchmarks.routes                              # 1k, 10k, 100k en SQLite
+    python -m benchmarks.routes 1000 10000 --requests 500 --out base.json
+    BENCH_POSTGRES_URI=postgresql://localhost/bench python -m benchmarks.routes
+    python -m benchmarks.routes --compare base.json head.json [--threshold 15]
+
+BENCH_POSTGRES_URI agrega una pasada contra Postgres. OJO: hace drop_all/create_all
+en esa base, usar una base dedicada.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.search import WORDS
+from benchmarks.tech_filter import TECHS
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+CHUNK = 5_000
+
+
+# --- SIEMBRA ---
+
+def seed(db, n, rng):
+    """N proyectos (con sus tags) y N mensajes, en lotes con INSERT ... executemany."""
+    from sqlalchemy import insert
+    from models import Project, ProjectTech, ContactMessage, normalize_tech, message_hash
+
+    now = datetime.now(timezone.utc)
+    for start in range(0, n, CHUNK):
+        rows = []
+        for i in range(start, min(n, start + CHUNK)):
+            words = rng.sample(WORDS, 3)
+            rows.append({
+                "title": f"{words[0].title()} {words[1]} {i}",
+                "slug": f"project-{i}",
+                "summary": " ".join(rng.sample(WORDS, 6)),
+                "description": " ".join(rng.choices(WORDS, k=80)),
+                "tech_stack": ", ".join(rng.sample(TECHS, 3)),
+                "is_featured": i % 97 == 0,
+                "created_at": now - timedelta(minutes=i),
+                "updated_at": now - timedelta(minutes=i),
+            })
+        db.session.execute(insert(Project), rows)
+    # El listener before_flush no corre con INSERT masivo: tags a mano
+    techs = db.session.execute(db.select(Project.id, Project.tech_stack)).all()
+    for start in range(0, len(techs), CHUNK):
+        db.session.execute(insert(ProjectTech), [
+            {"project_id": pid, "key": normalize_tech(name), "name": name.strip()}
+            for pid, stack in techs[start:start + CHUNK] for name in stack.split(",")
+        ])
+
+    for start in range(0, n, CHUNK):
+        rows = []
+        for i in range(start, min(n, start + CHUNK)):
+            message = " ".join(rng.choices(WORDS, k=30))
+            rows.append({
+                "name": f"Visitor {i}",
+                "email": f"visitor{i % 997}@example.com",
+                "message": message,
+                "content_hash": message_hash(message),
+                "processed": i % 3 == 0,
+                "created_at": now - timedelta(minutes=i),
+                "updated_at": now - timedelta(minutes=i),
+            })
+        db.session.execute(insert(ContactMessage), rows)
+    db.session.commit()
+
+
+# --- ESCENARIOS ---
+
+def scenarios(n):
+    """nombre -> (admin?, función(client, i) que hace un request)"""
+    def get(path_fn):
+        return lambda client, i: client.get(path_fn(i))
+
+    def contact(client, i):
+        # Texto y remitente únicos: nunca cae en el anti-duplicados
+        return client.post("/contact", data={
+            "name": "Bench", "email": f"bench{i}@example.com",
+            "message": f"Benchmark message {i} {threading.get_ident()}",
+        })
+
+    slugs = random.Random(3)
+    return {
+        "index": (False, get(lambda i: "/")),
+        "projects_list": (False, get(lambda i: "/projects")),
+        "projects_list_tech": (False, get(lambda i: f"/projects?tech={TECHS[i % len(TECHS)]}")),
+        "project_detail": (False, get(lambda i: f"/projects/project-{slugs.randrange(n)}")),
+        "contact": (False, contact),
+        "admin_dashboard": (True, get(lambda i: "/admin")),
+        "admin_messages": (True, get(lambda i: "/admin/messages")),
+    }
+
+
+def _percentile(samples, p):
+    return statistics.quantiles(samples, n=100, method="inclusive")[p - 1] if len(samples) > 1 else samples[0]
+
+
+def measure(app, make_client, fn, requests, warmup, concurrency):
+    from page_cache import page_cache
+
+    def worker(offset, count, out):
+        client = make_client()
+        for i in range(offset, offset + count):
+            with app.app_context():
+                page_cache.clear()
+            start = time.perf_counter()
+            response = fn(client, i)
+            out.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise RuntimeError(f"HTTP {response.status_code} during benchmark")
+
+    worker(0, warmup, [])
+    samples = []
+    per_thread = max(1, requests // concurrency)
+    threads = [threading.Thread(target=worker, args=(warmup + t * per_thread, per_thread, samples))
+               for t in range(concurrency)]
+    wall = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall
+    if len(samples) != per_thread * concurrency:
+        raise RuntimeError("a benchmark thread failed (see traceback above)")
+    return {
+        "requests": len(samples),
+        "p50_ms": round(statistics.median(samples), 3),
+        "p99_ms": round(_percentile(samples, 99), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "rps": round(len(samples) / wall, 1),
+    }
+
+
+def run_backend(label, uri, sizes, requests, warmup, concurrency, routes=None):
+    """`uri` puede llevar {rows}: una base por tamaño (SQLite)."""
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from app import create_app
+    from models import db, User
+
+    results = []
+    for n in sizes:
+        os.environ["DB_URI"] = uri.format(rows=n)
+        app = create_app()
+        app.config.update(WTF_CSRF_ENABLED=False, JOB_WORKER_THREADS=0,
+                          CONTACT_RATE_LIMIT="1000000 per second", CONTACT_RECIPIENT="owner@example.com")
+        for limiter in app.extensions["limiter"]:
+            limiter.enabled = False
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            started = time.perf_counter()
+            seed(db, n, random.Random(42))
+            seed_s = time.perf_counter() - started
+            admin = User(email="bench@example.com", name="Bench", is_admin=True)
+            admin.set_password("bench-password")
+            db.session.add(admin)
+            db.session.commit()
+            admin_id = admin.id
+
+        def make_client(as_admin):
+            client = app.test_client()
+            if as_admin:
+                with client.session_transaction() as sess:
+                    sess["_user_id"] = str(admin_id)
+                    sess["_fresh"] = True
+            return client
+
+        print(f"\n{label} · {n} rows (seed {seed_s:.1f} s)")
+        print(f"  {'route':<20} | {'p50 ms':>8} | {'p99 ms':>8} | {'req/s':>8}")
+        for name, (as_admin, fn) in scenarios(n).items():
+            if routes and name not in routes:
+                continue
+            stats = measure(app, lambda: make_client(as_admin), fn, requests, warmup, concurrency)
+            print(f"  {name:<20} | {stats['p50_ms']:>8.2f} | {stats['p99_ms']:>8.2f} | {stats['rps']:>8.1f}")
+            results.append({"backend": label, "rows": n, "route": name, **stats})
+
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(sizes, requests=200, warmup=20, concurrency=1, out=None, routes=None):
+    backends = []
+    with tempfile.TemporaryDirectory() as tmp:
+        backends.append(("sqlite", f"sqlite:///{os.path.join(tmp, 'bench-{rows}.db')}"))
+        if os.getenv("BENCH_POSTGRES_URI"):
+            backends.append(("postgresql", os.environ["BENCH_POSTGRES_URI"]))
+        results = []
+        for label, uri in backends:
+            results += run_backend(label, uri, sizes, requests, warmup, concurrency, routes)
+
+    report = {
+        "commit": _commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "requests": requests,
+        "concurrency": concurrency,
+        "results": results,
+    }
+    if out:
+        with open(out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nResults -> {out}")
+    return report
+
+
+def compare(base_path, head_path, threshold=15.0):
+    """Diferencia de p50/p99 entre dos reportes. Devuelve 1 si algún p99 empeoró más de `threshold` %."""
+    def load(path):
+        with open(path, encoding="utf-8") as fh:
+            report = json.load(fh)
+        return report, {(r["backend"], r["rows"], r["route"]): r for r in report["results"]}
+
+    base, base_rows = load(base_path)
+    head, head_rows = load(head_path)
+    print(f"{base['commit']} -> {head['commit']}")
+    print(f"  {'backend':<10} {'rows':>7} {'route':<20} | {'p50 Δ%':>8} | {'p99 Δ%':>8}")
+    regressed = False
+    for key in sorted(base_rows.keys() & head_rows.keys()):
+        old, new = base_rows[key], head_rows[key]
+        d50 = (new["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100
+        d99 = (new["p99_ms"] - old["p99_ms"]) / old["p99_ms"] * 100
+        flag = "  <-- regression" if d99 > threshold else ""
+        regressed |= bool(flag)
+        print(f"  {key[0]:<10} {key[1]:>7} {key[2]:<20} | {d50:>+8.1f} | {d99:>+8.1f}{flag}")
+    return 1 if regressed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.routes")
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per route")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1, help="client threads per route")
+    parser.add_argument("--route", action="append", dest="routes", help="only these routes (repeatable)")
+    parser.add_argument("--out", default=None, help="JSON output (default: benchmarks/results/routes-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"))
+    parser.add_argument("--threshold", type=float, default=15.0, help="p99 regression %% that fails --compare")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare, threshold=args.threshold)
+    out = args.out
+    if out is None:
+        os.makedirs(os.path.join(os.path.dirname(__file__), "results"), exist_ok=True)
+        out = os.path.join(os.path.dirname(__file__), "results", f"routes-{_commit()}.json")
+    run(args.sizes, args.requests, args.warmup, args.concurrency, out, args.routes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# benchmarks/search.py
+"""
+Latencia de search.search_projects() según crece el catálogo (debería mantenerse plana).
+
+Uso:
+    python -m benchmarks.search                  # 1k, 10k, 50k proyectos
+    DB_URI=postgresql://... python -m benchmarks.search 10000
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+
+from benchmarks.tech_filter import TECHS, _time
+
+WORDS = ["api", "dashboard", "canvas", "portfolio", "scraper", "bot", "engine", "store",
+         "chat", "analytics", "game", "weather", "blog", "crm", "compiler", "editor"]
+
+
+def _seed(db, Project, n):
+    rng = random.Random(7)
+    for i in range(n):
+        words = rng.sample(WORDS, 3)
+        db.session.add(Project(
+            title=f"{words[0].title()} {words[1]} {i}",
+            slug=f"project-{i}",
+            summary=" ".join(rng.sample(WORDS, 5)),
+            description=" ".join(rng.choices(WORDS, k=60)),
+            tech_stack=", ".join(rng.sample(TECHS, 3)),
+        ))
+        if i % 1000 == 999:
+            db.session.commit()
+    db.session.commit()
+
+
+def run(sizes):
+    from app import create_app
+    from models import db, Project
+    import search
+
+    fixed_uri = os.getenv("DB_URI")
+    print(f"{'projects':>9} | {'p50 ms':>8} | {'max ms':>8} | hits")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            if not fixed_uri:
+                os.environ["DB_URI"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            app = create_app()
+            with app.app_context():
+                db.drop_all()
+                db.create_all()
+                _seed(db, Project, n)
+
+                samples = []
+                for term in ["canvas", "weather dash", "flask", "comp"]:
+                    samples.append(_time(lambda: search.search_projects(term, per_page=12), repeat=20))
+                hits = search.search_projects("canvas").total
+                print(f"{n:>9} | {statistics.median(samples):>8.2f} | {max(samples):>8.2f} | {hits}")
+                db.session.remove()
+                db.drop_all()
+                db.engine.dispose()
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 50_000])
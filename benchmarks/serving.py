@@ -0,0 +1,273 @@
+# benchmarks/serving.py
+"""
+Concurrencia por memoria: gunicorn sync (despliegue actual) vs gunicorn gthread
+vs ASGI (uvicorn + asgi.WSGIAdapter), contra la misma base sembrada.
+
+Cada modo arranca como servidor real en 127.0.0.1; C clientes concurrentes mezclan
+detalle de proyecto (60 %), listado (25 %) y POST /contact con CSRF (15 %) durante
+S segundos. Se reporta throughput, p50/p99, errores y la RSS total del árbol de
+procesos (pico muestreado), para comparar a igual presupuesto de memoria:
+W procesos sync vs 1 proceso con T hilos.
+
+--db-latency-ms simula el ida y vuelta a un servidor de base de datos (sleep antes
+de cada consulta): es la espera que ocupa un worker sync entero. Sin caché de páginas
+ni rate limit, para medir el camino completo.
+
+Uso:
+    python -m benchmarks.serving
+    python -m benchmarks.serving --workers 4 --threads 32 --clients 64 --seconds 10 --db-latency-ms 5
+    python -m benchmarks.serving --mode sync --mode asgi --out serving.json
+
+Requiere gunicorn (requirements.txt); el modo asgi requiere uvicorn (se omite si falta).
+Solo Linux (RSS leída de /proc).
+"""
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+from benchmarks.tech_filter import TECHS
+
+_CSRF = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+
+
+# --- FÁBRICAS QUE CARGAN LOS SERVIDORES ---
+
+def _install_latency():
+    latency = float(os.getenv("BENCH_DB_LATENCY_MS", 0)) / 1000
+    if latency:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.listen(Engine, "before_cursor_execute", lambda *args: time.sleep(latency))
+
+
+def wsgi_app():
+    """gunicorn 'benchmarks.serving:wsgi_app()'"""
+    _install_latency()
+    from app import create_app
+    return create_app()
+
+
+def asgi_app():
+    """uvicorn --factory benchmarks.serving:asgi_app"""
+    _install_latency()
+    import asgi
+    return asgi.create_asgi_app()
+
+
+# --- PROCESOS ---
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _tree_rss_mb(root_pid):
+    """RSS sumada de un proceso y todos sus descendientes."""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as fh:
+                    parents[int(entry)] = int(fh.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError):
+                continue
+    tree, frontier = {root_pid}, [root_pid]
+    while frontier:
+        pid = frontier.pop()
+        children = [c for c, p in parents.items() if p == pid]
+        tree.update(children)
+        frontier.extend(children)
+    total_kb = 0
+    for pid in tree:
+        try:
+            with open(f"/proc/{pid}/status") as fh:
+                total_kb += next(int(line.split()[1]) for line in fh if line.startswith("VmRSS:"))
+        except (OSError, StopIteration):
+            continue
+    return total_kb / 1024
+
+
+def _command(mode, port, workers, threads):
+    bind = f"127.0.0.1:{port}"
+    if mode == "sync":
+        return [sys.executable, "-m", "gunicorn", "-k", "sync", "-w", str(workers), "-b", bind,
+                "benchmarks.serving:wsgi_app()"], {"WEB_CONCURRENCY": str(workers), "WEB_THREADS": "1"}
+    if mode == "gthread":
+        return [sys.executable, "-m", "gunicorn", "-k", "gthread", "-w", "1", "--threads", str(threads),
+                "-b", bind, "benchmarks.serving:wsgi_app()"], {"WEB_CONCURRENCY": "1", "WEB_THREADS": str(threads)}
+    return [sys.executable, "-m", "uvicorn", "--factory", "benchmarks.serving:asgi_app", "--host", "127.0.0.1",
+            "--port", str(port), "--workers", "1", "--log-level", "warning", "--no-access-log"], \
+        {"WEB_CONCURRENCY": "1", "ASGI_THREADS": str(threads)}
+
+
+def _wait_ready(port, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/about")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+# --- CARGA ---
+
+def _client(port, rows, deadline, samples, errors, seed):
+    rng = random.Random(seed)
+
+    def request(method, path, body=None, headers=None):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            resp = conn.getresponse()
+            return resp.status, resp.getheader("Set-Cookie"), resp.read()
+        finally:
+            conn.close()
+
+    # Cookie de sesión + token CSRF para los POST
+    _, cookie, html = request("GET", "/contact")
+    token = _CSRF.search(html.decode()).group(1)
+    cookie = cookie.split(";", 1)[0]
+
+    i = 0
+    while time.monotonic() < deadline:
+        i += 1
+        roll = rng.random()
+        start = time.perf_counter()
+        try:
+            if roll < 0.60:
+                status, _, _ = request("GET", f"/projects/project-{rng.randrange(rows)}")
+            elif roll < 0.85:
+                status, _, _ = request("GET", f"/projects?tech={rng.choice(TECHS)}")
+            else:
+                body = urlencode({"csrf_token": token, "name": "Bench", "email": f"b{seed}@example.com",
+                                  "message": f"Load test {seed}-{i}"})
+                status, _, _ = request("POST", "/contact", body, {
+                    "Content-Type": "application/x-www-form-urlencoded", "Cookie": cookie})
+        except OSError:
+            errors.append("connection")
+            continue
+        if status >= 500:
+            errors.append(status)
+        else:
+            samples.append((time.perf_counter() - start) * 1000)
+
+
+def run_mode(mode, db_uri, rows, workers, threads, clients, seconds, latency_ms):
+    port = _free_port()
+    cmd, extra_env = _command(mode, port, workers, threads)
+    env = {**os.environ, **extra_env, "DB_URI": db_uri, "PAGE_CACHE_URL": "null://",
+           "RATELIMIT_ENABLED": "0", "JOB_WORKER_THREADS": "0", "LOG_LEVEL": "ERROR",
+           "BENCH_DB_LATENCY_MS": str(latency_ms)}
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        _wait_ready(port, proc)
+        idle_rss = _tree_rss_mb(proc.pid)
+        samples, errors, peak = [], [], [idle_rss]
+        deadline = time.monotonic() + seconds
+        done = threading.Event()
+
+        def sample_memory():
+            while not done.wait(0.25):
+                peak.append(_tree_rss_mb(proc.pid))
+
+        sampler = threading.Thread(target=sample_memory, daemon=True)
+        sampler.start()
+        started = time.perf_counter()
+        load = [threading.Thread(target=_client, args=(port, rows, deadline, samples, errors, n))
+                for n in range(clients)]
+        for t in load:
+            t.start()
+        for t in load:
+            t.join()
+        wall = time.perf_counter() - started
+        done.set()
+        sampler.join()
+    finally:
+        proc.terminate()
+        proc.wait(10)
+
+    return {
+        "mode": mode,
+        "processes": workers if mode == "sync" else 1,
+        "threads": 1 if mode == "sync" else threads,
+        "rss_idle_mb": round(idle_rss, 1),
+        "rss_peak_mb": round(max(peak), 1),
+        "requests": len(samples),
+        "errors": len(errors),
+        "rps": round(len(samples) / wall, 1),
+        "p50_ms": round(statistics.median(samples), 2) if samples else None,
+        "p99_ms": round(statistics.quantiles(samples, n=100)[98], 2) if len(samples) > 1 else None,
+    }
+
+
+def _seed_db(path, rows):
+    os.environ["DB_URI"] = f"sqlite:///{path}"
+    from app import create_app
+    from models import db
+    from benchmarks.routes import seed
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(db, rows, random.Random(42))
+        db.session.remove()
+        db.engine.dispose()
+    return os.environ["DB_URI"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serving")
+    parser.add_argument("--mode", action="append", choices=["sync", "gthread", "asgi"])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4, help="sync worker processes")
+    parser.add_argument("--threads", type=int, default=32, help="threads of the single gthread/asgi process")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--db-latency-ms", type=float, default=5)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    modes = args.mode or ["sync", "gthread", "asgi"]
+    if "asgi" in modes and importlib.util.find_spec("uvicorn") is None:
+        print("uvicorn not installed: skipping asgi mode")
+        modes = [m for m in modes if m != "asgi"]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_uri = _seed_db(os.path.join(tmp, "serving.db"), args.rows)
+        print(f"{args.clients} clients · {args.seconds:g} s · DB latency {args.db_latency_ms:g} ms/query")
+        print(f"  {'mode':<8} | {'procs×thr':>9} | {'RSS MB':>7} | {'req/s':>7} | {'p50 ms':>7} | {'p99 ms':>8} | errors")
+        for mode in modes:
+            r = run_mode(mode, db_uri, args.rows, args.workers, args.threads,
+                         args.clients, args.seconds, args.db_latency_ms)
+            results.append(r)
+            print(f"  {mode:<8} | {r['processes']:>4}×{r['threads']:<4} | {r['rss_peak_mb']:>7.1f} | "
+                  f"{r['rps']:>7.1f} | {r['p50_ms'] or 0:>7.2f} | {r['p99_ms'] or 0:>8.2f} | {r['errors']}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump({"args": vars(args), "results": results}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
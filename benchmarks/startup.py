@@ -0,0 +1,155 @@
+# benchmarks/startup.py
+"""
+Tiempo de arranque de un worker: lo que paga cada spawn de gunicorn y cada cold
+start de autoscaling antes de servir su primer request.
+
+Cada corrida es un proceso Python nuevo que mide:
+
+    import_ms   import app (todas las dependencias)
+    create_ms   create_app()
+    first_ms    primer GET / (consulta + compilación/carga de plantillas)
+    total_ms    desde el spawn del proceso hasta la primera respuesta (visto desde afuera)
+    cpu_ms      CPU del proceso hasta la primera respuesta (estable en máquinas compartidas)
+
+en dos escenarios de la caché de bytecode de Jinja (JINJA_BYTECODE_CACHE_DIR):
+"cold" (vacía en cada corrida, primer deploy) y "warm" (ya poblada por otro worker).
+Reporta la mediana, la RSS máxima y si se cargaron módulos que el servidor no
+necesita (alembic, PIL). --top lista los imports más caros (-X importtime).
+
+Uso:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 20 --top 15 --out startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Corre en el proceso hijo; imprime una línea JSON
+PROBE = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+application = app.create_app()
+t2 = time.perf_counter()
+status = application.test_client().get("/").status_code
+t3 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000, "create_ms": (t2 - t1) * 1000, "first_ms": (t3 - t2) * 1000,
+    "status": status, "cpu_ms": sum(resource.getrusage(resource.RUSAGE_SELF)[:2]) * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules), "alembic": "alembic" in sys.modules, "PIL": "PIL" in sys.modules,
+}))
+"""
+
+
+def _env(db_uri, cache_dir):
+    return {**os.environ, "DB_URI": db_uri, "JINJA_BYTECODE_CACHE_DIR": cache_dir,
+            "JOB_WORKER_THREADS": "0", "LOG_LEVEL": "ERROR", "PAGE_CACHE_URL": "null://"}
+
+
+def probe(db_uri, cache_dir) -> dict:
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", PROBE], env=_env(db_uri, cache_dir), cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    # El proceso termina apenas imprime: el total incluye el arranque del intérprete
+    result["total_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def _summary(name, samples) -> dict:
+    if any(s["status"] != 200 for s in samples):
+        raise RuntimeError(f"{name}: GET / did not return 200")
+    median = lambda key: round(statistics.median(s[key] for s in samples), 1)
+    return {
+        "scenario": name,
+        "runs": len(samples),
+        **{key: median(key) for key in ("import_ms", "create_ms", "first_ms", "total_ms", "cpu_ms")},
+        "rss_mb": round(max(s["rss_mb"] for s in samples), 1),
+        "modules": samples[-1]["modules"],
+        "alembic_loaded": samples[-1]["alembic"],
+        "pil_loaded": samples[-1]["PIL"],
+    }
+
+
+def run(db_uri, runs, tmp) -> list[dict]:
+    shared = os.path.join(tmp, "jinja-warm")
+    os.makedirs(shared, exist_ok=True)
+    probe(db_uri, shared)  # otro worker ya compiló las plantillas
+    cold, warm = [], []
+    # Corridas intercaladas: la deriva de la máquina afecta igual a los dos escenarios
+    for i in range(runs):
+        cold.append(probe(db_uri, os.path.join(tmp, f"jinja-cold-{i}")))
+        warm.append(probe(db_uri, shared))
+    return [_summary("cold", cold), _summary("warm", warm)]
+
+
+def top_imports(db_uri, cache_dir, n) -> list[tuple[str, float]]:
+    """Imports de primer nivel más caros (tiempo acumulado, ms)."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                         env=_env(db_uri, cache_dir), cwd=ROOT, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nivel 1 = dos espacios de sangría bajo "import app"
+        if name.startswith("   ") and not name.startswith("    ") and cumulative.strip().isdigit():
+            rows.append((name.strip(), int(cumulative) / 1000))
+    return sorted(rows, key=lambda r: -r[1])[:n]
+
+
+def _seed_db(path):
+    # Base con el esquema y unas filas: el primer GET / hace consultas reales
+    env = {**_env(f"sqlite:///{path}", ""), "PYTHONPATH": ROOT}
+    subprocess.run([sys.executable, "-c", (
+        "from app import create_app\n"
+        "from models import db, Project\n"
+        "a = create_app()\n"
+        "with a.app_context():\n"
+        "    db.create_all()\n"
+        "    db.session.add_all([Project(title=f'P{i}', slug=f'p-{i}', is_featured=i < 3) for i in range(20)])\n"
+        "    db.session.commit()\n"
+    )], env=env, cwd=ROOT, check=True, capture_output=True)
+    return f"sqlite:///{path}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="show the N most expensive imports (0 = off)")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_uri = _seed_db(os.path.join(tmp, "startup.db"))
+        results = run(db_uri, args.runs, tmp)
+        imports = top_imports(db_uri, os.path.join(tmp, "jinja-warm"), args.top) if args.top else []
+
+    print(f"Worker startup, median of {args.runs} fresh processes:")
+    print(f"  {'scenario':<8} | {'import':>7} | {'create':>7} | {'first':>7} | {'total':>7} | {'CPU':>7} | {'RSS MB':>6} | modules | alembic | PIL")
+    for r in results:
+        print(f"  {r['scenario']:<8} | {r['import_ms']:>7.1f} | {r['create_ms']:>7.1f} | {r['first_ms']:>7.1f} | "
+              f"{r['total_ms']:>7.1f} | {r['cpu_ms']:>7.1f} | {r['rss_mb']:>6.1f} | {r['modules']:>7} | {str(r['alembic_loaded']):>7} | "
+              f"{r['pil_loaded']}")
+    if imports:
+        print(f"\nTop {len(imports)} imports (cumulative ms):")
+        for name, ms in imports:
+            print(f"  {ms:>7.1f}  {name}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump({"args": vars(args), "results": results, "top_imports": imports}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
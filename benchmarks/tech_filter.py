@@ -0,0 +1,73 @@
+# benchmarks/tech_filter.py
+"""
+Latencia de /projects?tech= : filtro LIKE '%tech%' (antes) vs lookup en project_techs (ahora).
+
+Uso:
+    python -m benchmarks.tech_filter                 # 100, 1k, 10k, 50k proyectos
+    python -m benchmarks.tech_filter 1000 100000
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+TECHS = ["Python", "Flask", "Django", "Java", "JavaScript", "React", "Vue", "Go",
+         "Rust", "PostgreSQL", "SQLite", "Docker", "Kotlin", "Swift", "C#", "TypeScript"]
+
+
+def _seed(db, Project, n):
+    rng = random.Random(42)
+    for i in range(n):
+        db.session.add(Project(
+            title=f"Project {i}",
+            slug=f"project-{i}",
+            tech_stack=", ".join(rng.sample(TECHS, 3)),
+        ))
+        if i % 1000 == 999:
+            db.session.commit()
+    db.session.commit()
+
+
+def _time(fn, repeat=30):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(sizes):
+    from app import create_app
+    from models import db, Project, ProjectTech, normalize_tech
+
+    print(f"{'projects':>9} | {'LIKE ms':>9} | {'index ms':>9} | rows")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["DB_URI"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            app = create_app()
+            with app.app_context():
+                db.create_all()
+                _seed(db, Project, n)
+
+                def like_query():
+                    return Project.query.filter(Project.tech_stack.ilike("%java%")) \
+                        .order_by(Project.created_at.desc()).all()
+
+                def indexed_query():
+                    return Project.query.join(Project.techs) \
+                        .filter(ProjectTech.key == normalize_tech("Java")) \
+                        .order_by(Project.created_at.desc()).all()
+
+                like_ms = _time(like_query)
+                index_ms = _time(indexed_query)
+                rows = (len(like_query()), len(indexed_query()))
+                print(f"{n:>9} | {like_ms:>9.2f} | {index_ms:>9.2f} | {rows[0]} vs {rows[1]} (LIKE also matches JavaScript)")
+                db.session.remove()
+                db.engine.dispose()
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or [100, 1_000, 10_000, 50_000])
@@ -0,0 +1,116 @@
+# db_profiles.py
+"""
+Perfil del engine según el backend de SQLALCHEMY_DATABASE_URI.
+
+SQLite (archivo), PRAGMAs en cada conexión nueva del pool:
+- journal_mode=WAL: los lectores no bloquean al escritor ni al revés (el POST de
+  /contact ya no frena las páginas públicas). Es persistente en el archivo.
+- synchronous=NORMAL: con WAL no arriesga corrupción, solo la última transacción
+  ante un corte de luz.
+- busy_timeout: un segundo escritor espera hasta N ms en vez de fallar con
+  "database is locked".
+- mmap_size: lecturas vía memoria mapeada (menos copias read() en el catálogo).
+
+Postgres (o cualquier servidor): pool por proceso dimensionado con el número de
+workers de gunicorn (WEB_CONCURRENCY) para que workers × (pool + overflow) no pase
+de DB_MAX_CONNECTIONS; pool_pre_ping y pool_recycle para conexiones cortadas por
+el servidor o un proxy.
+
+Con réplica (DB_REPLICA_URI) su engine tiene pool propio: con
+DB_REPLICA_MAX_CONNECTIONS (servidor aparte) usa ese presupuesto; sin él, primaria y
+réplica se reparten DB_MAX_CONNECTIONS a la mitad. La réplica solo atiende hilos de
+request (la cola de trabajos escribe en la primaria).
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from models import db
+
+DEFAULTS = {
+    "SQLITE_JOURNAL_MODE": "WAL",
+    "SQLITE_SYNCHRONOUS": "NORMAL",
+    "SQLITE_BUSY_TIMEOUT_MS": 5000,
+    "SQLITE_MMAP_SIZE": 256 * 1024 * 1024,
+    "DB_WORKERS": 1,               # procesos de gunicorn (WEB_CONCURRENCY)
+    "DB_THREADS_PER_WORKER": 1,    # hilos de request por proceso (gunicorn --threads)
+    "DB_MAX_CONNECTIONS": 90,      # presupuesto total de la app en el servidor
+    "DB_REPLICA_MAX_CONNECTIONS": 0,  # 0 = la réplica toma la mitad de DB_MAX_CONNECTIONS
+    "DB_POOL_SIZE": 0,             # 0 = calculado
+    "DB_POOL_RECYCLE": 1800,
+    "DB_POOL_TIMEOUT": 10,
+}
+
+
+def _is_sqlite_file(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def budgets(config) -> tuple[int, int]:
+    """Conexiones (primaria, réplica) de toda la app; réplica 0 si no hay DB_REPLICA_URI."""
+    get = lambda key: config.get(key, DEFAULTS[key])
+    total = get("DB_MAX_CONNECTIONS")
+    if not config.get("DB_REPLICA_URI"):
+        return total, 0
+    if get("DB_REPLICA_MAX_CONNECTIONS"):
+        return total, get("DB_REPLICA_MAX_CONNECTIONS")
+    return total - total // 2, max(1, total // 2)
+
+
+def pool_options(config, max_connections=None, concurrent=None) -> dict:
+    """pool_size cubre los hilos que usan la base a la vez; el overflow, el resto del presupuesto."""
+    get = lambda key: config.get(key, DEFAULTS[key])
+    if max_connections is None:
+        max_connections = budgets(config)[0]
+    if concurrent is None:
+        concurrent = get("DB_THREADS_PER_WORKER") + config.get("JOB_WORKER_THREADS", 0)
+    per_process = max(1, max_connections // max(1, get("DB_WORKERS")))
+    pool_size = min(per_process, get("DB_POOL_SIZE") or max(2, concurrent))
+    return {
+        "pool_size": pool_size,
+        "max_overflow": per_process - pool_size,
+        "pool_timeout": get("DB_POOL_TIMEOUT"),
+        "pool_recycle": get("DB_POOL_RECYCLE"),
+        "pool_pre_ping": True,
+    }
+
+
+def engine_options(uri: str, config) -> dict:
+    """Valor para SQLALCHEMY_ENGINE_OPTIONS (debe estar antes de db.init_app)."""
+    if make_url(uri).get_backend_name() == "sqlite":
+        return {}  # pool por defecto de SQLAlchemy; el ajuste va en los PRAGMAs
+    return pool_options(config)
+
+
+def replica_engine_options(uri: str, config) -> dict:
+    """Opciones del engine de la réplica (DB_REPLICA_ENGINE_OPTIONS, lo lee models.init_replica)."""
+    if make_url(uri).get_backend_name() == "sqlite":
+        return {}
+    return pool_options(config, max_connections=budgets(config)[1],
+                        concurrent=config.get("DB_THREADS_PER_WORKER", DEFAULTS["DB_THREADS_PER_WORKER"]))
+
+
+def sqlite_pragmas(config) -> list[str]:
+    get = lambda key: config.get(key, DEFAULTS[key])
+    return [
+        f"PRAGMA journal_mode={get('SQLITE_JOURNAL_MODE')}",
+        f"PRAGMA synchronous={get('SQLITE_SYNCHRONOUS')}",
+        f"PRAGMA busy_timeout={int(get('SQLITE_BUSY_TIMEOUT_MS'))}",
+        f"PRAGMA mmap_size={int(get('SQLITE_MMAP_SIZE'))}",
+    ]
+
+
+def init_app(app):
+    """Registrar los PRAGMAs en los engines ya creados (primaria y réplica; solo SQLite en archivo)."""
+    with app.app_context():
+        engines = [*db.engines.values(), app.extensions.get("db_replica")]
+    engines = [e for e in engines if e is not None and _is_sqlite_file(e.url)]
+    pragmas = sqlite_pragmas(app.config)
+
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    for engine in engines:
+        event.listen(engine, "connect", _apply_pragmas)
@@ -1,7 +1,11 @@
 # forms.py
 from flask_wtf import FlaskForm
+from flask_wtf.file import FileField, FileAllowed
 from wtforms import StringField, TextAreaField, SubmitField, PasswordField, BooleanField
-from wtforms.validators import DataRequired, Email, Length
+from wtforms.validators import DataRequired, Email, Length, Regexp
+
+# Un solo segmento de URL/carpeta (static_export escribe projects/<slug>/index.html)
+SLUG_PATTERN = r"^[a-z0-9-]+$"
 
 # Contact form for public users
 class ContactForm(FlaskForm):
@@ -37,12 +41,22 @@ class AdminLoginForm(FlaskForm):
 class ProjectForm(FlaskForm):
     # NOTE: Admin project CRUD form
     title = StringField("Title", validators=[DataRequired(), Length(max=120)])
-    slug = StringField("Slug", validators=[DataRequired(), Length(max=140)])
+    slug = StringField("Slug", validators=[
+        DataRequired(), Length(max=140),
+        Regexp(SLUG_PATTERN, message="Use lowercase letters, digits and hyphens only."),
+    ])
     summary = StringField("Summary", validators=[Length(max=280)])
     description = TextAreaField("Description")
+    # Traducciones al español (opcionales; vacías = se muestra el texto en inglés)
+    title_es = StringField("Title (ES)", validators=[Length(max=120)])
+    summary_es = StringField("Summary (ES)", validators=[Length(max=280)])
+    description_es = TextAreaField("Description (ES)")
     tech_stack = StringField("Tech stack (CSV)", validators=[Length(max=240)])
     repo_url = StringField("Repo URL")
     live_url = StringField("Live URL")
     cover_image = StringField("Cover image URL", validators=[Length(max=240)])
+    # Subida local (tiene prioridad sobre la URL); se procesa en segundo plano
+    cover_upload = FileField("Upload cover", validators=[FileAllowed(["jpg", "jpeg", "png", "webp", "gif"], "Images only.")])
+    remove_cover = BooleanField("Remove uploaded cover")
     is_featured = BooleanField("Featured")
     submit = SubmitField("Save")
\ No newline at end of file
@@ -0,0 +1,99 @@
+# http_cache.py
+"""
+GET condicional (ETag / Last-Modified) para las páginas públicas.
+
+La versión de cada página sale de una consulta barata por índice (fila de
+content_versions en los listados, updated_at del proyecto en el detalle) + idioma +
+huella de las plantillas. Si el navegador ya la tiene respondemos 304 ANTES de tocar
+la caché de páginas o renderizar Jinja.
+"""
+import hashlib
+import os
+from datetime import timezone
+from functools import wraps
+
+from flask import current_app, g, request, session, make_response
+
+import i18n
+
+
+def template_fingerprint(app) -> str:
+    """Hash del contenido de templates/: cambia con cada deploy que toque el HTML."""
+    digest = hashlib.sha1()
+    root = os.path.join(app.root_path, app.template_folder or "templates")
+    for folder, _, files in sorted(os.walk(root)):
+        for name in sorted(files):
+            with open(os.path.join(folder, name), "rb") as fh:
+                digest.update(name.encode())
+                digest.update(fh.read())
+    return digest.hexdigest()[:12]
+
+
+def _as_utc(value):
+    # SQLite devuelve datetimes naive (guardados en UTC)
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def etag_for(endpoint, query_string, lang, version_at, parts) -> str:
+    """ETag de una página: plantillas + ruta + idioma + versión de los datos."""
+    version_at = _as_utc(version_at)
+    raw = "|".join(str(p) for p in (
+        current_app.config.get("TEMPLATE_FINGERPRINT", ""),
+        endpoint,
+        query_string,
+        lang,
+        version_at.isoformat() if version_at else "",
+        *parts,
+    ))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def conditional(version):
+    """
+    Decorador para vistas GET. `version(**view_kwargs)` devuelve
+    (last_modified | None, tuple de partes extra) o None si la página no existe.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            # Las respuestas con flashes son personales: sin validadores
+            if request.method != "GET" or "_flashes" in session:
+                return view(**kwargs)
+
+            current = version(**kwargs)
+            if current is None:
+                return view(**kwargs)
+            version_at, parts = current
+            version_at = _as_utc(version_at)
+            # El ETag usa la marca completa; Last-Modified solo tiene resolución de segundos
+            last_modified = version_at.replace(microsecond=0) if version_at else None
+
+            etag = etag_for(request.endpoint, request.query_string.decode(), i18n.current_lang(),
+                            version_at, parts)
+            # page_cache la agrega a su clave: una copia renderizada desde una réplica
+            # atrasada queda bajo la versión vieja y no tapa a la nueva
+            g.content_version = etag
+
+            not_modified = False
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            elif request.if_modified_since and last_modified is not None:
+                not_modified = last_modified <= request.if_modified_since
+
+            if not_modified:
+                g.cache_status = "not_modified"
+            response = make_response("", 304) if not_modified else make_response(view(**kwargs))
+            if response.status_code in (200, 304):
+                response.set_etag(etag)
+                if last_modified is not None:
+                    response.last_modified = last_modified
+                # Revalidar siempre; el idioma viaja en la cookie de sesión
+                response.headers["Cache-Control"] = "no-cache"
+                response.vary.add("Cookie")
+            return response
+        # static_export calcula la misma versión sin pasar por un request
+        wrapper.content_version = version
+        return wrapper
+    return decorator
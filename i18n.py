@@ -0,0 +1,115 @@
+# i18n.py
+"""
+Catálogo de traducciones compilado una sola vez al importar.
+
+- CATALOGS: MappingProxyType por idioma (inmutable, compartido entre hilos/workers).
+- El idioma se resuelve UNA vez por request (before_request -> g.lang); las plantillas
+  reciben funciones ya ligadas a ese idioma: `t(key)` es un solo dict.get, sin session.
+- get_loc_attr(obj, 'title') lee la columna localizada real (title_es) con fallback
+  al idioma base cuando está vacía.
+"""
+from types import MappingProxyType
+
+from flask import g, session
+
+DEFAULT_LANG = "en"
+
+_SOURCE = {
+    'en': {
+        'brand_left': 'CARLOS',
+        'brand_right': '_SIBRIAN',
+        'home': 'Home',
+        'about': 'About',
+        'projects': 'Projects',
+        'contact': 'Contact',
+        'cta': 'Contact Me',
+        'hero_tagline': 'Developer building modern web experiences with Flask, Bootstrap and JS.',
+        'form_name': 'Name',
+        'form_email': 'Email',
+        'form_message': 'Message',
+        'form_send': 'Send',
+        'search': 'Search',
+        'search_placeholder': 'Search projects (title, stack, description)...',
+        'search_results': 'results',
+    },
+    'es': {
+        'brand_left': 'CARLOS',
+        'brand_right': '_SIBRIAN',
+        'home': 'Inicio',
+        'about': 'Sobre mí',
+        'projects': 'Proyectos',
+        'contact': 'Contacto',
+        'cta': 'Contáctame',
+        'hero_tagline': 'Desarrollador creando experiencias web modernas con Flask, Bootstrap y JS.',
+        'form_name': 'Nombre',
+        'form_email': 'Correo',
+        'form_message': 'Mensaje',
+        'form_send': 'Enviar',
+        'search': 'Buscar',
+        'search_placeholder': 'Buscar proyectos (título, stack, descripción)...',
+        'search_results': 'resultados',
+    },
+}
+
+# Claves que faltan en un idioma caen al idioma base (y si no, a la clave misma)
+CATALOGS = MappingProxyType({
+    lang: MappingProxyType({**_SOURCE[DEFAULT_LANG], **messages})
+    for lang, messages in _SOURCE.items()
+})
+LANGUAGES = frozenset(CATALOGS)
+
+# Sufijo de las columnas localizadas del modelo (Project.title_es, ...)
+_COLUMN_SUFFIX = {"en": "", "es": "_es"}
+
+
+def _translator(catalog):
+    get = catalog.get
+
+    def t(key):
+        return get(key, key)
+    return t
+
+
+def _localizer(suffix):
+    if not suffix:
+        return getattr
+
+    def get_loc_attr(obj, attr_name):
+        return getattr(obj, attr_name + suffix, None) or getattr(obj, attr_name)
+    return get_loc_attr
+
+
+def _context(lang):
+    return MappingProxyType({
+        "t": _translator(CATALOGS[lang]),
+        "get_loc_attr": _localizer(_COLUMN_SUFFIX[lang]),
+        "current_lang": lambda: lang,
+    })
+
+
+# Contexto de plantillas precompilado por idioma: el context processor solo elige uno
+_CONTEXTS = MappingProxyType({lang: _context(lang) for lang in LANGUAGES})
+
+
+def resolve_lang() -> str:
+    lang = session.get("lang", DEFAULT_LANG)
+    return lang if lang in LANGUAGES else DEFAULT_LANG
+
+
+def current_lang() -> str:
+    """Idioma del request actual (resuelto en before_request)."""
+    return g.get("lang") or resolve_lang()
+
+
+def translate(key: str, lang: str | None = None) -> str:
+    return CATALOGS[lang or current_lang()].get(key, key)
+
+
+def init_app(app):
+    @app.before_request
+    def _resolve_lang():
+        g.lang = resolve_lang()
+
+    @app.context_processor
+    def _inject_i18n():
+        return _CONTEXTS[current_lang()]
@@ -0,0 +1,171 @@
+# images.py
+"""
+Derivados responsivos de static/img (parte de `flask assets-build`).
+
+Por cada imagen se generan anchos (IMAGE_WIDTHS que no superen el original, más el
+original) en AVIF (si Pillow lo soporta), WebP y el formato de origen, sin metadatos.
+El manifest guarda las fuentes por tipo MIME y el tamaño intrínseco.
+
+- picture('img/x.png', alt, sizes=...) -> <picture> con <source type srcset sizes>
+  y <img width height loading=lazy decoding=async> de fallback.
+- asset_image_map(*names) -> JSON que AssetLoader.js usa para que el navegador elija
+  formato y ancho de las imágenes que se dibujan en el canvas.
+
+Pillow es opcional: sin él se publican solo los originales y los helpers degradan a <img>.
+"""
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import posixpath
+
+from flask import current_app, url_for
+from markupsafe import Markup, escape
+
+_image_module = None  # PIL.Image, importado en el primer uso y no al arrancar cada worker
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+IMAGE_WIDTHS = (120, 240, 480, 960, 1600)
+
+# Orden de preferencia en <picture>: el navegador usa el primer <source> que soporte
+_ENCODERS = [
+    ("image/avif", "avif", "AVIF", {"quality": 50, "speed": 8}),  # speed<8: ~10x más lento, ~5% menos bytes
+    ("image/webp", "webp", "WEBP", {"quality": 80, "method": 4}),  # method 6: ~20x más lento con alfa
+]
+_ORIGINAL = {
+    "PNG": ("image/png", "png", {"optimize": True}),
+    "JPEG": ("image/jpeg", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+def pil_image():
+    """Módulo PIL.Image o None (import diferido: ~15 ms que solo pagan assets-build y las portadas)."""
+    global _image_module
+    if _image_module is None and available():
+        from PIL import Image
+        try:
+            import pillow_avif  # noqa: F401  (AVIF en Pillow < 11.3)
+        except ImportError:
+            pass
+        _image_module = Image
+    return _image_module
+
+
+def _encoders():
+    Image = pil_image()
+    Image.init()
+    return [encoder for encoder in _ENCODERS if encoder[2] in Image.SAVE]
+
+
+def _widths(original: int) -> list[int]:
+    return sorted({w for w in IMAGE_WIDTHS if w < original} | {original})
+
+
+def _encode(img, fmt, options) -> bytes:
+    if fmt == "JPEG" and img.mode != "RGB":
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, fmt, **options)  # sin exif/icc: no se pasan, Pillow no los copia
+    return buf.getvalue()
+
+
+def build_variants(static_folder: str, write, logical_names) -> dict:
+    """
+    Generar los derivados de las imágenes en `logical_names`.
+    `write(name, data)` guarda el archivo en dist/. Devuelve la sección "images" del manifest.
+    """
+    Image = pil_image()
+    if Image is None:
+        return {}
+    encoders = _encoders()
+    result = {}
+    for logical in sorted(n for n in logical_names if n.lower().endswith(IMAGE_EXTENSIONS)):
+        with Image.open(os.path.join(static_folder, *logical.split("/"))) as src:
+            original_mime, original_ext, original_options = _ORIGINAL.get(src.format, _ORIGINAL["PNG"])
+            original_fmt = src.format if src.format in _ORIGINAL else "PNG"
+            src.load()
+            width, height = src.size
+            image = src if src.mode in ("RGB", "RGBA") else src.convert("RGBA")
+
+            root = posixpath.splitext(logical)[0]
+            sources = {mime: [] for mime, *_ in encoders}
+            sources[original_mime] = []
+            for w in _widths(width):
+                resized = image if w == width else image.resize(
+                    (w, max(1, round(height * w / width))), Image.LANCZOS)
+                targets = encoders + [(original_mime, original_ext, original_fmt, original_options)]
+                for mime, ext, fmt, options in targets:
+                    data = _encode(resized, fmt, options)
+                    name = f"{root}.{w}w.{hashlib.sha256(data).hexdigest()[:10]}.{ext}"
+                    write(name, data)
+                    sources[mime].append([w, name])
+
+        result[logical] = {"width": width, "height": height, "type": original_mime, "sources": sources}
+    return result
+
+
+# --- HELPERS DE PLANTILLA ---
+
+def _entry(filename):
+    manifest = current_app.extensions.get("assets") or {}
+    return manifest.get("images", {}).get(filename)
+
+
+def _srcset(variants) -> str:
+    return ", ".join(f"{url_for('static', filename='dist/' + name)} {w}w" for w, name in variants)
+
+
+def _attrs(attrs) -> str:
+    # class_ -> class (palabra reservada en Python)
+    return "".join(
+        f' {escape(key.rstrip("_").replace("_", "-"))}="{escape(value)}"'
+        for key, value in attrs.items() if value is not None
+    )
+
+
+def picture(filename: str, alt: str = "", sizes: str = "100vw", **attrs) -> Markup:
+    """<picture> con AVIF/WebP/original en varios anchos (o <img> simple sin derivados)."""
+    attrs.setdefault("loading", "lazy")
+    attrs.setdefault("decoding", "async")
+    entry = _entry(filename)
+    if entry is None:
+        return Markup(f'<img src="{escape(url_for("static", filename=filename))}" '
+                      f'alt="{escape(alt)}"{_attrs(attrs)}>')
+
+    parts = ["<picture>"]
+    for mime, variants in entry["sources"].items():
+        if mime != entry["type"] and variants:
+            parts.append(f'<source type="{mime}" srcset="{escape(_srcset(variants))}" sizes="{escape(sizes)}">')
+    fallback = entry["sources"][entry["type"]]
+    parts.append(
+        f'<img src="{escape(url_for("static", filename="dist/" + fallback[-1][1]))}" '
+        f'srcset="{escape(_srcset(fallback))}" sizes="{escape(sizes)}" '
+        f'width="{entry["width"]}" height="{entry["height"]}" alt="{escape(alt)}"{_attrs(attrs)}>'
+    )
+    parts.append("</picture>")
+    return Markup("".join(parts))
+
+
+def asset_image_map(*filenames) -> Markup:
+    """<script type="application/json" id="asset-images"> para AssetLoader.js."""
+    data = {}
+    for filename in filenames:
+        entry = _entry(filename)
+        if entry is None:
+            data[filename] = {"src": url_for("static", filename=filename)}
+            continue
+        fallback = entry["sources"][entry["type"]]
+        data[filename] = {
+            "src": url_for("static", filename="dist/" + fallback[-1][1]),
+            "srcset": _srcset(fallback),
+            "sources": [{"type": mime, "srcset": _srcset(v)}
+                        for mime, v in entry["sources"].items() if mime != entry["type"] and v],
+        }
+    # "</" escapado: el JSON no puede cerrar el <script>
+    payload = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+    return Markup(f'<script type="application/json" id="asset-images">{payload}</script>')
@@ -0,0 +1,242 @@
+# jobs.py
+"""
+Cola de trabajos persistente (tabla `jobs`) + pool acotado de hilos.
+
+- enqueue() solo agrega la fila a la sesión: se confirma en el mismo commit que el
+  ContactMessage, así un reinicio nunca pierde un correo.
+- claim() reserva trabajos con un UPDATE atómico (FOR UPDATE SKIP LOCKED en Postgres),
+  así varios workers de gunicorn pueden consumir la misma tabla sin duplicar envíos.
+- Fallos: reintento con backoff exponencial; al agotar max_attempts pasa a 'dead'.
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import and_, or_, update
+
+import mail_transport
+import media
+from models import db, Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def handler(kind):
+    """Registrar la función que ejecuta los trabajos de tipo `kind`."""
+    def decorator(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return decorator
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def enqueue(kind: str, payload: dict, max_attempts: int | None = None) -> Job:
+    """Agregar un trabajo a la sesión actual (el llamador hace commit)."""
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload),
+        max_attempts=max_attempts or current_app.config.get("JOB_MAX_ATTEMPTS", 5),
+    )
+    db.session.add(job)
+    return job
+
+
+def backoff_seconds(attempts: int) -> float:
+    base = current_app.config.get("JOB_BACKOFF_BASE", 30)
+    cap = current_app.config.get("JOB_BACKOFF_MAX", 3600)
+    return min(cap, base * 2 ** max(attempts - 1, 0))
+
+
+def claim(worker_id: str, limit: int = 10) -> list[Job]:
+    """Reservar hasta `limit` trabajos listos (o abandonados por un worker caído)."""
+    now = _now()
+    stale = now - timedelta(seconds=current_app.config.get("JOB_LEASE_SECONDS", 600))
+    ready = or_(
+        and_(Job.status == Job.PENDING, Job.run_at <= now),
+        and_(Job.status == Job.RUNNING, Job.locked_at < stale),
+    )
+    ids = (
+        db.select(Job.id).where(ready).order_by(Job.run_at).limit(limit)
+        .with_for_update(skip_locked=True).scalar_subquery()
+    )
+    token = f"{worker_id}:{uuid.uuid4().hex[:8]}"
+    db.session.execute(
+        update(Job).where(Job.id.in_(ids)).where(ready)
+        .values(status=Job.RUNNING, locked_by=token, locked_at=now, attempts=Job.attempts + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return list(db.session.execute(
+        db.select(Job).where(Job.locked_by == token, Job.status == Job.RUNNING).order_by(Job.run_at)
+    ).scalars())
+
+
+def complete(job: Job) -> None:
+    job.status = Job.DONE
+    job.locked_by = None
+    job.last_error = ""
+    db.session.commit()
+
+
+def fail(job: Job, error: Exception) -> None:
+    job.last_error = f"{type(error).__name__}: {error}"[:2000]
+    job.locked_by = None
+    if job.attempts >= job.max_attempts:
+        job.status = Job.DEAD
+        logger.error("Job dead after %d attempts", job.attempts, extra={
+            "event": "job.dead", "job_id": job.id, "kind": job.kind, "error": job.last_error})
+    else:
+        job.status = Job.PENDING
+        job.run_at = _now() + timedelta(seconds=backoff_seconds(job.attempts))
+        logger.warning("Job failed, retry scheduled", extra={
+            "event": "job.retry", "job_id": job.id, "kind": job.kind, "attempt": job.attempts,
+            "run_at": job.run_at.isoformat(), "error": job.last_error})
+    db.session.commit()
+
+
+def run_job(job: Job) -> None:
+    fn = HANDLERS.get(job.kind)
+    try:
+        if fn is None:
+            raise LookupError(f"No handler for job kind {job.kind!r}")
+        fn(json.loads(job.payload or "{}"))
+    except Exception as exc:
+        db.session.rollback()
+        fail(job, exc)
+    else:
+        complete(job)
+
+
+def run_pending(worker_id: str | None = None, limit: int = 10) -> int:
+    """Ejecutar trabajos listos hasta vaciar la cola. Devuelve cuántos se procesaron."""
+    worker_id = worker_id or f"{os.getpid()}-sync"
+    processed = 0
+    while True:
+        batch = claim(worker_id, limit)
+        if not batch:
+            return processed
+        for job in batch:
+            run_job(job)
+        processed += len(batch)
+
+
+# --- HANDLERS ---
+
+@handler("email")
+def send_email(payload: dict) -> None:
+    from flask_mail import Message  # import diferido: ver mail_transport.LazyMail
+
+    # Conexión SMTP keep-alive del hilo: los correos de un mismo lote comparten handshake
+    mail_transport.send(Message(
+        subject=payload["subject"],
+        recipients=payload["recipients"],
+        body=payload["body"],
+        reply_to=payload.get("reply_to"),
+    ))
+    logger.info("Email sent", extra={"event": "email.sent", "recipients": len(payload["recipients"])})
+
+
+@handler("cover_variants")
+def cover_variants(payload: dict) -> None:
+    # Derivados de una portada subida (el request solo guardó el original)
+    media.render_all(payload["digest"])
+    logger.info("Cover variants rendered", extra={"event": "media.variants", "digest": payload["digest"][:12]})
+
+
+# --- POOL DE WORKERS ---
+
+class WorkerPool:
+    """
+    N hilos fijos por proceso que consumen la tabla `jobs`.
+    Arranca en el primer notify() de cada proceso (seguro con el fork de gunicorn).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._pid = None
+
+    def start(self):
+        size = self.app.config.get("JOB_WORKER_THREADS", 2)
+        with self._lock:
+            if self._pid == os.getpid() or size <= 0:
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._loop, args=(f"{self._pid}-{i}",),
+                                 name=f"job-worker-{i}", daemon=True)
+                for i in range(size)
+            ]
+            for t in self._threads:
+                t.start()
+
+    def notify(self):
+        self.start()
+        self._wake.set()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._pid = None
+
+    def _loop(self, worker_id):
+        interval = self.app.config.get("JOB_POLL_INTERVAL", 5)
+        flush = self.app.config.get("JOB_FLUSH_INTERVAL", 1.0)
+        smtp_pool = self.app.extensions.get("smtp_pool")
+        while True:
+            with self.app.app_context():
+                try:
+                    run_pending(worker_id, limit=self.app.config.get("JOB_BATCH_SIZE", 20))
+                except Exception:
+                    logger.exception("Job worker loop failed", extra={"event": "job.worker_error", "worker": worker_id})
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+                if smtp_pool is not None:
+                    smtp_pool.close_idle()
+
+            woke = self._wake.wait(interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            # Ventana de agrupación: una ráfaga de mensajes sale en un solo lote
+            if woke and flush:
+                self._stop.wait(flush)
+
+        if smtp_pool is not None:
+            smtp_pool.close()
+
+
+def init_app(app):
+    app.config.setdefault("JOB_WORKER_THREADS", 2)
+    app.config.setdefault("JOB_POLL_INTERVAL", 5)
+    app.config.setdefault("JOB_BATCH_SIZE", 20)
+    app.config.setdefault("JOB_FLUSH_INTERVAL", 1.0)
+    app.config.setdefault("JOB_MAX_ATTEMPTS", 5)
+    app.config.setdefault("JOB_BACKOFF_BASE", 30)
+    app.config.setdefault("JOB_BACKOFF_MAX", 3600)
+    app.config.setdefault("JOB_LEASE_SECONDS", 600)
+    mail_transport.init_app(app)
+    app.extensions["jobs"] = WorkerPool(app)
+
+
+def notify() -> None:
+    """Despertar el pool de este proceso (lo arranca si hace falta)."""
+    pool = current_app.extensions.get("jobs")
+    if pool is not None:
+        pool.notify()
@@ -0,0 +1,224 @@
+# logging_setup.py
+"""
+Logging estructurado (una línea JSON por evento) sin I/O en los hilos del request.
+
+    logger.info("Contact message stored", extra={"event": "contact.saved", "message_id": 7})
+
+- El hilo que loguea solo hace lo barato: filtros (request_id, muestreo), interpolar
+  el mensaje y un put_nowait en una cola acotada. Si la cola está llena el registro
+  se descarta y se cuenta (se informa en el siguiente registro como `dropped`).
+- Un QueueListener (un hilo por proceso) serializa a JSON y escribe a stderr y,
+  si LOG_FILE está definido, a un RotatingFileHandler (rotación por tamaño).
+- request_id: X-Request-ID entrante (si es válido) o uuid4; se devuelve en la respuesta.
+- Muestreo por `event` (LOG_SAMPLE_RATES): los eventos de alto volumen (honeypot,
+  duplicados) se registran con probabilidad `rate` y llevan `sample_rate` para reescalar.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from flask import g, has_request_context, request
+
+DEFAULT_SAMPLE_RATES = {"contact.honeypot": 0.1, "contact.duplicate": 0.1}
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+# Atributos propios de LogRecord: todo lo demás vino por extra= y va al JSON
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName", "request_id"}
+
+
+def parse_rates(text: str) -> dict:
+    """'contact.honeypot=0.1,contact.duplicate=0.1' -> {event: rate}"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in (text or "").split(","))):
+        event, _, rate = item.partition("=")
+        rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class JSONFormatter(logging.Formatter):
+    """Corre en el hilo del listener, nunca en el del request."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = g.get("request_id") if has_request_context() else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Conserva una fracción `rate` de cada evento listado; el resto pasa siempre."""
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+
+    def filter(self, record):
+        rate = self.rates.get(getattr(record, "event", None))
+        if rate is None or rate >= 1.0:
+            return True
+        if random.random() >= rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class _Stderr(logging.StreamHandler):
+    # sys.stderr resuelto en cada escritura (pytest y gunicorn lo reemplazan)
+    stream = property(lambda self: sys.stderr, lambda self, value: None)
+
+
+class AsyncHandler(QueueHandler):
+    """
+    QueueHandler con cola acotada que nunca bloquea, y su propio QueueListener.
+    El listener arranca en el primer registro de cada proceso (seguro con el fork de gunicorn).
+    """
+
+    def __init__(self, outputs, maxsize=10_000):
+        super().__init__(queue.Queue(maxsize))
+        self.outputs = outputs
+        self.sampler = SamplingFilter()
+        self.addFilter(RequestIdFilter())
+        self.addFilter(self.sampler)
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.listener = None
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.Queue(self.maxsize)
+            self.listener = QueueListener(self.queue, *self.outputs, respect_handler_level=True)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def stop(self):
+        """Vaciar la cola y detener el listener (atexit, tests, reconfiguración)."""
+        with self._lock:
+            if self._pid == os.getpid() and self.listener is not None:
+                self.listener.stop()
+            self._pid = None
+        for h in self.outputs:
+            h.flush()
+
+    def prepare(self, record):
+        # A diferencia de QueueHandler.prepare no formatea aquí (ni la traza):
+        # solo fija el mensaje para que args mutables no cambien antes del listener.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if self.dropped:
+            record.dropped, self.dropped = self.dropped, 0
+        return record
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self.stop()
+        super().close()
+
+
+_handler = None
+_settings = None
+
+
+def configure(config) -> AsyncHandler:
+    """Instalar (o reinstalar si cambió la config) el handler asíncrono en el logger raíz."""
+    global _handler, _settings
+    settings = (
+        config.get("LOG_LEVEL", "INFO"),
+        config.get("LOG_FILE", ""),
+        config.get("LOG_MAX_BYTES", 10 * 1024 * 1024),
+        config.get("LOG_BACKUP_COUNT", 5),
+        config.get("LOG_QUEUE_SIZE", 10_000),
+    )
+    root = logging.getLogger()
+    root.setLevel(settings[0])
+    if _handler is not None and settings == _settings:
+        _handler.sampler.rates = dict(config.get("LOG_SAMPLE_RATES", DEFAULT_SAMPLE_RATES))
+        return _handler
+
+    if _handler is not None:
+        root.removeHandler(_handler)
+        _handler.close()
+
+    formatter = JSONFormatter()
+    outputs = [_Stderr()]
+    if settings[1]:
+        os.makedirs(os.path.dirname(os.path.abspath(settings[1])), exist_ok=True)
+        outputs.append(RotatingFileHandler(settings[1], maxBytes=settings[2],
+                                           backupCount=settings[3], encoding="utf-8"))
+    for h in outputs:
+        h.setFormatter(formatter)
+
+    handler = AsyncHandler(outputs, maxsize=settings[4])
+    handler.sampler.rates = dict(config.get("LOG_SAMPLE_RATES", DEFAULT_SAMPLE_RATES))
+    root.addHandler(handler)
+    _handler, _settings = handler, settings
+    return handler
+
+
+def shutdown():
+    if _handler is not None:
+        _handler.stop()
+
+
+atexit.register(shutdown)
+
+
+def init_app(app):
+    app.config.setdefault("LOG_LEVEL", "INFO")
+    app.config.setdefault("LOG_FILE", "")
+    app.config.setdefault("LOG_MAX_BYTES", 10 * 1024 * 1024)
+    app.config.setdefault("LOG_BACKUP_COUNT", 5)
+    app.config.setdefault("LOG_QUEUE_SIZE", 10_000)
+    app.config.setdefault("LOG_SAMPLE_RATES", dict(DEFAULT_SAMPLE_RATES))
+    configure(app.config)
+
+    @app.before_request
+    def _assign_request_id():
+        incoming = request.headers.get("X-Request-ID", "")
+        g.request_id = incoming if _REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+    @app.after_request
+    def _echo_request_id(response):
+        if "request_id" in g:
+            response.headers["X-Request-ID"] = g.request_id
+        return response
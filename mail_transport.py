@@ -0,0 +1,127 @@
+# mail_transport.py
+"""
+Conexiones SMTP reutilizables para la cola de trabajos.
+
+Cada hilo del WorkerPool mantiene UNA conexión Flask-Mail (`mail.connect()`) abierta y
+autenticada: el handshake TCP + STARTTLS + AUTH se paga una vez por ráfaga, no por correo.
+
+- MAIL_KEEPALIVE_SECONDS: cerrar la conexión si lleva este tiempo sin uso.
+- MAIL_NOOP_AFTER: antes de reutilizar una conexión inactiva, comprobarla con NOOP.
+- MAIL_MAX_EMAILS (nativo de Flask-Mail): reconectar cada N mensajes.
+"""
+import logging
+import smtplib
+import threading
+import time
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Errores que indican que la conexión murió (no que el mensaje sea inválido)
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class SMTPPool:
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+        self.connects = 0  # conexiones abiertas desde el arranque (útil para métricas/tests)
+
+    # --- API ---
+
+    def send(self, message) -> None:
+        """Enviar reutilizando la conexión del hilo; reintenta una vez si estaba muerta."""
+        conn = self._acquire()
+        try:
+            conn.send(message)
+        except _CONNECTION_ERRORS:
+            self._discard()
+            self._acquire().send(message)
+        self._local.last_used = time.monotonic()
+
+    def close_idle(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        keepalive = self.app.config.get("MAIL_KEEPALIVE_SECONDS", 30)
+        if conn is not None and time.monotonic() - self._local.last_used > keepalive:
+            self.close()
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.__exit__(None, None, None)  # QUIT
+            except Exception:
+                pass
+
+    # --- internos ---
+
+    def _acquire(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            idle = time.monotonic() - self._local.last_used
+            if idle > self.app.config.get("MAIL_KEEPALIVE_SECONDS", 30):
+                self.close()
+                conn = None
+            elif idle > self.app.config.get("MAIL_NOOP_AFTER", 10) and conn.host is not None:
+                try:
+                    if conn.host.noop()[0] != 250:
+                        raise smtplib.SMTPServerDisconnected("NOOP rejected")
+                except (smtplib.SMTPException, OSError):
+                    self._discard()
+                    conn = None
+
+        if conn is None:
+            conn = self.app.extensions["mail"].connect()
+            conn.__enter__()  # abre socket + STARTTLS + login
+            self.connects += 1
+            self._local.conn = conn
+            self._local.last_used = time.monotonic()
+        return conn
+
+    def _discard(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None and conn.host is not None:
+            try:
+                conn.host.close()
+            except Exception:
+                pass
+
+
+class LazyMail:
+    """
+    app.extensions["mail"] que importa Flask-Mail en el primer uso (envío o ajuste).
+    El import arrastra email.mime / email.policy (~25 ms); el worker que solo sirve
+    páginas no lo paga. Mismo resultado que Mail(app) al crear la app.
+    """
+
+    def __init__(self, app):
+        # debug/testing como en Mail(app): los de la creación, no los del primer uso
+        object.__setattr__(self, "_init", (app.config, app.debug, app.testing))
+        object.__setattr__(self, "_state", None)
+
+    def _resolve(self):
+        state = self._state
+        if state is None:
+            from flask_mail import Mail
+            state = Mail().init_mail(*self._init)
+            object.__setattr__(self, "_state", state)
+        return state
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+
+def init_app(app):
+    app.config.setdefault("MAIL_KEEPALIVE_SECONDS", 30)
+    app.config.setdefault("MAIL_NOOP_AFTER", 10)
+    app.extensions["smtp_pool"] = SMTPPool(app)
+
+
+def send(message) -> None:
+    current_app.extensions["smtp_pool"].send(message)
@@ -0,0 +1,169 @@
+# media.py
+"""
+Portadas subidas desde el admin: almacén local direccionado por contenido.
+
+    instance/media/originals/ab/<sha256>           bytes tal cual se subieron (privado)
+    instance/media/derived/ab/<sha256>/<v>.webp    derivados limpios (públicos)
+
+- store_upload() solo valida y guarda el original (barato, dentro del request);
+  el trabajo "cover_variants" de la cola genera los derivados en segundo plano.
+- Derivados: orientación EXIF aplicada, sin metadatos (EXIF/GPS/ICC), redimensionados
+  a MEDIA_VARIANTS y en WebP.
+- /media/<sha256>/<variant>.webp: la URL cambia con el contenido -> Cache-Control
+  immutable. Si el worker aún no llegó, el derivado se genera en ese request.
+
+Requiere Pillow (opcional): sin él la subida se rechaza y sigue funcionando la URL manual.
+"""
+import hashlib
+import io
+import os
+import re
+import shutil
+import tempfile
+
+from flask import abort, current_app, send_from_directory, url_for
+
+import images
+from assets import IMMUTABLE
+from models import db, Project
+
+# Ancho máximo de cada derivado (nunca se amplía)
+DEFAULT_VARIANTS = {"thumb": 640, "large": 1600}
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+class MediaError(ValueError):
+    """Archivo rechazado (no es imagen, demasiado grande, Pillow no disponible)."""
+
+
+def available() -> bool:
+    return images.available()
+
+
+def _root() -> str:
+    return current_app.config["MEDIA_ROOT"]
+
+
+def _original_path(digest: str) -> str:
+    return os.path.join(_root(), "originals", digest[:2], digest)
+
+
+def _variant_path(digest: str, variant: str) -> str:
+    return os.path.join(_root(), "derived", digest[:2], digest, f"{variant}.webp")
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    # Escritura + rename: un lector concurrente nunca ve un archivo a medias
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def store_upload(file_storage) -> str:
+    """Validar y guardar el original. Devuelve su sha256 (idempotente: mismo archivo, mismo hash)."""
+    Image = images.pil_image()
+    if Image is None:
+        raise MediaError("Image uploads require Pillow.")
+    limit = current_app.config["MEDIA_MAX_UPLOAD_BYTES"]
+    data = file_storage.read(limit + 1)
+    if len(data) > limit:
+        raise MediaError(f"Image is larger than {limit // (1024 * 1024)} MB.")
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if img.format not in ALLOWED_FORMATS:
+                raise MediaError(f"Unsupported image format: {img.format}.")
+            width, height = img.size
+            if width * height > current_app.config["MEDIA_MAX_PIXELS"]:
+                raise MediaError("Image dimensions are too large.")
+            img.verify()
+    except MediaError:
+        raise
+    except Exception as exc:
+        raise MediaError("The file is not a valid image.") from exc
+
+    digest = hashlib.sha256(data).hexdigest()
+    path = _original_path(digest)
+    if not os.path.exists(path):
+        _atomic_write(path, data)
+    return digest
+
+
+def render_variant(digest: str, variant: str) -> str:
+    """Generar (si falta) un derivado y devolver su ruta."""
+    path = _variant_path(digest, variant)
+    if os.path.exists(path):
+        return path
+    max_width = current_app.config["MEDIA_VARIANTS"][variant]
+    Image = images.pil_image()
+    from PIL import ImageOps
+    with Image.open(_original_path(digest)) as img:
+        img.seek(0)  # GIF animado: primer cuadro
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+        if img.width > max_width:
+            img = img.resize((max_width, max(1, round(img.height * max_width / img.width))), Image.LANCZOS)
+        buf = io.BytesIO()
+        # Sin exif=/icc_profile=: el WebP resultante no lleva metadatos
+        img.save(buf, "WEBP", quality=current_app.config["MEDIA_WEBP_QUALITY"], method=4)
+    _atomic_write(path, buf.getvalue())
+    return path
+
+
+def render_all(digest: str) -> None:
+    for variant in current_app.config["MEDIA_VARIANTS"]:
+        render_variant(digest, variant)
+
+
+def cover_url(project, variant: str = "thumb") -> str:
+    """URL de la portada: derivado local si se subió archivo, si no la URL manual."""
+    if project.cover_hash:
+        return url_for("media_file", digest=project.cover_hash, variant=variant)
+    return project.cover_image or ""
+
+
+def init_app(app):
+    app.config.setdefault("MEDIA_ROOT", os.path.join(app.instance_path, "media"))
+    app.config.setdefault("MEDIA_VARIANTS", dict(DEFAULT_VARIANTS))
+    app.config.setdefault("MEDIA_MAX_UPLOAD_BYTES", 10 * 1024 * 1024)
+    app.config.setdefault("MEDIA_MAX_PIXELS", 40_000_000)
+    app.config.setdefault("MEDIA_WEBP_QUALITY", 82)
+
+    @app.get("/media/<digest>/<variant>.webp")
+    def media_file(digest, variant):
+        if not _DIGEST.match(digest) or variant not in app.config["MEDIA_VARIANTS"]:
+            abort(404)
+        if not os.path.exists(_variant_path(digest, variant)):
+            if not available() or not os.path.exists(_original_path(digest)):
+                abort(404)
+            render_variant(digest, variant)  # el worker aún no lo generó
+        response = send_from_directory(
+            os.path.join(_root(), "derived", digest[:2], digest), f"{variant}.webp",
+            mimetype="image/webp", max_age=None,
+        )
+        response.headers["Cache-Control"] = IMMUTABLE
+        return response
+
+    @app.cli.command("media-gc")
+    def media_gc():
+        """Delete stored covers no project references anymore."""
+        used = set(db.session.execute(db.select(Project.cover_hash).where(Project.cover_hash != "")).scalars())
+        removed = 0
+        for kind in ("originals", "derived"):
+            base = os.path.join(_root(), kind)
+            for shard in os.listdir(base) if os.path.isdir(base) else []:
+                for digest in os.listdir(os.path.join(base, shard)):
+                    if _DIGEST.match(digest) and digest not in used:
+                        path = os.path.join(base, shard, digest)
+                        if os.path.isdir(path):
+                            shutil.rmtree(path)
+                        else:
+                            os.remove(path)
+                        removed += kind == "originals"
+        print(f"✅ {removed} portadas sin uso eliminadas")
+
+    @app.context_processor
+    def _inject_media():
+        return {"cover_url": cover_url}
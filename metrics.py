@@ -0,0 +1,258 @@
+# metrics.py
+"""
+Instrumentación por request: tiempo total, render de plantillas, consultas SQL y caché.
+
+- SQL: eventos before/after_cursor_execute del Engine (cuenta + tiempo por request).
+- Plantillas: señales before_render_template / template_rendered de Flask.
+- Caché: page_cache y http_cache marcan g.cache_status (hit / miss / not_modified).
+
+Salidas:
+- GET /metrics en formato de texto Prometheus (por proceso: con varios workers de
+  gunicorn cada uno expone sus propios contadores; el scraper los suma por instancia).
+  Solo con METRICS_TOKEN (Bearer); sin token responde 404. Fuera del rate limit.
+- Header Server-Timing en modo debug (o METRICS_SERVER_TIMING=True).
+- logger.warning cuando un request supera REQUEST_BUDGET_MS o REQUEST_QUERY_BUDGET.
+"""
+import hmac
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, has_request_context, request, Response, abort, before_render_template, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Buckets de latencia (segundos) para el histograma
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Registry:
+    """Contadores en memoria del proceso, agregados por endpoint (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)          # (endpoint, method, status) -> n
+        self.duration = defaultdict(lambda: [0] * (len(BUCKETS) + 1))  # endpoint -> buckets
+        self.duration_sum = defaultdict(float)    # endpoint -> s
+        self.queries = defaultdict(int)           # endpoint -> n
+        self.query_seconds = defaultdict(float)   # endpoint -> s
+        self.template_seconds = defaultdict(float)
+        self.cache = defaultdict(int)             # (endpoint, result) -> n
+        self.over_budget = defaultdict(int)       # (endpoint, kind) -> n
+
+    def observe(self, endpoint, method, status, seconds, stats, cache, over):
+        with self._lock:
+            self.requests[(endpoint, method, status)] += 1
+            buckets = self.duration[endpoint]
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+                    break
+            else:
+                buckets[-1] += 1
+            self.duration_sum[endpoint] += seconds
+            self.queries[endpoint] += stats.queries
+            self.query_seconds[endpoint] += stats.query_seconds
+            self.template_seconds[endpoint] += stats.template_seconds
+            if cache:
+                self.cache[(endpoint, cache)] += 1
+            for kind in over:
+                self.over_budget[(endpoint, kind)] += 1
+
+    def render(self, cache_state=None, user_cache=None) -> str:
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        with self._lock:
+            family("portfolio_http_requests_total", "counter", "HTTP requests by endpoint, method and status.", [
+                f'portfolio_http_requests_total{{endpoint="{e}",method="{m}",status="{s}"}} {n}'
+                for (e, m, s), n in sorted(self.requests.items())
+            ])
+            samples = []
+            for endpoint, buckets in sorted(self.duration.items()):
+                cumulative = 0
+                for bound, n in zip(BUCKETS, buckets):
+                    cumulative += n
+                    samples.append(f'portfolio_http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+                cumulative += buckets[-1]
+                samples.append(f'portfolio_http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {cumulative}')
+                samples.append(f'portfolio_http_request_duration_seconds_sum{{endpoint="{endpoint}"}} {self.duration_sum[endpoint]:.6f}')
+                samples.append(f'portfolio_http_request_duration_seconds_count{{endpoint="{endpoint}"}} {cumulative}')
+            family("portfolio_http_request_duration_seconds", "histogram", "Request wall time.", samples)
+            family("portfolio_db_queries_total", "counter", "SQL statements executed while serving requests.", [
+                f'portfolio_db_queries_total{{endpoint="{e}"}} {n}' for e, n in sorted(self.queries.items())
+            ])
+            family("portfolio_db_query_seconds_total", "counter", "Time spent in SQL while serving requests.", [
+                f'portfolio_db_query_seconds_total{{endpoint="{e}"}} {s:.6f}' for e, s in sorted(self.query_seconds.items())
+            ])
+            family("portfolio_template_render_seconds_total", "counter", "Time spent rendering templates.", [
+                f'portfolio_template_render_seconds_total{{endpoint="{e}"}} {s:.6f}' for e, s in sorted(self.template_seconds.items())
+            ])
+            family("portfolio_cache_requests_total", "counter", "Page cache / conditional GET outcome per request.", [
+                f'portfolio_cache_requests_total{{endpoint="{e}",result="{r}"}} {n}' for (e, r), n in sorted(self.cache.items())
+            ])
+            family("portfolio_request_budget_exceeded_total", "counter", "Requests over the latency or query budget.", [
+                f'portfolio_request_budget_exceeded_total{{endpoint="{e}",budget="{k}"}} {n}'
+                for (e, k), n in sorted(self.over_budget.items())
+            ])
+        if cache_state is not None:
+            family("portfolio_page_cache_hits_total", "counter", "Page cache hits (process).", [
+                f"portfolio_page_cache_hits_total {cache_state.hits}"])
+            family("portfolio_page_cache_misses_total", "counter", "Page cache misses (process).", [
+                f"portfolio_page_cache_misses_total {cache_state.misses}"])
+        if user_cache is not None:
+            family("portfolio_user_cache_hits_total", "counter", "Logged-in user loads served from cache (process).", [
+                f"portfolio_user_cache_hits_total {user_cache.hits}"])
+            family("portfolio_user_cache_misses_total", "counter", "Logged-in user loads that queried the DB (process).", [
+                f"portfolio_user_cache_misses_total {user_cache.misses}"])
+            family("portfolio_user_cache_invalidations_total", "counter", "Cached identities dropped by logout or user changes.", [
+                f"portfolio_user_cache_invalidations_total {user_cache.invalidations}"])
+        return "\n".join(lines) + "\n"
+
+
+class _RequestStats:
+    __slots__ = ("queries", "query_seconds", "template_seconds", "_tpl_start")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.template_seconds = 0.0
+        self._tpl_start = None
+
+
+def _stats():
+    return g.get("_metrics") if has_request_context() else None
+
+
+# --- SQL (global: un solo listener para todos los engines) ---
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_metrics_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_metrics_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _stats()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Una sentencia que falla no llega a after_cursor_execute: sacar su inicio para que
+    # no se acumule en conexiones del pool (ni empareje mal con la siguiente)
+    conn = exception_context.connection
+    starts = conn.info.get("_metrics_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+# --- PLANTILLAS ---
+
+def _before_render(sender, template, context, **extra):
+    stats = _stats()
+    if stats is not None:
+        stats._tpl_start = time.perf_counter()
+
+
+def _after_render(sender, template, context, **extra):
+    stats = _stats()
+    if stats is not None and stats._tpl_start is not None:
+        stats.template_seconds += time.perf_counter() - stats._tpl_start
+        stats._tpl_start = None
+
+
+def _server_timing(total, stats, cache) -> str:
+    parts = [
+        f"app;dur={total * 1000:.1f}",
+        f'db;dur={stats.query_seconds * 1000:.1f};desc="{stats.queries} queries"',
+        f"tpl;dur={stats.template_seconds * 1000:.1f}",
+    ]
+    if cache:
+        parts.append(f'cache;desc="{cache}"')
+    return ", ".join(parts)
+
+
+def init_app(app):
+    app.config.setdefault("METRICS_ENABLED", True)
+    app.config.setdefault("METRICS_TOKEN", "")
+    app.config.setdefault("METRICS_SERVER_TIMING", None)  # None = solo en debug
+    app.config.setdefault("REQUEST_BUDGET_MS", 500)
+    app.config.setdefault("REQUEST_QUERY_BUDGET", 20)
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    registry = Registry()
+    app.extensions["metrics"] = registry
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    @app.before_request
+    def _start_timer():
+        g._metrics = _RequestStats()
+        g._metrics_start = time.perf_counter()
+
+    def _observe(status_code):
+        stats = g.pop("_metrics", None)
+        if stats is None:
+            return None
+        total = time.perf_counter() - g._metrics_start
+        endpoint = request.endpoint or "unknown"
+        cache = g.get("cache_status")
+
+        over = []
+        if total * 1000 > app.config["REQUEST_BUDGET_MS"]:
+            over.append("latency")
+        if stats.queries > app.config["REQUEST_QUERY_BUDGET"]:
+            over.append("queries")
+        if over:
+            logger.warning("Request over budget", extra={
+                "event": "request.over_budget", "method": request.method, "path": request.path,
+                "duration_ms": round(total * 1000, 1), "queries": stats.queries,
+                "sql_ms": round(stats.query_seconds * 1000, 1),
+                "template_ms": round(stats.template_seconds * 1000, 1),
+            })
+
+        registry.observe(endpoint, request.method, status_code, total, stats, cache, over)
+        return total, stats, cache
+
+    @app.after_request
+    def _record(response):
+        observed = _observe(response.status_code)
+        server_timing = app.config["METRICS_SERVER_TIMING"]
+        if observed and (server_timing or (server_timing is None and app.debug)):
+            response.headers["Server-Timing"] = _server_timing(*observed)
+        return response
+
+    @app.teardown_request
+    def _record_error(exc):
+        # Sin after_request (excepción propagada en debug/testing, o un after_request que
+        # falló antes que _record): el request igual cuenta, como 500
+        if "_metrics" in g:
+            _observe(500)
+
+    @app.get("/metrics")
+    def metrics():
+        # Sin token no se publica: expone tráfico por endpoint (admin y login incluidos)
+        token = app.config["METRICS_TOKEN"]
+        if not token:
+            abort(404)
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            abort(403)
+        response = Response(registry.render(app.extensions.get("page_cache"), app.extensions.get("user_cache")),
+                            mimetype="text/plain; version=0.0.4")
+        response.headers["Cache-Control"] = "no-store"
+        return response
@@ -0,0 +1,25 @@
+"""project uploaded cover hash
+
+Revision ID: 0b6e2f4a8d13
+Revises: f3a1d7b5c920
+Create Date: 2026-10-18 17:12:03.441907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6e2f4a8d13'
+down_revision = 'f3a1d7b5c920'
+branch_labels = None
+depends_on = None
+
+
+# Sin batch: en SQLite recrearía `projects` y perdería los triggers FTS
+def upgrade():
+    op.add_column('projects', sa.Column('cover_hash', sa.String(length=64), nullable=False, server_default=''))
+
+
+def downgrade():
+    op.drop_column('projects', 'cover_hash')
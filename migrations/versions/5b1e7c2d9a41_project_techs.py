@@ -0,0 +1,53 @@
+"""project techs
+
+Revision ID: 5b1e7c2d9a41
+Revises: 34a09f632df3
+Create Date: 2026-10-18 10:12:04.311842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e7c2d9a41'
+down_revision = '34a09f632df3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('project_techs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=60), nullable=False),
+    sa.Column('name', sa.String(length=60), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id', 'key', name='uq_project_techs_project_key')
+    )
+    op.create_index('ix_project_techs_key_project', 'project_techs', ['key', 'project_id'], unique=False)
+
+    # Backfill desde el CSV existente (misma normalización que models.normalize_tech)
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, tech_stack FROM projects")).fetchall()
+    techs = sa.table('project_techs',
+                     sa.column('project_id', sa.Integer),
+                     sa.column('key', sa.String),
+                     sa.column('name', sa.String))
+    values = []
+    for project_id, tech_stack in rows:
+        seen = set()
+        for raw in (tech_stack or "").split(","):
+            name = raw.strip()
+            key = name.lower()[:60]
+            if key and key not in seen:
+                seen.add(key)
+                values.append({"project_id": project_id, "key": key, "name": name[:60]})
+    if values:
+        op.bulk_insert(techs, values)
+
+
+def downgrade():
+    op.drop_index('ix_project_techs_key_project', table_name='project_techs')
+    op.drop_table('project_techs')
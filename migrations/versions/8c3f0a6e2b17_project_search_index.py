@@ -0,0 +1,83 @@
+"""project full-text search index
+
+Revision ID: 8c3f0a6e2b17
+Revises: 5b1e7c2d9a41
+Create Date: 2026-10-18 11:40:52.904113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3f0a6e2b17'
+down_revision = '5b1e7c2d9a41'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        title, summary, description, tech_stack,
+        content='projects', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, title, summary, description, tech_stack)
+        VALUES (new.id, new.title, new.summary, new.description, new.tech_stack);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, summary, description, tech_stack)
+        VALUES ('delete', old.id, old.title, old.summary, old.description, old.tech_stack);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, summary, description, tech_stack)
+        VALUES ('delete', old.id, old.title, old.summary, old.description, old.tech_stack);
+        INSERT INTO projects_fts(rowid, title, summary, description, tech_stack)
+        VALUES (new.id, new.title, new.summary, new.description, new.tech_stack);
+    END""",
+    # Indexar las filas que ya existen
+    "INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS projects_fts_au",
+    "DROP TRIGGER IF EXISTS projects_fts_ad",
+    "DROP TRIGGER IF EXISTS projects_fts_ai",
+    "DROP TABLE IF EXISTS projects_fts",
+]
+
+POSTGRES_UPGRADE = [
+    """ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(tech_stack, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(summary, '')), 'C') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'D')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING GIN (search_vector)",
+]
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_projects_search_vector",
+    "ALTER TABLE projects DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements):
+    for stmt in statements:
+        op.execute(sa.text(stmt))
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_UPGRADE)
+    elif dialect == 'postgresql':
+        _run(POSTGRES_UPGRADE)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_DOWNGRADE)
+    elif dialect == 'postgresql':
+        _run(POSTGRES_DOWNGRADE)
@@ -0,0 +1,49 @@
+"""jobs table and contact message delivery link
+
+Revision ID: a4d92e51c0f8
+Revises: 8c3f0a6e2b17
+Create Date: 2026-10-18 13:05:37.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d92e51c0f8'
+down_revision = '8c3f0a6e2b17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=40), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('locked_by', sa.String(length=64), nullable=True),
+    sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_status_run_at', 'jobs', ['status', 'run_at'], unique=False)
+
+    with op.batch_alter_table('contact_messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('email_job_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_contact_messages_email_job_id_jobs', 'jobs',
+                                    ['email_job_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade():
+    with op.batch_alter_table('contact_messages', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_contact_messages_email_job_id_jobs', type_='foreignkey')
+        batch_op.drop_column('email_job_id')
+
+    op.drop_index('ix_jobs_status_run_at', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,38 @@
+"""content versions for listing etags
+
+Revision ID: b3d8f1c6a027
+Revises: 0b6e2f4a8d13
+Create Date: 2026-10-19 09:05:12.318044
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d8f1c6a027'
+down_revision = '0b6e2f4a8d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    content_versions = op.create_table('content_versions',
+    sa.Column('name', sa.String(length=40), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Fila inicial: última modificación conocida del catálogo
+    last = op.get_bind().execute(sa.text("SELECT max(updated_at) FROM projects")).scalar()
+    if isinstance(last, str):  # SQLite devuelve texto en agregados
+        last = datetime.fromisoformat(last)
+    op.bulk_insert(content_versions, [
+        {'name': 'projects', 'version': 1, 'changed_at': last or datetime.now(timezone.utc)},
+    ])
+
+
+def downgrade():
+    op.drop_table('content_versions')
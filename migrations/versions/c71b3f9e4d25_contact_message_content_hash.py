@@ -0,0 +1,55 @@
+"""contact message content hash + dedup index
+
+Revision ID: c71b3f9e4d25
+Revises: a4d92e51c0f8
+Create Date: 2026-10-18 14:22:10.583961
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71b3f9e4d25'
+down_revision = 'a4d92e51c0f8'
+branch_labels = None
+depends_on = None
+
+BATCH = 1000
+
+
+def upgrade():
+    with op.batch_alter_table('contact_messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=False, server_default=''))
+
+    # Backfill por lotes (misma función que models.message_hash)
+    bind = op.get_bind()
+    messages = sa.table('contact_messages',
+                        sa.column('id', sa.Integer),
+                        sa.column('message', sa.Text),
+                        sa.column('content_hash', sa.String))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(messages.c.id, messages.c.message)
+            .where(messages.c.id > last_id).order_by(messages.c.id).limit(BATCH)
+        ).fetchall()
+        if not rows:
+            break
+        for row_id, message in rows:
+            bind.execute(
+                messages.update().where(messages.c.id == row_id)
+                .values(content_hash=hashlib.sha256((message or "").encode("utf-8")).hexdigest())
+            )
+        last_id = rows[-1][0]
+
+    op.create_index('ix_contact_messages_dedup', 'contact_messages',
+                    ['email', 'content_hash', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_contact_messages_dedup', table_name='contact_messages')
+    with op.batch_alter_table('contact_messages', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
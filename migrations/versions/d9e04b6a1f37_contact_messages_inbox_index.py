@@ -0,0 +1,25 @@
+"""contact messages inbox keyset index
+
+Revision ID: d9e04b6a1f37
+Revises: c71b3f9e4d25
+Create Date: 2026-10-18 15:03:41.772519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e04b6a1f37'
+down_revision = 'c71b3f9e4d25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_contact_messages_inbox', 'contact_messages',
+                    ['processed', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_contact_messages_inbox', table_name='contact_messages')
@@ -0,0 +1,24 @@
+"""projects created_at cursor index
+
+Revision ID: e25a8c4f7b90
+Revises: d9e04b6a1f37
+Create Date: 2026-10-18 15:48:26.240917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e25a8c4f7b90'
+down_revision = 'd9e04b6a1f37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_projects_created_at_id', 'projects', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_projects_created_at_id', table_name='projects')
@@ -0,0 +1,30 @@
+"""project localized (es) columns
+
+Revision ID: f3a1d7b5c920
+Revises: e25a8c4f7b90
+Create Date: 2026-10-18 16:05:41.118230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a1d7b5c920'
+down_revision = 'e25a8c4f7b90'
+branch_labels = None
+depends_on = None
+
+
+# ADD/DROP COLUMN simples (sin batch): en SQLite batch recrea `projects` y se
+# perderían los triggers FTS de projects_fts.
+def upgrade():
+    op.add_column('projects', sa.Column('title_es', sa.String(length=120), nullable=False, server_default=''))
+    op.add_column('projects', sa.Column('summary_es', sa.String(length=280), nullable=False, server_default=''))
+    op.add_column('projects', sa.Column('description_es', sa.Text(), nullable=False, server_default=''))
+
+
+def downgrade():
+    op.drop_column('projects', 'description_es')
+    op.drop_column('projects', 'summary_es')
+    op.drop_column('projects', 'title_es')
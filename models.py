@@ -1,17 +1,90 @@
 # models.py
+import hashlib
+import secrets
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from flask import current_app, g, has_request_context, session as http_session
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import Integer, String, Text, Boolean, DateTime
-from flask_login import UserMixin
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, Session
+from sqlalchemy import Integer, String, Text, Boolean, DateTime, ForeignKey, Index, UniqueConstraint, create_engine, event, inspect
+from flask_login import UserMixin, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 
 #
 class Base(DeclarativeBase):
     pass
 
+
+# --- RÉPLICA DE LECTURA ---
+# Con DB_REPLICA_URI (engine en app.extensions["db_replica"]), las vistas marcadas con @use_replica leen de la
+# réplica; cualquier escritura (flush o DML explícito) y todo lo demás va a la primaria.
+# Read-after-write: el usuario logueado que escribió (admin que guarda) queda fijado a
+# la primaria DB_REPLICA_PIN_SECONDS para no ver su cambio "deshecho".
+def _reads_from_replica() -> bool:
+    if not has_request_context() or not g.get("db_replica") or g.get("db_wrote"):
+        return False
+    return http_session.get("db_pin", 0) <= time.time()
+
+
+class RoutingSession(FlaskSession):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and not getattr(clause, "is_dml", False)
+                and _reads_from_replica()):
+            replica = current_app.extensions.get("db_replica")
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+def use_replica(view):
+    """Decorador (el más externo, bajo @app.get): la vista y su versión ETag leen de la réplica."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def init_replica(app):
+    """Crear el engine de la réplica y fijar a la primaria a quien acaba de escribir (no-op sin réplica)."""
+    uri = app.config.get("DB_REPLICA_URI")
+    if not uri:
+        return
+    # Engine aparte (no un bind de Flask-SQLAlchemy): los modelos no tienen __bind_key__
+    # y create_all / migraciones solo deben tocar la primaria. Pool propio
+    # (db_profiles.replica_engine_options): con el de la primaria cada worker abriría
+    # el doble de conexiones de las que presupuesta DB_MAX_CONNECTIONS
+    app.extensions["db_replica"] = create_engine(uri, **app.config.get("DB_REPLICA_ENGINE_OPTIONS", {}))
+
+    @app.after_request
+    def _pin_writer(response):
+        # Solo quien vuelve a leer lo que escribió (el admin). Un /contact anónimo escribe,
+        # pero no ve su mensaje en las páginas públicas: sin db_pin en su sesión
+        if g.get("db_wrote") and current_user.is_authenticated:
+            http_session["db_pin"] = int(time.time()) + app.config.get("DB_REPLICA_PIN_SECONDS", 10)
+        return response
+
+
 # Global DB object
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_write(session, flush_context):
+    if has_request_context():
+        g.db_wrote = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    # update()/delete() masivos no pasan por flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        if has_request_context():
+            g.db_wrote = True
 
 # Mixin for timestamp fields
 class TimestampMixin:
@@ -27,6 +100,69 @@ class TimestampMixin:
     )
 
 
+# --- CONTRASEÑAS ---
+# Política en config, formato de werkzeug: PASSWORD_HASH_METHOD = "scrypt:32768:8:1" (~130 ms de CPU
+# y 32 MB por verificación) o "pbkdf2:sha256:600000" (~280 ms). Un hash guardado con otra política
+# se re-genera en el siguiente login correcto (User.check_password).
+# PASSWORD_HASH_CONCURRENCY acota las verificaciones simultáneas por proceso: una ráfaga de logins
+# espera hasta PASSWORD_HASH_WAIT s (y luego PasswordBusy) en vez de ocupar todos los hilos.
+DEFAULT_PASSWORD_METHOD = "scrypt:32768:8:1"
+DEFAULT_PASSWORD_SALT_LENGTH = 16
+
+
+class PasswordBusy(RuntimeError):
+    """Sin ranura libre para verificar una contraseña (login flood)."""
+
+
+def _password_policy() -> tuple[str, int]:
+    config = current_app.config
+    return (config.get("PASSWORD_HASH_METHOD", DEFAULT_PASSWORD_METHOD),
+            config.get("PASSWORD_SALT_LENGTH", DEFAULT_PASSWORD_SALT_LENGTH))
+
+
+@lru_cache(maxsize=8)
+def _reference_hash(method: str, salt_length: int) -> str:
+    # Uno por política y proceso: su prefijo es el método normalizado (werkzeug completa los
+    # parámetros por defecto) y sirve para la verificación "en falso" de emails inexistentes
+    return generate_password_hash(secrets.token_hex(16), method=method, salt_length=salt_length)
+
+
+@contextmanager
+def _hash_slot():
+    slots = current_app.extensions.get("password_slots")
+    if slots is None:
+        yield
+        return
+    if not slots.acquire(timeout=current_app.config.get("PASSWORD_HASH_WAIT", 2)):
+        raise PasswordBusy()
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+def password_needs_rehash(stored: str) -> bool:
+    """¿El hash guardado usa otro método, otros parámetros u otro largo de sal que la política actual?"""
+    if stored.count("$") < 2:
+        return True
+    method, salt, _ = stored.split("$", 2)
+    ref_method, ref_salt, _ = _reference_hash(*_password_policy()).split("$", 2)
+    return method != ref_method or len(salt) != len(ref_salt)
+
+
+def dummy_password_check(raw: str) -> bool:
+    """Mismo costo que un login real cuando el email no existe (sin oráculo de tiempos). Siempre False."""
+    reference = _reference_hash(*_password_policy())
+    with _hash_slot():
+        check_password_hash(reference, raw)
+    return False
+
+
+def init_passwords(app):
+    app.config.setdefault("PASSWORD_HASH_CONCURRENCY", 2)
+    app.extensions["password_slots"] = threading.BoundedSemaphore(max(1, app.config["PASSWORD_HASH_CONCURRENCY"]))
+
+
 # User model for admin users
 class User(UserMixin, db.Model, TimestampMixin):
     __tablename__ = "users"
@@ -38,15 +174,25 @@ class User(UserMixin, db.Model, TimestampMixin):
 
     # --- Password helpers ---
     def set_password(self, raw: str) -> None:
-        # NOTE: Use a strong hashing method
-        self.password_hash = generate_password_hash(raw, method="pbkdf2:sha256", salt_length=8)
+        method, salt_length = _password_policy()
+        with _hash_slot():
+            self.password_hash = generate_password_hash(raw, method=method, salt_length=salt_length)
 
     def check_password(self, raw: str) -> bool:
-        return check_password_hash(self.password_hash, raw)
+        """Verificar; si el hash es de una política vieja se re-genera (lo guarda el commit del llamador)."""
+        with _hash_slot():
+            ok = check_password_hash(self.password_hash, raw)
+        if ok and password_needs_rehash(self.password_hash):
+            self.set_password(raw)
+        return ok
 
 # Project model for portfolio projects
 class Project(db.Model, TimestampMixin):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Cursor pagination ORDER BY created_at DESC, id DESC (scanned backwards)
+        Index("ix_projects_created_at_id", "created_at", "id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(120), unique=True, nullable=False)
     slug: Mapped[str] = mapped_column(String(140), unique=True, nullable=False)
@@ -56,13 +202,177 @@ class Project(db.Model, TimestampMixin):
     repo_url: Mapped[str] = mapped_column(String(240), default="")
     live_url: Mapped[str] = mapped_column(String(240), default="")
     cover_image: Mapped[str] = mapped_column(String(240), default="")
+    # sha256 of an uploaded cover in the media store (media.py); takes precedence over cover_image
+    cover_hash: Mapped[str] = mapped_column(String(64), default="", server_default="")
     is_featured: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Localized copies (empty = fall back to the base language); read via i18n.get_loc_attr
+    title_es: Mapped[str] = mapped_column(String(120), default="", server_default="")
+    summary_es: Mapped[str] = mapped_column(String(280), default="", server_default="")
+    description_es: Mapped[str] = mapped_column(Text, default="", server_default="")
+
+    # Normalized copy of tech_stack (one row per technology) for indexed filtering
+    techs: Mapped[list["ProjectTech"]] = relationship(
+        back_populates="project", cascade="all, delete-orphan", lazy="select"
+    )
+
+    @property
+    def has_cover(self) -> bool:
+        return bool(self.cover_hash or self.cover_image)
+
+    def sync_techs(self) -> None:
+        """Rebuild the `techs` rows from the CSV in `tech_stack` (diff, not delete+insert)."""
+        wanted = {}
+        for raw in (self.tech_stack or "").split(","):
+            name = raw.strip()
+            key = normalize_tech(name)
+            if key and key not in wanted:
+                wanted[key] = name[:60]
+
+        for tag in list(self.techs):
+            if tag.key not in wanted:
+                self.techs.remove(tag)
+            else:
+                tag.name = wanted.pop(tag.key)
+        for key, name in wanted.items():
+            self.techs.append(ProjectTech(key=key, name=name))
+
+
+def normalize_tech(name: str) -> str:
+    # "  Python " / "python" / "PYTHON" -> "python"
+    return (name or "").strip().lower()[:60]
+
+
+# One row per (project, technology). The `key` index makes /projects?tech= an exact lookup
+class ProjectTech(db.Model):
+    __tablename__ = "project_techs"
+    __table_args__ = (
+        UniqueConstraint("project_id", "key", name="uq_project_techs_project_key"),
+        Index("ix_project_techs_key_project", "key", "project_id"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    key: Mapped[str] = mapped_column(String(60), nullable=False)
+    name: Mapped[str] = mapped_column(String(60), nullable=False)
+
+    project: Mapped["Project"] = relationship(back_populates="techs")
+
+
+# Mantener los tags sincronizados sin importar quién escriba tech_stack (admin, CLI, tests)
+@event.listens_for(Session, "before_flush")
+def _sync_project_techs(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Project):
+            continue
+        if obj in session.new or inspect(obj).attrs.tech_stack.history.has_changes():
+            obj.sync_techs()
+
+
+# --- VERSIÓN DEL CATÁLOGO ---
+# Una fila por colección, subida en la misma transacción por cualquier alta/edición/baja de
+# Project (flush o DML masivo). El ETag de los listados es una lectura por PK en vez de
+# max(updated_at) + count() sobre toda la tabla.
+PROJECTS_VERSION = "projects"
+
+
+class ContentVersion(db.Model):
+    __tablename__ = "content_versions"
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+def bump_content_version(connection, name: str = PROJECTS_VERSION) -> None:
+    table = ContentVersion.__table__
+    now = datetime.now(timezone.utc)
+    result = connection.execute(table.update().where(table.c.name == name)
+                                .values(version=table.c.version + 1, changed_at=now))
+    if result.rowcount == 0:  # base creada con create_all (la migración ya trae la fila)
+        connection.execute(table.insert().values(name=name, version=1, changed_at=now))
+
+
+def content_version(name: str = PROJECTS_VERSION):
+    """(changed_at, version) de la colección, o None si nunca se escribió por el ORM."""
+    row = db.session.execute(
+        db.select(ContentVersion.changed_at, ContentVersion.version).filter_by(name=name)
+    ).first()
+    return (row.changed_at, row.version) if row else None
+
+
+def _version_connection(session):
+    return session.connection(bind_arguments={"mapper": inspect(ContentVersion)})
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_flush(session, flush_context):
+    changed = any(isinstance(obj, Project) for obj in session.new) or any(
+        isinstance(obj, Project) for obj in session.deleted) or any(
+        isinstance(obj, Project) and session.is_modified(obj) for obj in session.dirty)
+    if changed:
+        bump_content_version(_version_connection(session))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_on_dml(orm_execute_state):
+    # insert()/update()/delete() de Project ejecutados directo no pasan por flush
+    if ((orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete)
+            and orm_execute_state.bind_mapper is inspect(Project)):
+        bump_content_version(_version_connection(orm_execute_state.session))
+
+# Background job persisted in the DB (survives restarts, shared by every gunicorn worker)
+class Job(db.Model, TimestampMixin):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    DEAD = "dead"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(40), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, default="{}")  # JSON
+    status: Mapped[str] = mapped_column(String(16), default=PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=5)
+    run_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    locked_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str] = mapped_column(Text, default="")
+
 # Contact message model for storing messages from the contact form
+def message_hash(message: str) -> str:
+    return hashlib.sha256((message or "").encode("utf-8")).hexdigest()
+
+
 class ContactMessage(db.Model, TimestampMixin):
     __tablename__ = "contact_messages"
+    __table_args__ = (
+        # Anti-duplicados: (email, hash, ventana de tiempo) resuelto por índice
+        Index("ix_contact_messages_dedup", "email", "content_hash", "created_at"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(120), nullable=False)
     email: Mapped[str] = mapped_column(String(240), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
     processed: Mapped[bool] = mapped_column(Boolean, default=False)
+    # sha256 of `message`, filled on INSERT from the message itself
+    content_hash: Mapped[str] = mapped_column(
+        String(64), default=lambda ctx: message_hash(ctx.get_current_parameters()["message"])
+    )
+
+    # Notification email for this message (None if CONTACT_RECIPIENT was not set)
+    email_job_id: Mapped[int | None] = mapped_column(ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True)
+    email_job: Mapped[Job | None] = relationship()
+
+    @property
+    def delivery_status(self) -> str:
+        return self.email_job.status if self.email_job else "none"
+
+
+# Admin inbox keyset: ORDER BY processed, created_at DESC, id DESC straight from the index
+Index("ix_contact_messages_inbox", ContactMessage.processed,
+      ContactMessage.created_at.desc(), ContactMessage.id.desc())
@@ -0,0 +1,311 @@
+# page_cache.py
+"""
+Caché de páginas renderizadas para las rutas públicas.
+
+La clave es (endpoint, args, idioma). Cada entrada lleva tags ("project-lists",
+"project:<slug>") para que el admin invalide exactamente lo que cambió al guardar.
+
+Backends (PAGE_CACHE_URL):
+    memory://                 LRU + TTL en el proceso (por defecto)
+    sqlite:////tmp/pages.db   compartido entre workers de gunicorn en el mismo host
+    redis://localhost:6379/0  compartido entre hosts (requiere el paquete `redis`)
+    null://                   desactivado
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode, urlparse
+
+from flask import current_app, g, request, session, make_response
+
+import i18n
+
+LISTS_TAG = "project-lists"
+
+
+def project_tag(slug: str) -> str:
+    return f"project:{slug}"
+
+
+# Headers que no se guardan: los recalcula Werkzeug o son de un solo visitante
+_SKIP_HEADERS = {"content-length", "set-cookie", "date", "connection", "transfer-encoding"}
+
+
+# --- Serialización (sin pickle: el store puede ser compartido) ---
+def _dump(status: int, headers: list, body: bytes) -> bytes:
+    return json.dumps({"status": status, "headers": headers}).encode() + b"\n" + body
+
+
+def _load(raw: bytes):
+    meta, _, body = raw.partition(b"\n")
+    meta = json.loads(meta)
+    headers = meta["headers"]
+    # Lista de pares (repetidos incluidos); las entradas viejas guardaban un dict
+    headers = list(headers.items()) if isinstance(headers, dict) else [tuple(h) for h in headers]
+    return meta["status"], headers, body
+
+
+# --- BACKENDS ---
+
+class NullBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl, tags):
+        pass
+
+    def invalidate(self, tags):
+        pass
+
+    def clear(self):
+        pass
+
+
+class MemoryBackend:
+    """LRU acotado por número de entradas, con expiración por TTL. Thread-safe."""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}             # tag -> set(keys)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                self._drop(key)
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value, ttl, tags):
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_entries:
+                self._drop(next(iter(self._data)))
+
+    def invalidate(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+
+    def _drop(self, key):
+        _, _, tags = self._data.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class SQLiteBackend:
+    """
+    Store compartido en un archivo SQLite (sustituto local de Redis).
+    Expira por TTL; si supera max_entries se descartan primero las que expiran antes.
+    """
+
+    def __init__(self, path, max_entries=512):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS page_cache (
+                    key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL);
+                CREATE INDEX IF NOT EXISTS ix_page_cache_expires ON page_cache (expires_at);
+                CREATE TABLE IF NOT EXISTS page_cache_tags (
+                    tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key));
+            """)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM page_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl, tags):
+        conn = self._conn()
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT OR REPLACE INTO page_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                         (key, value, now + ttl))
+            conn.executemany("INSERT OR IGNORE INTO page_cache_tags (tag, key) VALUES (?, ?)",
+                             [(tag, key) for tag in tags])
+            conn.execute("DELETE FROM page_cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM page_cache WHERE key IN (SELECT key FROM page_cache "
+                "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+            conn.execute("DELETE FROM page_cache_tags WHERE key NOT IN (SELECT key FROM page_cache)")
+
+    def invalidate(self, tags):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for tag in tags:
+                conn.execute("DELETE FROM page_cache WHERE key IN "
+                             "(SELECT key FROM page_cache_tags WHERE tag = ?)", (tag,))
+                conn.execute("DELETE FROM page_cache_tags WHERE tag = ?", (tag,))
+
+    def clear(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM page_cache")
+            conn.execute("DELETE FROM page_cache_tags")
+
+
+class RedisBackend:
+    """Store compartido en Redis. Configurar `maxmemory-policy allkeys-lru` en el servidor."""
+
+    def __init__(self, url, prefix="pages:"):
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - dependencia opcional
+            raise RuntimeError("PAGE_CACHE_URL=redis:// requires the 'redis' package") from exc
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl, tags):
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, value, ex=int(ttl))
+        for tag in tags:
+            pipe.sadd(f"{self.prefix}tag:{tag}", key)
+            pipe.expire(f"{self.prefix}tag:{tag}", int(ttl))
+        pipe.execute()
+
+    def invalidate(self, tags):
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            keys = self.client.smembers(tag_key)
+            pipe = self.client.pipeline()
+            for key in keys:
+                pipe.delete(self.prefix + key.decode())
+            pipe.delete(tag_key)
+            pipe.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def backend_from_url(url: str, max_entries: int = 512):
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryBackend(max_entries=max_entries)
+    if parsed.scheme == "sqlite":
+        return SQLiteBackend(url[len("sqlite:///"):], max_entries=max_entries)
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisBackend(url)
+    if parsed.scheme == "null":
+        return NullBackend()
+    raise ValueError(f"Unsupported PAGE_CACHE_URL: {url}")
+
+
+# --- EXTENSIÓN ---
+
+class _CacheState:
+    """Estado por app (backend + contadores), guardado en app.extensions["page_cache"]."""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+
+class PageCache:
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PAGE_CACHE_URL", "memory://")
+        app.config.setdefault("PAGE_CACHE_TTL", 300)
+        app.config.setdefault("PAGE_CACHE_MAX_ENTRIES", 512)
+        backend = backend_from_url(app.config["PAGE_CACHE_URL"],
+                                   max_entries=int(app.config["PAGE_CACHE_MAX_ENTRIES"]))
+        app.extensions["page_cache"] = _CacheState(backend, int(app.config["PAGE_CACHE_TTL"]))
+
+    @property
+    def state(self) -> _CacheState:
+        return current_app.extensions["page_cache"]
+
+    @staticmethod
+    def make_key(endpoint, args, lang):
+        # urlencode re-escapa & y =: ?tech=a%26page%3D2 y ?tech=a&page=2 no comparten clave
+        query = urlencode(sorted(args.items(multi=True)))
+        return f"{endpoint}|{query}|{lang}"
+
+    def cached(self, tags=(), ttl=None):
+        """
+        Decorador para vistas GET públicas. `tags` puede ser una lista o una función
+        que recibe los kwargs de la vista (p.ej. lambda slug: [project_tag(slug)]).
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(**kwargs):
+                # Los flashes se renderizan en la página: esas respuestas no se comparten
+                if request.method != "GET" or "_flashes" in session:
+                    return view(**kwargs)
+
+                state = self.state
+                key = self.make_key(request.endpoint, request.args, i18n.current_lang())
+                if "content_version" in g:  # fijada por http_cache.conditional
+                    key = f"{key}|{g.content_version}"
+                raw = state.backend.get(key)
+                if raw is not None:
+                    state.hits += 1
+                    g.cache_status = "hit"
+                    status, headers, body = _load(raw)
+                    return make_response(body, status, headers)
+
+                state.misses += 1
+                g.cache_status = "miss"
+                response = make_response(view(**kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    entry_tags = tags(**kwargs) if callable(tags) else tags
+                    # Vary, Content-Language, Cache-Control...: un hit responde igual que el miss
+                    headers = [[k, v] for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS]
+                    state.backend.set(key, _dump(200, headers, response.get_data()),
+                                      ttl or state.ttl, list(entry_tags))
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        self.state.backend.invalidate(tags)
+
+    def clear(self):
+        self.state.backend.clear()
+
+
+page_cache = PageCache()
@@ -0,0 +1,111 @@
+# pagination.py
+"""
+Paginación por cursor (keyset): WHERE (cols) "después de" la última fila vista.
+
+El costo de cada página es O(log n + page_size) sin importar cuán profundo se navegue,
+a diferencia de OFFSET. El cursor es opaco para el cliente (base64 de JSON).
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import and_, or_, literal
+
+from models import db
+
+
+def encode_cursor(values: list) -> str:
+    raw = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(raw).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None, columns) -> list | None:
+    """Devuelve los valores del cursor (o None si no hay / es inválido)."""
+    if not token:
+        return None
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(raw, list) or len(raw) != len(columns):
+        return None
+    values = []
+    for (column, _), value in zip(columns, raw):
+        value = _coerce(column, value)
+        if value is _INVALID:
+            return None
+        values.append(value)
+    return values
+
+
+_INVALID = object()
+
+
+def _coerce(column, value):
+    """Valor del cursor con el tipo de Python de su columna, o _INVALID (cursor manipulado)."""
+    if value is None:
+        return None if getattr(column, "nullable", False) else _INVALID
+    try:
+        expected = column.type.python_type
+    except NotImplementedError:
+        expected = None
+    if expected is datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return _INVALID
+    # bool es subclase de int: True no sirve donde va un id, ni 1 donde va un booleano
+    if expected is bool:
+        return value if isinstance(value, bool) else _INVALID
+    if expected is int:
+        return value if isinstance(value, int) and not isinstance(value, bool) else _INVALID
+    if expected is float:
+        return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else _INVALID
+    if expected is str:
+        return value if isinstance(value, str) else _INVALID
+    return value if isinstance(value, (str, int, float)) and not isinstance(value, bool) else _INVALID
+
+
+def after(columns, values):
+    """
+    Predicado "fila posterior al cursor" para un ORDER BY mixto.
+    `columns` = [(columna, "asc"|"desc"), ...] en el mismo orden que el ORDER BY.
+    """
+    # literal(): SQLAlchemy no acepta `col > False` con booleanos de Python
+    bound = [literal(v, type_=c.type) for (c, _), v in zip(columns, values)]
+    clauses = []
+    for i, (column, direction) in enumerate(columns):
+        equal = [c == b for (c, _), b in zip(columns[:i], bound[:i])]
+        beyond = column > bound[i] if direction == "asc" else column < bound[i]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+def order_by(columns):
+    return [c.asc() if d == "asc" else c.desc() for c, d in columns]
+
+
+@dataclass
+class Page:
+    items: list
+    next_cursor: str | None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def paginate(stmt, columns, cursor: str | None, per_page: int) -> Page:
+    """Ejecuta `stmt` ordenado por `columns` desde `cursor`, trayendo per_page + 1 filas."""
+    values = decode_cursor(cursor, columns)
+    if values is not None:
+        stmt = stmt.where(after(columns, values))
+    rows = db.session.execute(stmt.order_by(*order_by(columns)).limit(per_page + 1)).scalars().all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c, _ in columns])
+    return Page(items=rows, next_cursor=next_cursor)
@@ -0,0 +1,92 @@
+# ratelimit_storage.py
+"""
+Storage compartido para Flask-Limiter sobre un archivo SQLite.
+
+Sustituto local de Redis: todos los workers de gunicorn del mismo host ven los mismos
+contadores. Cada hit es UN solo statement (UPSERT ... RETURNING), sin lecturas previas.
+
+    RATELIMIT_STORAGE_URI=sqlite:////var/tmp/portfolio-ratelimit.db
+
+Solo implementa la estrategia fixed-window (la que usa la app). Importar este módulo
+registra el esquema `sqlite://` en `limits`.
+"""
+import random
+import sqlite3
+import threading
+import time
+
+from limits.storage import Storage
+
+_INCR = """
+INSERT INTO ratelimit (key, count, expires_at) VALUES (:key, :amount, :expires_at)
+ON CONFLICT(key) DO UPDATE SET
+    count = CASE WHEN ratelimit.expires_at <= :now THEN excluded.count
+                 ELSE ratelimit.count + excluded.count END,
+    expires_at = CASE WHEN ratelimit.expires_at <= :now THEN excluded.expires_at
+                      ELSE ratelimit.expires_at END
+RETURNING count
+"""
+
+
+class SQLiteStorage(Storage):
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri[len("sqlite:///"):] or ":memory:"
+        self.timeout = float(options.get("timeout", 5))
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS ratelimit ("
+            "key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        conn = self._conn()
+        count = conn.execute(
+            _INCR, {"key": key, "amount": amount, "expires_at": now + expiry, "now": now}
+        ).fetchone()[0]
+        # Limpieza perezosa de ventanas vencidas (≈1 de cada 500 hits)
+        if random.random() < 0.002:
+            conn.execute("DELETE FROM ratelimit WHERE expires_at <= ?", (now,))
+        return count
+
+    def get(self, key: str) -> int:
+        row = self._conn().execute(
+            "SELECT count FROM ratelimit WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._conn().execute(
+            "SELECT expires_at FROM ratelimit WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._conn().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        return self._conn().execute("DELETE FROM ratelimit").rowcount
+
+    def clear(self, key: str) -> None:
+        self._conn().execute("DELETE FROM ratelimit WHERE key = ?", (key,))
@@ -1,12 +1,21 @@
 # routes_admin.py
+import logging
 import os
 from flask import render_template, redirect, url_for, request, abort, flash, current_app, make_response
 from flask_login import login_user, current_user, login_required, logout_user
 from functools import wraps
-from models import db, User, Project, ContactMessage
+from models import db, User, Project, ContactMessage, PasswordBusy, dummy_password_check
 from forms import AdminLoginForm, ProjectForm
+from page_cache import page_cache, LISTS_TAG, project_tag
 # 1. IMPORTACIÓN NUEVA PARA MANEJAR EL ERROR
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import update, delete
+from sqlalchemy.orm import selectinload
+from pagination import paginate
+import jobs
+import media
+
+logger = logging.getLogger(__name__)
 
 def admin_only(f):
     # NOTE: Guard decorator to ensure admin-only access
@@ -17,7 +26,7 @@ def admin_only(f):
         return f(*args, **kwargs)
     return wrapper
 
-def register(app):
+def register(app, limiter=None):
     # Leemos la variable de entorno, con default seguro
     raw_login_path = os.getenv("ADMIN_LOGIN_PATH", "/admin/login") or "/admin/login"
 
@@ -28,28 +37,63 @@ def register(app):
         login_path = "/admin/login"
 
     # --- CONFIGURACIÓN SEGURA DEL RATE LIMITER ---
-    limiter = app.extensions.get("limiter")
+    # app.extensions["limiter"] es un set de instancias: create_app nos pasa la suya
 
     # Helper robusto: verifica que limiter exista Y que tenga el método .limit()
-    def limit_rate(limit_string):
+    def limit_rate(limit_string, **kwargs):
         if limiter and hasattr(limiter, "limit"):
-            return limiter.limit(limit_string)
+            return limiter.limit(limit_string, **kwargs)
         # Si limiter es None o es un 'set' (error común), no aplicamos límite pero NO rompemos la app
         return lambda f: f
 
+    # Mismo orden que el archivo público; index ix_projects_created_at_id
+    archive_order = [(Project.created_at, "desc"), (Project.id, "desc")]
+
+    def attach_cover(form, p) -> bool:
+        """Guardar la portada subida (si hay) y encolar sus derivados. False = error en el form."""
+        if form.remove_cover.data:
+            p.cover_hash = ""
+        upload = form.cover_upload.data
+        if upload and getattr(upload, "filename", ""):
+            try:
+                digest = media.store_upload(upload)
+            except media.MediaError as exc:
+                form.cover_upload.errors.append(str(exc))
+                return False
+            if digest != p.cover_hash:
+                p.cover_hash = digest
+                jobs.enqueue("cover_variants", {"digest": digest})
+        return True
+
     # --- RUTAS ---
 
+    # Solo los intentos (POST) consumen cupo: cada uno cuesta un hash (ver models.py, CONTRASEÑAS)
     @app.route(login_path, methods=["GET", "POST"])
-    @limit_rate("5 per 10 minutes") 
+    @limit_rate(lambda: current_app.config["ADMIN_LOGIN_RATE_LIMIT"], methods=["POST"])
     def admin_login():
         form = AdminLoginForm()
         if form.validate_on_submit():
             user = db.session.execute(db.select(User).where(User.email == form.email.data)).scalar()
-            
-            if not user or not user.check_password(form.password.data) or not user.is_admin:
+
+            try:
+                # Email inexistente: verificación en falso con el mismo costo
+                valid = user.check_password(form.password.data) if user else dummy_password_check(form.password.data)
+            except PasswordBusy:
+                logger.warning("Password check slots busy", extra={"event": "auth.busy"})
+                flash("Too many login attempts right now. Try again in a moment.", "danger")
+                response = make_response(render_template("admin/login.html", form=form), 503)
+                response.headers["Retry-After"] = "5"
+                return response
+
+            if not valid or not user.is_admin:
                 flash("Invalid credentials.", "danger")
                 return redirect(login_path)
-            
+
+            # check_password re-generó un hash de una política vieja
+            if db.session.is_modified(user):
+                db.session.commit()
+                logger.info("Password hash upgraded", extra={"event": "auth.rehash", "user_id": user.id})
+
             login_user(user)
             return redirect(url_for("admin_dashboard"))
             
@@ -72,8 +116,9 @@ def register(app):
     @app.get("/admin")
     @admin_only
     def admin_dashboard():
-        projects = Project.query.order_by(Project.created_at.desc()).all()
-        return render_template("admin/dashboard.html", projects=projects)
+        page = paginate(db.select(Project), archive_order, request.args.get("after"),
+                        current_app.config.get("ADMIN_PAGE_SIZE", 50))
+        return render_template("admin/dashboard.html", projects=page.items, page=page)
 
     @app.route("/admin/projects/new", methods=["GET", "POST"])
     @admin_only
@@ -82,11 +127,15 @@ def register(app):
         if form.validate_on_submit():
             p = Project()
             form.populate_obj(p)
+            if not attach_cover(form, p):
+                return render_template("admin/project_form.html", form=form, project=None)
             db.session.add(p)
             
             # 2. BLOQUE DE SEGURIDAD (TRY/EXCEPT)
             try:
                 db.session.commit()
+                jobs.notify()
+                page_cache.invalidate(LISTS_TAG, project_tag(p.slug))
                 flash("Project created.", "success")
                 return redirect(url_for("admin_dashboard"))
             except IntegrityError:
@@ -101,11 +150,17 @@ def register(app):
         p = db.session.get(Project, pid) or abort(404)
         form = ProjectForm(obj=p)
         if form.validate_on_submit():
+            old_slug = p.slug
             form.populate_obj(p)
+            if not attach_cover(form, p):
+                db.session.rollback()
+                return render_template("admin/project_form.html", form=form, project=p)
             
             # 3. BLOQUE DE SEGURIDAD TAMBIÉN AQUÍ
             try:
                 db.session.commit()
+                jobs.notify()
+                page_cache.invalidate(LISTS_TAG, project_tag(old_slug), project_tag(p.slug))
                 flash("Project updated.", "success")
                 return redirect(url_for("admin_dashboard"))
             except IntegrityError:
@@ -118,32 +173,87 @@ def register(app):
     @admin_only
     def admin_project_delete(pid: int):
         p = db.session.get(Project, pid) or abort(404)
+        slug = p.slug
         db.session.delete(p)
         db.session.commit()
+        page_cache.invalidate(LISTS_TAG, project_tag(slug))
         flash("Project deleted.", "info")
         return redirect(url_for("admin_dashboard"))
     
+    # --- BANDEJA DE MENSAJES (keyset) ---
+    # Orden: no procesados primero, luego más recientes; id desempata
+    inbox_order = [
+        (ContactMessage.processed, "asc"),
+        (ContactMessage.created_at, "desc"),
+        (ContactMessage.id, "desc"),
+    ]
+    inbox_filters = {
+        "all": None,
+        "new": ContactMessage.processed.is_(False),
+        "processed": ContactMessage.processed.is_(True),
+    }
+
+    def back_to_inbox():
+        # Volver a la misma vista (filtro + página) desde la que se envió el formulario
+        status = request.form.get("status") if request.form.get("status") in inbox_filters else None
+        return redirect(url_for("admin_messages", status=status, after=request.form.get("after") or None))
+
     @app.get("/admin/messages")
     @admin_only
     def admin_messages():
-        messages = ContactMessage.query.order_by(ContactMessage.processed.asc(),
-                                                 ContactMessage.created_at.desc()).all()
-        return render_template("admin/messages.html", messages=messages)
+        status = request.args.get("status", "all")
+        if status not in inbox_filters:
+            status = "all"
+        stmt = db.select(ContactMessage).options(selectinload(ContactMessage.email_job))
+        if inbox_filters[status] is not None:
+            stmt = stmt.where(inbox_filters[status])
+        page = paginate(stmt, inbox_order, request.args.get("after"),
+                        current_app.config.get("ADMIN_PAGE_SIZE", 50))
+        return render_template("admin/messages.html", messages=page.items, page=page, status=status)
 
     @app.post("/admin/messages/<int:mid>/toggle")
     @admin_only
     def admin_message_toggle(mid: int):
-        msg = db.session.get(ContactMessage, mid) or abort(404)
-        msg.processed = not msg.processed
+        # Un solo UPDATE (sin SELECT previo)
+        result = db.session.execute(
+            update(ContactMessage).where(ContactMessage.id == mid)
+            .values(processed=~ContactMessage.processed)
+        )
+        if result.rowcount == 0:
+            db.session.rollback()
+            abort(404)
         db.session.commit()
         flash("Message processed updated.", "info")
-        return redirect(url_for("admin_messages"))
+        return back_to_inbox()
 
     @app.post("/admin/messages/<int:mid>/delete")
     @admin_only
     def admin_message_delete(mid: int):
-        msg = db.session.get(ContactMessage, mid) or abort(404)
-        db.session.delete(msg)
+        result = db.session.execute(delete(ContactMessage).where(ContactMessage.id == mid))
+        if result.rowcount == 0:
+            db.session.rollback()
+            abort(404)
         db.session.commit()
         flash("Message deleted.", "info")
-        return redirect(url_for("admin_messages"))
\ No newline at end of file
+        return back_to_inbox()
+
+    @app.post("/admin/messages/bulk")
+    @admin_only
+    def admin_messages_bulk():
+        action = request.form.get("action")
+        ids = [int(i) for i in request.form.getlist("ids") if i.isdigit()]
+        if not ids or action not in ("processed", "unprocessed", "delete"):
+            flash("Select at least one message and an action.", "danger")
+            return back_to_inbox()
+
+        # Una sola sentencia set-based para todo el lote
+        target = ContactMessage.id.in_(ids)
+        if action == "delete":
+            result = db.session.execute(delete(ContactMessage).where(target))
+        else:
+            result = db.session.execute(
+                update(ContactMessage).where(target).values(processed=(action == "processed"))
+            )
+        db.session.commit()
+        flash(f"{result.rowcount} messages updated.", "info")
+        return back_to_inbox()
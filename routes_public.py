@@ -1,67 +1,109 @@
-import threading
 import logging
 from datetime import datetime, timedelta
-from flask import render_template, request, abort, redirect, url_for, session, flash, current_app
-from models import db, Project, ContactMessage
+from flask import render_template, request, abort, redirect, url_for, session, flash, current_app, make_response, jsonify
+from models import (db, Project, ProjectTech, ContactMessage, normalize_tech, message_hash, use_replica,
+                    content_version, PROJECTS_VERSION)
 from forms import ContactForm
-from flask_mail import Message
+import search
+import i18n
+from page_cache import page_cache, LISTS_TAG, project_tag
+from http_cache import conditional
+from sqlalchemy import func
+from pagination import paginate
+import jobs
 from urllib.parse import urlparse
 
-# Configuración de Logger para ver errores en la terminal
-logging.basicConfig(level=logging.INFO)
+# Handlers/formato: logging_setup.init_app (JSON, cola asíncrona)
 logger = logging.getLogger(__name__)
 
-# --- EMAIL ASÍNCRONO (HILO SECUNDARIO) ---
-def send_async_email(app, msg):
-    """
-    Envía el correo en background. 
-    Se ejecuta en un hilo separado para que el usuario no espere.
-    """
-    with app.app_context():
-        try:
-            mail = app.extensions.get("mail")
-            if mail:
-                mail.send(msg)
-                logger.info(f"✅ [EMAIL] Enviado exitosamente a: {msg.recipients}")
-            else:
-                logger.warning("⚠️ [EMAIL] Extension Flask-Mail no encontrada.")
-        except Exception as e:
-            logger.error(f"❌ [EMAIL] Error crítico enviando correo: {e}")
+# --- VERSIÓN DE CONTENIDO (ETag / Last-Modified) ---
+def _catalog_version(**_):
+    # Listados: lectura por PK de la fila que sube cada alta/edición/baja (models.ContentVersion)
+    current = content_version(PROJECTS_VERSION)
+    if current is not None:
+        changed_at, version = current
+        return changed_at, (version,)
+    # Base sin escrituras por el ORM (create_all + carga directa): agregado sobre la tabla
+    last, count = db.session.execute(
+        db.select(func.max(Project.updated_at), func.count(Project.id))
+    ).one()
+    return last, (count,)
+
+def _static_version(**_):
+    return None, ()
+
+def _project_version(slug):
+    last = db.session.execute(db.select(Project.updated_at).filter_by(slug=slug)).scalar()
+    return (last, ()) if last else None
 
 def register(app, limiter=None):
-    
-    # --- HELPER DE TRADUCCIÓN ---
-    @app.context_processor
-    def utility_processor():
-        def get_loc_attr(obj, attr_name):
-            lang = session.get('lang', 'en')
-            if lang == 'es':
-                val = getattr(obj, f"{attr_name}_es", None)
-                if val: return val
-            return getattr(obj, attr_name)
-        return dict(get_loc_attr=get_loc_attr)
 
+    # Mismo patrón que routes_admin: sin limiter la app sigue funcionando
+    def limit_rate(limit_string, **kwargs):
+        if limiter and hasattr(limiter, "limit"):
+            return limiter.limit(limit_string, **kwargs)
+        return lambda f: f
+    
     # --- RUTAS PÚBLICAS ---
 
     @app.get("/")
+    @use_replica
+    @conditional(_catalog_version)
+    @page_cache.cached(tags=[LISTS_TAG])
     def index():
         featured = Project.query.filter_by(is_featured=True).order_by(Project.created_at.desc()).limit(3).all()
         return render_template("public/home.html", featured=featured)
 
     @app.get("/about")
+    @conditional(_static_version)
+    @page_cache.cached()
     def about():
         return render_template("public/about.html")
 
-    @app.get("/projects")
-    def projects_list():
+    # --- ARCHIVO DE PROYECTOS (cursor) ---
+    archive_order = [(Project.created_at, "desc"), (Project.id, "desc")]
+
+    def archive_page():
         tech = request.args.get("tech", type=str)
-        q = Project.query
+        stmt = db.select(Project)
         if tech:
-            q = q.filter(Project.tech_stack.ilike(f"%{tech}%"))
-        projects = q.order_by(Project.created_at.desc()).all()
-        return render_template("public/projects/list.html", projects=projects, tech=tech)
+            # Búsqueda exacta por índice (project_techs.key): "Java" ya no coincide con "JavaScript"
+            stmt = stmt.join(Project.techs).where(ProjectTech.key == normalize_tech(tech))
+        page = paginate(stmt, archive_order, request.args.get("after"),
+                        current_app.config.get("PROJECTS_PAGE_SIZE", 12))
+        return tech, page
+
+    @app.get("/projects")
+    @use_replica
+    @conditional(_catalog_version)
+    @page_cache.cached(tags=[LISTS_TAG])
+    def projects_list():
+        tech, page = archive_page()
+        return render_template("public/projects/list.html", projects=page.items, page=page, tech=tech)
+
+    # Fragmento JSON para el scroll infinito (mismos parámetros que /projects)
+    @app.get("/projects/_page")
+    @use_replica
+    @conditional(_catalog_version)
+    @page_cache.cached(tags=[LISTS_TAG])
+    def projects_page():
+        tech, page = archive_page()
+        html = render_template("public/projects/_cards.html", projects=page.items)
+        next_url = url_for("projects_page", tech=tech, after=page.next_cursor) if page.has_next else None
+        return jsonify(html=html, next=next_url)
+
+    @app.get("/search")
+    @page_cache.cached(tags=[LISTS_TAG])
+    def project_search():
+        q = request.args.get("q", "", type=str).strip()
+        page = request.args.get("page", 1, type=int)
+        results = search.search_projects(q, page=page, per_page=12)
+        return render_template("public/search.html", q=q, results=results)
 
     @app.get("/projects/<string:slug>")
+    @use_replica
+    @conditional(_project_version)
+    @page_cache.cached(tags=lambda slug: [project_tag(slug)])
     def project_detail(slug: str):
         project = Project.query.filter_by(slug=slug).first()
         if not project:
@@ -69,21 +111,16 @@ def register(app, limiter=None):
         return render_template("public/projects/detail.html", project=project)
 
     # --- RUTA DE CONTACTO (LÓGICA PRINCIPAL) ---
+    # Solo los envíos (POST) consumen cupo; el límite excedido responde 429 + Retry-After
     @app.route("/contact", methods=["GET", "POST"])
+    @limit_rate(lambda: current_app.config["CONTACT_RATE_LIMIT"], methods=["POST"])
     def contact():
-        # Aplicar Rate Limit manualmente si existe el objeto limiter
-        if limiter:
-            try:
-                limiter.check()
-            except Exception:
-                pass # Si falla el check, dejamos pasar (o podrías manejar error 429)
-
         form = ContactForm()
         
         if form.validate_on_submit():
             # 1. TRAMPA ANTI-BOTS (Honeypot)
             if form.bot_catcher.data:
-                logger.warning(f"🤖 [BOT] Detectado en honeypot IP: {request.remote_addr}")
+                logger.warning("Honeypot field filled", extra={"event": "contact.honeypot", "ip": request.remote_addr})
                 flash("Mensaje enviado correctamente.", "success") 
                 return redirect(url_for('contact'))
 
@@ -93,74 +130,90 @@ def register(app, limiter=None):
 
             # 2. ANTI-DUPLICADOS (Ventana de 2 minutos)
             duplicate_window = datetime.utcnow() - timedelta(minutes=2)
-            existing = ContactMessage.query.filter(
-                ContactMessage.email == email,
-                ContactMessage.message == message,
-                ContactMessage.created_at > duplicate_window
+            # El índice (email, content_hash, created_at) deja ~1 fila candidata;
+            # comparar también el texto mantiene la misma precisión que antes.
+            existing = db.session.execute(
+                db.select(ContactMessage.id).where(
+                    ContactMessage.email == email,
+                    ContactMessage.content_hash == message_hash(message),
+                    ContactMessage.created_at > duplicate_window,
+                    ContactMessage.message == message,
+                ).limit(1)
             ).first()
 
             if existing:
-                logger.info(f"ℹ️ [DUPLICADO] Mensaje prevenido de {email}")
+                logger.info("Duplicate contact message suppressed",
+                            extra={"event": "contact.duplicate", "original_id": existing.id})
                 flash("Mensaje enviado correctamente.", "success") 
                 return redirect(url_for('contact'))
 
             # 3. PROCESAR MENSAJE REAL
             try:
-                # A) Guardar en Base de Datos
+                # A) Guardar en Base de Datos (+ trabajo de correo en la MISMA transacción)
                 msg_row = ContactMessage(
                     name=name, 
                     email=email, 
                     message=message
                 )
-                db.session.add(msg_row)
-                db.session.commit()
-                logger.info(f"💾 [DB] Mensaje guardado ID: {msg_row.id}")
-
-                # B) Enviar Correo (Hilo aparte)
                 contact_recipient = current_app.config.get("CONTACT_RECIPIENT")
                 
                 if contact_recipient:
-                    msg = Message(
-                        subject=f"Portfolio: Mensaje de {name}",
-                        recipients=[contact_recipient],
-                        body=f"Nombre: {name}\nEmail: {email}\n\nMENSAJE:\n{message}",
-                        reply_to=email
-                    )
-                    
-                    # INICIAR HILO
-                    # Pasamos `current_app._get_current_object()` para que el hilo tenga acceso a la config
-                    threading.Thread(
-                        target=send_async_email,
-                        args=(current_app._get_current_object(), msg)
-                    ).start()
+                    msg_row.email_job = jobs.enqueue("email", {
+                        "subject": f"Portfolio: Mensaje de {name}",
+                        "recipients": [contact_recipient],
+                        "body": f"Nombre: {name}\nEmail: {email}\n\nMENSAJE:\n{message}",
+                        "reply_to": email,
+                    })
                 else:
-                    logger.warning("⚠️ [CONFIG] CONTACT_RECIPIENT no definido en .env")
+                    logger.warning("CONTACT_RECIPIENT is not set; message stored without email",
+                                   extra={"event": "config.missing", "key": "CONTACT_RECIPIENT"})
+
+                db.session.add(msg_row)
+                db.session.commit()
+                logger.info("Contact message stored", extra={
+                    "event": "contact.saved", "message_id": msg_row.id, "job_id": msg_row.email_job_id})
+
+                # B) Despertar el pool de workers (el envío ocurre fuera del request)
+                if msg_row.email_job_id:
+                    jobs.notify()
                 
                 # C) ÉXITO AL USUARIO
                 flash("Mensaje enviado correctamente. Gracias por contactar.", "success")
                 return redirect(url_for('contact'))
 
-            except Exception as e:
-                logger.error(f"❌ [CRITICAL] Error en ruta contact: {e}")
+            except Exception:
+                logger.exception("Contact submission failed", extra={"event": "contact.error"})
                 db.session.rollback()
                 flash("Error interno del servidor. Intenta mas tarde.", "error")
                 return redirect(url_for('contact'))
 
         # Si hay errores de validación (WTForms)
         if form.errors:
-            logger.info(f"⚠️ [VALIDACIÓN] Fallo en formulario: {form.errors}")
+            # Solo los nombres de campo: los valores pueden traer datos del visitante
+            logger.info("Contact form rejected", extra={"event": "contact.invalid", "fields": sorted(form.errors)})
             flash("Por favor revisa los campos marcados.", "error")
 
         return render_template("public/contact.html", form=form)
     
+    @app.errorhandler(429)
+    def too_many_requests(e):
+        if request.endpoint == "contact":
+            flash("Demasiados mensajes en poco tiempo. Intenta más tarde.", "error")
+            return make_response(render_template("public/contact.html", form=ContactForm()), 429)
+        return make_response("Too Many Requests", 429)
+
     # --- CAMBIO DE IDIOMA ---
     @app.route("/switch_lang/<string:code>")
     def switch_lang(code):
-        if code in ("en", "es"):
+        if code in i18n.LANGUAGES:
             session["lang"] = code
         
         # Redirección segura
         target = request.referrer
         if not target or urlparse(target).netloc != urlparse(request.host_url).netloc:
             target = url_for('index')
-        return redirect(target)
\ No newline at end of file
+        response = redirect(target)
+        if code in i18n.LANGUAGES:
+            # Copia legible por el servidor estático (elige el árbol de static_export)
+            response.set_cookie("lang", code, max_age=365 * 24 * 3600, samesite="Lax")
+        return response
\ No newline at end of file
@@ -0,0 +1,168 @@
+# search.py
+"""
+Búsqueda full-text sobre Project (title, summary, description, tech_stack).
+
+- SQLite:   tabla virtual FTS5 `projects_fts` (external content) + triggers.
+- Postgres: columna generada `search_vector` (tsvector con pesos) + índice GIN.
+
+El índice vive en la base de datos: los triggers / la columna generada lo mantienen
+sincronizado en cada INSERT/UPDATE/DELETE de `projects` (admin, CLI o migraciones).
+"""
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import DDL, event, text
+
+from models import db, Project
+
+MAX_PER_PAGE = 50
+
+# --- DDL SQLite (FTS5) ---
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        title, summary, description, tech_stack,
+        content='projects', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, title, summary, description, tech_stack)
+        VALUES (new.id, new.title, new.summary, new.description, new.tech_stack);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, summary, description, tech_stack)
+        VALUES ('delete', old.id, old.title, old.summary, old.description, old.tech_stack);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, summary, description, tech_stack)
+        VALUES ('delete', old.id, old.title, old.summary, old.description, old.tech_stack);
+        INSERT INTO projects_fts(rowid, title, summary, description, tech_stack)
+        VALUES (new.id, new.title, new.summary, new.description, new.tech_stack);
+    END""",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS projects_fts_au",
+    "DROP TRIGGER IF EXISTS projects_fts_ad",
+    "DROP TRIGGER IF EXISTS projects_fts_ai",
+    "DROP TABLE IF EXISTS projects_fts",
+]
+
+# --- DDL Postgres (tsvector generado + GIN) ---
+# Diccionario 'simple': el contenido mezcla inglés y español, no aplicamos stemming.
+POSTGRES_DDL = [
+    """ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(tech_stack, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(summary, '')), 'C') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'D')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING GIN (search_vector)",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS ix_projects_search_vector",
+    "ALTER TABLE projects DROP COLUMN IF EXISTS search_vector",
+]
+
+# db.create_all() (tests, instalaciones nuevas) también crea el índice
+for _stmt in SQLITE_DDL:
+    event.listen(Project.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in POSTGRES_DDL:
+    event.listen(Project.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+
+
+@dataclass
+class SearchPage:
+    items: list
+    total: int
+    page: int
+    per_page: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.per_page))
+
+    @property
+    def has_next(self) -> bool:
+        return self.page < self.pages
+
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 1
+
+
+def _terms(query: str) -> list[str]:
+    # Solo palabras: nada de operadores FTS/tsquery que vengan del usuario
+    return re.findall(r"\w+", query or "", flags=re.UNICODE)[:8]
+
+
+def _sqlite_search(terms, limit, offset):
+    match = " ".join(f'"{term}"*' for term in terms)  # AND implícito + prefijo
+    total = db.session.execute(
+        text("SELECT count(*) FROM projects_fts WHERE projects_fts MATCH :q"), {"q": match}
+    ).scalar()
+    # Pesos bm25 por columna: title, summary, description, tech_stack
+    ids = db.session.execute(
+        text("SELECT rowid FROM projects_fts WHERE projects_fts MATCH :q "
+             "ORDER BY bm25(projects_fts, 10.0, 4.0, 1.0, 6.0) LIMIT :limit OFFSET :offset"),
+        {"q": match, "limit": limit, "offset": offset},
+    ).scalars().all()
+    return total, ids
+
+
+def _postgres_search(terms, limit, offset):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    total = db.session.execute(
+        text("SELECT count(*) FROM projects WHERE search_vector @@ to_tsquery('simple', :q)"),
+        {"q": tsquery},
+    ).scalar()
+    ids = db.session.execute(
+        text("SELECT id FROM projects WHERE search_vector @@ to_tsquery('simple', :q) "
+             "ORDER BY ts_rank_cd(search_vector, to_tsquery('simple', :q)) DESC, id DESC "
+             "LIMIT :limit OFFSET :offset"),
+        {"q": tsquery, "limit": limit, "offset": offset},
+    ).scalars().all()
+    return total, ids
+
+
+BACKENDS = {
+    "sqlite": _sqlite_search,
+    "postgresql": _postgres_search,
+}
+
+
+def search_projects(query: str, page: int = 1, per_page: int = 10) -> SearchPage:
+    """Proyectos ordenados por relevancia para `query`, paginados."""
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+    terms = _terms(query)
+    if not terms:
+        return SearchPage(items=[], total=0, page=page, per_page=per_page)
+
+    backend = BACKENDS.get(db.engine.dialect.name)
+    if backend is None:
+        raise RuntimeError(f"Full-text search not supported on {db.engine.dialect.name}")
+
+    total, ids = backend(terms, per_page, (page - 1) * per_page)
+    by_id = {p.id: p for p in db.session.execute(db.select(Project).where(Project.id.in_(ids))).scalars()}
+    items = [by_id[i] for i in ids if i in by_id]
+    return SearchPage(items=items, total=total, page=page, per_page=per_page)
+
+
+def create_index(bind) -> None:
+    """Crear (idempotente) el índice full-text para el dialecto de `bind`."""
+    statements = SQLITE_DDL if bind.dialect.name == "sqlite" else POSTGRES_DDL
+    for stmt in statements:
+        bind.execute(text(stmt))
+
+
+def drop_index(bind) -> None:
+    statements = SQLITE_DROP if bind.dialect.name == "sqlite" else POSTGRES_DROP
+    for stmt in statements:
+        bind.execute(text(stmt))
+
+
+def rebuild_index() -> None:
+    """Reconstruir el índice desde `projects` (solo necesario en SQLite: Postgres usa una columna generada)."""
+    if db.engine.dialect.name == "sqlite":
+        db.session.execute(text("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"))
+        db.session.commit()
@@ -0,0 +1,237 @@
+# session_store.py
+"""
+Sesiones del lado del servidor (opcional): la cookie solo lleva un id opaco.
+
+Con la cookie firmada de Flask, lang + flashes + estado de Flask-Login + token CSRF
+viajan (y se re-firman) en cada request, incluidos los de estáticos del mismo dominio.
+Con SESSION_STORE_URL la cookie queda en ~43 caracteres y los datos van al store:
+
+    SESSION_STORE_URL=                            cookie firmada de Flask (por defecto)
+    SESSION_STORE_URL=sqlite:////var/tmp/sessions.db   compartido entre workers del host
+    SESSION_STORE_URL=redis://localhost:6379/1    compartido entre hosts (paquete `redis`)
+    SESSION_STORE_URL=memory://                   por proceso (desarrollo / tests)
+
+- Solo se escribe en el store si la sesión cambió (o le queda menos de la mitad
+  del TTL); la cookie solo se envía al crear el id. Un /switch_lang actualiza una
+  fila, sin Set-Cookie.
+- TTL = PERMANENT_SESSION_LIFETIME, deslizante. Las vencidas se borran al azar en
+  ~SESSION_SWEEP_PROBABILITY de las escrituras y con `flask sessions-sweep` (cron).
+  Redis las vence solo.
+- Un id que no está en el store nunca se adopta (fijación de sesión) y el id se
+  rota cuando cambia el usuario logueado (login / logout).
+- Serialización: el mismo JSON etiquetado que la cookie de Flask (sin pickle).
+"""
+import random
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from flask.sessions import SecureCookieSession, SessionInterface, session_json_serializer
+
+_SID = re.compile(r"^[A-Za-z0-9_-]{43}$")  # secrets.token_urlsafe(32)
+
+
+# --- STORES: get(sid) -> (bytes, expires_at) | None, set, delete, sweep ---
+
+class MemorySessionStore:
+    def __init__(self):
+        self._data = {}  # sid -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, sid):
+        with self._lock:
+            item = self._data.get(sid)
+        if item is None or item[0] <= time.time():
+            return None
+        return item[1], item[0]
+
+    def set(self, sid, value, ttl):
+        with self._lock:
+            self._data[sid] = (time.time() + ttl, value)
+
+    def delete(self, sid):
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def sweep(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (expires_at, _) in self._data.items() if expires_at <= now]
+            for sid in expired:
+                del self._data[sid]
+        return len(expired)
+
+
+class SQLiteSessionStore:
+    """Tabla `sessions` en un archivo SQLite propio (sustituto local de Redis)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                sid TEXT PRIMARY KEY, data BLOB NOT NULL, expires_at REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS ix_sessions_expires ON sessions (expires_at);
+        """)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, sid):
+        row = self._conn().execute(
+            "SELECT data, expires_at FROM sessions WHERE sid = ? AND expires_at > ?", (sid, time.time())
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, sid, value, ttl):
+        self._conn().execute("INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)",
+                             (sid, value, time.time() + ttl))
+
+    def delete(self, sid):
+        self._conn().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def sweep(self) -> int:
+        return self._conn().execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+class RedisSessionStore:
+    def __init__(self, url, prefix="session:"):
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - dependencia opcional
+            raise RuntimeError("SESSION_STORE_URL=redis:// requires the 'redis' package") from exc
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, sid):
+        pipe = self.client.pipeline()
+        pipe.get(self.prefix + sid)
+        pipe.pttl(self.prefix + sid)
+        value, pttl = pipe.execute()
+        if value is None or pttl < 0:
+            return None
+        return value, time.time() + pttl / 1000
+
+    def set(self, sid, value, ttl):
+        self.client.set(self.prefix + sid, value, ex=max(1, int(ttl)))
+
+    def delete(self, sid):
+        self.client.delete(self.prefix + sid)
+
+    def sweep(self) -> int:
+        return 0  # Redis vence las claves solo
+
+
+def store_from_url(url: str):
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemorySessionStore()
+    if parsed.scheme == "sqlite":
+        return SQLiteSessionStore(url[len("sqlite:///"):])
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisSessionStore(url)
+    raise ValueError(f"Unsupported SESSION_STORE_URL: {url}")
+
+
+# --- INTERFAZ DE SESIÓN ---
+
+class ServerSession(SecureCookieSession):
+    """Dict de sesión (con el seguimiento accessed/modified de Flask) + id en el store."""
+
+    def __init__(self, initial=None, sid=None, stale=False):
+        super().__init__(initial)
+        self.sid = sid
+        self.stale = stale  # menos de la mitad del TTL: re-escribir aunque no cambie
+        self.initial_user = dict.get(self, "_user_id")
+
+
+class ServerSideSessionInterface(SessionInterface):
+    serializer = session_json_serializer
+
+    def __init__(self, store, sweep_probability=0.01):
+        self.store = store
+        self.sweep_probability = sweep_probability
+
+    @staticmethod
+    def _ttl(app) -> int:
+        return int(app.permanent_session_lifetime.total_seconds())
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and _SID.match(sid):
+            item = self.store.get(sid)
+            if item is not None:
+                raw, expires_at = item
+                try:
+                    data = self.serializer.loads(raw.decode() if isinstance(raw, bytes) else raw)
+                except ValueError:
+                    data = None
+                if isinstance(data, dict):
+                    return ServerSession(data, sid=sid, stale=expires_at - time.time() < self._ttl(app) / 2)
+        # Sin cookie, id desconocido o vencido: sesión nueva (el id lo elige el servidor al guardar)
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session:
+            # Vaciada en este request (p. ej. logout + clear): borrar fila y cookie
+            if session.sid is not None and session.modified:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                       samesite=samesite, httponly=httponly)
+            return
+
+        # Login / logout: id nuevo para que uno previo (conocido por un tercero) no sirva
+        if session.sid is not None and dict.get(session, "_user_id") != session.initial_user:
+            self.store.delete(session.sid)
+            session.sid = None
+
+        new = session.sid is None
+        if new:
+            session.sid = secrets.token_urlsafe(32)
+        if new or session.modified or session.stale:
+            self.store.set(session.sid, self.serializer.dumps(dict(session)).encode(), self._ttl(app))
+            if random.random() < self.sweep_probability:
+                self.store.sweep()
+
+        # La cookie no cambia con los datos: solo al crear el id (o para extender una permanente)
+        if new or (session.permanent and (session.modified or session.stale)):
+            response.set_cookie(name, session.sid, expires=self.get_expiration_time(app, session),
+                                httponly=httponly, domain=domain, path=path, secure=secure, samesite=samesite)
+
+
+def init_app(app):
+    app.config.setdefault("SESSION_STORE_URL", "")  # vacío = cookie firmada de Flask
+    app.config.setdefault("SESSION_SWEEP_PROBABILITY", 0.01)
+    url = app.config["SESSION_STORE_URL"]
+    if url:
+        store = store_from_url(url)
+        app.extensions["session_store"] = store
+        app.session_interface = ServerSideSessionInterface(store, app.config["SESSION_SWEEP_PROBABILITY"])
+
+    @app.cli.command("sessions-sweep")
+    def sessions_sweep():
+        """Delete expired server-side sessions (for cron; requests also sweep lazily)."""
+        store = app.extensions.get("session_store")
+        if store is None:
+            print("SESSION_STORE_URL is not set: sessions live in signed cookies.")
+            return
+        print(f"Expired sessions deleted: {store.sweep()}")
@@ -1,16 +1,27 @@
 export class AssetLoader {
     constructor() {
+        // Nombres lógicos (como en url_for('static')); la URL real sale de #asset-images
         this.assetPaths = {
             pyramids: [
-                '/static/img/maya-pyramid.png',
-                '/static/img/maya-pyramid2.png'
+                'img/maya-pyramid.png',
+                'img/maya-pyramid2.png'
             ],
             huts: [
-                '/static/img/mayan_house.png',
-                '/static/img/mayan_house2.png'
+                'img/mayan_house.png',
+                'img/mayan_house2.png'
             ],
-            monument: '/static/img/salvador_del_mundo.png'
+            monument: 'img/salvador_del_mundo.png'
         };
+
+        // Tamaño aproximado al que se dibujan en el canvas (el navegador aplica el DPR)
+        this.sizes = {
+            pyramids: '(max-width: 768px) 110px, 60px',
+            huts: '(max-width: 768px) 110px, 60px',
+            monument: '120px'
+        };
+
+        const mapEl = document.getElementById('asset-images');
+        this.sources = mapEl ? JSON.parse(mapEl.textContent) : {};
     }
 
     async loadAll() {
@@ -23,21 +34,21 @@ export class AssetLoader {
         const promises = [];
 
         // Cargar Pirámides
-        this.assetPaths.pyramids.forEach(src => 
-            promises.push(this.loadImage(src)
+        this.assetPaths.pyramids.forEach(src =>
+            promises.push(this.loadImage(src, this.sizes.pyramids)
                 .then(img => loadedImages.pyramids.push(img))
                 .catch(e => console.warn("Falta:", src)))
         );
 
         // Cargar Chozas
-        this.assetPaths.huts.forEach(src => 
-            promises.push(this.loadImage(src)
+        this.assetPaths.huts.forEach(src =>
+            promises.push(this.loadImage(src, this.sizes.huts)
                 .then(img => loadedImages.huts.push(img))
                 .catch(e => console.warn("Falta:", src)))
         );
 
         // Cargar Monumento
-        promises.push(this.loadImage(this.assetPaths.monument)
+        promises.push(this.loadImage(this.assetPaths.monument, this.sizes.monument)
             .then(img => loadedImages.monument = img)
             .catch(e => console.warn("Falta monumento"))
         );
@@ -46,12 +57,28 @@ export class AssetLoader {
         return loadedImages;
     }
 
-    loadImage(src) {
+    loadImage(name, sizes) {
         return new Promise((resolve, reject) => {
+            const entry = this.sources[name] || { src: '/static/' + name };
             const img = new Image();
             img.onload = () => resolve(img);
-            img.onerror = () => reject(src);
-            img.src = src;
+            img.onerror = () => reject(name);
+
+            // <picture> fuera del DOM: el navegador elige AVIF/WebP y el ancho adecuado
+            const picture = document.createElement('picture');
+            (entry.sources || []).forEach(({ type, srcset }) => {
+                const source = document.createElement('source');
+                source.type = type;
+                source.srcset = srcset;
+                source.sizes = sizes;
+                picture.appendChild(source);
+            });
+            picture.appendChild(img);
+            if (entry.srcset) {
+                img.sizes = sizes;
+                img.srcset = entry.srcset;
+            }
+            img.src = entry.src;
         });
     }
-}
\ No newline at end of file
+}
@@ -0,0 +1,164 @@
+# static_export.py
+"""
+Pre-render de las páginas públicas a HTML estático: `flask export-static [DIR]`.
+
+Árbol por idioma (la cookie `lang` de /switch_lang elige cuál servir):
+
+    DIR/en/index.html                  /
+    DIR/en/about/index.html            /about
+    DIR/en/projects/index.html         /projects   (primera página, sin filtros)
+    DIR/en/projects/<slug>/index.html  /projects/<slug>
+    DIR/es/...
+    DIR/manifest.json                  ruta -> ETag con que se generó
+
+Incremental: la versión de cada página es el mismo ETag que calcula http_cache
+(plantillas + idioma + updated_at de los proyectos que muestra), obtenido con una
+consulta barata y sin renderizar. Solo se re-renderiza lo que cambió; las páginas
+de proyectos borrados se eliminan. Cada archivo se escribe con rename atómico
+(+ copia .gz para gzip_static). Un slug que no sea un solo segmento de ruta
+(p. ej. "..", "a/b", anterior a la validación de ProjectForm) se omite: nunca se
+escribe ni se borra nada fuera de DIR/<idioma>/.
+
+Flask queda solo para lo dinámico: /contact, /admin, /switch_lang, /search,
+/media y cualquier URL con query string (?tech=, ?after=). Ejemplo nginx:
+
+    map $cookie_lang $site_lang { default en; es es; }
+    map $args $static_root { "" /srv/site/$site_lang; default /nonexistent; }
+
+    location /static/ { alias /app/static/; }
+    location / {
+        root $static_root;
+        gzip_static on;
+        try_files $uri $uri/index.html @flask;
+    }
+    location @flask { proxy_pass http://127.0.0.1:8000; }
+"""
+import gzip
+import json
+import logging
+import os
+import tempfile
+
+from http_cache import etag_for
+from i18n import LANGUAGES
+from models import db, Project
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+MIN_COMPRESS_SIZE = 512
+
+# (endpoint, archivo relativo al árbol del idioma); los detalles se agregan por slug
+STATIC_PAGES = (
+    ("index", "index.html"),
+    ("about", "about/index.html"),
+    ("projects_list", "projects/index.html"),
+)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _remove(path: str) -> None:
+    for candidate in (path, path + ".gz"):
+        if os.path.exists(candidate):
+            os.remove(candidate)
+    # Carpeta del slug vacía (projects/<slug>/)
+    folder = os.path.dirname(path)
+    if os.path.isdir(folder) and not os.listdir(folder):
+        os.rmdir(folder)
+
+
+def _safe_segment(slug: str) -> bool:
+    return bool(slug) and slug not in (".", "..") and "/" not in slug and "\\" not in slug
+
+
+def _inside(root: str, path: str) -> bool:
+    root = os.path.realpath(root)
+    return os.path.commonpath([root, os.path.realpath(path)]) == root
+
+
+def pages(app) -> list[tuple[str, dict, str]]:
+    """(endpoint, kwargs, archivo) de todas las páginas exportables, sin idioma."""
+    result = [(endpoint, {}, path) for endpoint, path in STATIC_PAGES]
+    with app.app_context():
+        slugs = db.session.execute(db.select(Project.slug).order_by(Project.slug)).scalars().all()
+    for slug in slugs:
+        if not _safe_segment(slug):
+            logger.warning("Slug skipped by static export", extra={"event": "export.unsafe_slug", "slug": slug})
+            continue
+        result.append(("project_detail", {"slug": slug}, f"projects/{slug}/index.html"))
+    return result
+
+
+def _version(app, endpoint, kwargs, lang):
+    """ETag que daría Flask a esta página, sin renderizarla (None si no existe)."""
+    current = app.view_functions[endpoint].content_version(**kwargs)
+    if current is None:
+        return None
+    version_at, parts = current
+    return etag_for(endpoint, "", lang, version_at, parts)
+
+
+def export_site(app, out_dir: str, langs=None, force: bool = False) -> dict:
+    """Escribe/actualiza el sitio en out_dir; devuelve contadores rendered/unchanged/removed/skipped."""
+    langs = sorted(langs or LANGUAGES)
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    try:
+        with open(manifest_path, encoding="utf-8") as fh:
+            previous = json.load(fh)["pages"]
+    except (OSError, ValueError, KeyError):
+        previous = {}
+
+    all_pages = pages(app)
+    client = app.test_client()
+    current, stats = {}, {"rendered": 0, "unchanged": 0, "removed": 0, "skipped": 0}
+    for lang in langs:
+        with client.session_transaction() as sess:
+            sess["lang"] = lang
+        for endpoint, kwargs, rel in all_pages:
+            key = f"{lang}/{rel}"
+            target = os.path.join(out_dir, lang, *rel.split("/"))
+            # Symlinks dentro de DIR incluidos: nada se escribe fuera del árbol del idioma
+            if not _inside(os.path.join(out_dir, lang), target):
+                stats["skipped"] += 1
+                continue
+            with app.test_request_context():
+                etag = _version(app, endpoint, kwargs, lang)
+                url = app.url_for(endpoint, **kwargs)
+            if etag is None:
+                continue
+            if not force and previous.get(key) == etag and os.path.exists(target):
+                current[key] = etag
+                stats["unchanged"] += 1
+                continue
+
+            resp = client.get(url)
+            if resp.status_code != 200:
+                raise RuntimeError(f"{url} ({lang}) returned {resp.status_code}")
+            body = resp.get_data()
+            _atomic_write(target, body)
+            if len(body) >= MIN_COMPRESS_SIZE:
+                _atomic_write(target + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+            elif os.path.exists(target + ".gz"):
+                os.remove(target + ".gz")
+            # El ETag servido debe coincidir con el calculado (misma versión de datos)
+            current[key] = resp.headers.get("ETag", "").strip('"') or etag
+            stats["rendered"] += 1
+
+    # Páginas que ya no existen (proyectos borrados, idiomas retirados)
+    for key in set(previous) - set(current):
+        path = os.path.join(out_dir, *key.split("/"))
+        if ".." in key.split("/") or not _inside(out_dir, path):  # manifest editado a mano
+            continue
+        _remove(path)
+        stats["removed"] += 1
+
+    _atomic_write(manifest_path, json.dumps({"pages": current}, indent=2, sort_keys=True).encode())
+    return stats
+
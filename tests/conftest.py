@@ -71,3 +71,55 @@ def login_as_admin_session(client):
     def _login(username="admin", password="admin123"):
         return client.post("/admin/login", data={"username": username, "password": password}, follow_redirects=True)
     return _login
+
+# --- App aislada por test (DB SQLite temporal, esquema desde los modelos) ---
+@pytest.fixture()
+def isolated_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_URI", f"sqlite:///{tmp_path / 'isolated.db'}")
+    mod = importlib.import_module("app")
+    application = mod.create_app()
+    # Sin hilos de la cola de trabajos: los tests llaman jobs.run_pending() explícitamente
+    application.config.update(TESTING=True, WTF_CSRF_ENABLED=False, JOB_WORKER_THREADS=0)
+
+    from models import db
+    with application.app_context():
+        db.create_all()
+    yield application
+    with application.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture()
+def smtp_stub(isolated_app):
+    """Servidor SMTP local; Flask-Mail de la app aislada apunta a él."""
+    from smtp_stub import SMTPStub
+    with SMTPStub() as server:
+        mail = isolated_app.extensions["mail"]
+        mail.server, mail.port = "127.0.0.1", server.port
+        mail.use_tls = mail.use_ssl = False
+        mail.username = mail.password = None
+        mail.suppress = False
+        mail.default_sender = "portfolio@example.com"
+        isolated_app.config["CONTACT_RECIPIENT"] = "owner@example.com"
+        yield server
+
+@pytest.fixture()
+def isolated_client(isolated_app):
+    return isolated_app.test_client()
+
+@pytest.fixture()
+def admin_client(isolated_app):
+    """Cliente con sesión de admin ya iniciada (sin pasar por el formulario de login)."""
+    from models import db, User
+    with isolated_app.app_context():
+        user = User(email="admin@example.com", name="Admin", is_admin=True)
+        user.set_password("admin123")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+    client = isolated_app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(user_id)
+        sess["_fresh"] = True
+    return client
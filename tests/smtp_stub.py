@@ -0,0 +1,80 @@
+# tests/smtp_stub.py
+"""
+Servidor SMTP mínimo para tests (sustituto local de un proveedor real).
+Acepta EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP y QUIT; guarda cada mensaje en `messages`
+y cuenta conexiones en `connections`. Con `fail_next=N` responde 451 a los próximos N DATA.
+"""
+import socketserver
+import threading
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply("220 localhost stub ESMTP")
+        mail_from, rcpt = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            cmd = raw.decode(errors="replace").strip()
+            verb = cmd.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self._reply("250 localhost")
+            elif verb == "MAIL":
+                mail_from, rcpt = cmd[10:], []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                rcpt.append(cmd[8:])
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if line in (b".\r\n", b".\n", b""):
+                        break
+                    lines.append(line)
+                with server.lock:
+                    if server.fail_next > 0:
+                        server.fail_next -= 1
+                        self._reply("451 Temporary failure")
+                        continue
+                    server.messages.append({"from": mail_from, "to": rcpt, "data": b"".join(lines)})
+                self._reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        self.fail_next = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,90 @@
+# tests/test_admin_messages.py
+import base64
+import json
+import re
+from datetime import datetime, timedelta
+
+from models import db, ContactMessage
+
+
+def _seed(app, n, processed_every=3):
+    base = datetime(2026, 1, 1)
+    with app.app_context():
+        for i in range(n):
+            db.session.add(ContactMessage(
+                name=f"N{i}", email=f"u{i}@example.com", message=f"msg-{i:03d}",
+                processed=(i % processed_every == 0),
+                created_at=base + timedelta(minutes=i // 2),  # timestamps repetidos a propósito
+            ))
+        db.session.commit()
+
+
+def _ids_on_page(html):
+    return [int(i) for i in re.findall(r'name="ids" value="(\d+)"', html)]
+
+
+def _walk(client, url):
+    seen, pages = [], 0
+    while url:
+        html = client.get(url).get_data(as_text=True)
+        seen += _ids_on_page(html)
+        pages += 1
+        nxt = re.search(r'href="([^"]*after=[^"]*)"[^>]*>Next', html)
+        url = nxt.group(1).replace("&amp;", "&") if nxt else None
+    return seen, pages
+
+
+def test_keyset_pages_cover_inbox_in_order(isolated_app, admin_client):
+    isolated_app.config["ADMIN_PAGE_SIZE"] = 4
+    _seed(isolated_app, 11)
+    seen, pages = _walk(admin_client, "/admin/messages")
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 11
+
+    with isolated_app.app_context():
+        expected = db.session.execute(
+            db.select(ContactMessage.id).order_by(
+                ContactMessage.processed, ContactMessage.created_at.desc(), ContactMessage.id.desc())
+        ).scalars().all()
+    assert seen == expected
+
+
+def test_status_filter(isolated_app, admin_client):
+    _seed(isolated_app, 9)
+    seen, _ = _walk(admin_client, "/admin/messages?status=processed")
+    with isolated_app.app_context():
+        assert all(db.session.get(ContactMessage, i).processed for i in seen)
+    assert len(seen) == 3
+
+
+def test_bulk_actions_are_set_based(isolated_app, admin_client):
+    _seed(isolated_app, 6, processed_every=100)
+    with isolated_app.app_context():
+        ids = db.session.execute(db.select(ContactMessage.id).order_by(ContactMessage.id)).scalars().all()
+
+    resp = admin_client.post("/admin/messages/bulk", data={"action": "processed", "ids": ids[:4]})
+    assert resp.status_code == 302
+    resp = admin_client.post("/admin/messages/bulk", data={"action": "delete", "ids": ids[:2]})
+    assert resp.status_code == 302
+
+    with isolated_app.app_context():
+        rows = {m.id: m.processed for m in db.session.execute(db.select(ContactMessage)).scalars()}
+    assert rows == {ids[2]: True, ids[3]: True, ids[4]: False, ids[5]: False}
+
+
+def test_toggle_and_delete_missing_message_404(admin_client):
+    assert admin_client.post("/admin/messages/999/toggle").status_code == 404
+    assert admin_client.post("/admin/messages/999/delete").status_code == 404
+
+
+def test_mistyped_inbox_cursor_falls_back_to_first_page(isolated_app, admin_client):
+    """Texto en el lugar del booleano processed: primera página, no 500."""
+    isolated_app.config["ADMIN_PAGE_SIZE"] = 4
+    _seed(isolated_app, 6)
+    first = _ids_on_page(admin_client.get("/admin/messages").get_data(as_text=True))
+    for values in (["yes", "2026-01-01T00:00:00", 3], [1, "2026-01-01T00:00:00", 3],
+                   [False, "2026-01-01T00:00:00", [3]]):
+        token = base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+        resp = admin_client.get(f"/admin/messages?after={token}")
+        assert resp.status_code == 200, values
+        assert _ids_on_page(resp.get_data(as_text=True)) == first
@@ -0,0 +1,78 @@
+# tests/test_asgi.py
+import asyncio
+
+from asgi import WSGIAdapter
+from models import db, ContactMessage
+
+
+def _call(app, method, path, body=b"", headers=(), query=b""):
+    """Un request ASGI completo contra el adaptador; devuelve (status, headers, body)."""
+    adapter = WSGIAdapter(app, threads=4)
+    sent = []
+    incoming = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query,
+             "headers": [(k.encode(), v.encode()) for k, v in headers], "http_version": "1.1",
+             "scheme": "http", "server": ("testserver", 80), "client": ("10.0.0.7", 5000)}
+    asyncio.run(adapter(scope, receive, send))
+    adapter.executor.shutdown()
+    start = sent[0]
+    assert start["type"] == "http.response.start"
+    assert sent[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+    return start["status"], dict((k.decode(), v.decode()) for k, v in start["headers"]), \
+        b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def test_get_through_adapter(isolated_app):
+    """GET público: status, headers de la app y cuerpo completo."""
+    status, headers, body = _call(isolated_app, "GET", "/about", headers=[("X-Request-ID", "asgi-1")])
+    assert status == 200
+    assert headers["x-request-id"] == "asgi-1"
+    assert b"</html>" in body
+
+
+def test_contact_post_through_adapter(isolated_app):
+    """POST con cuerpo de formulario: llega a la vista y se guarda en la base."""
+    status, headers, _ = _call(
+        isolated_app, "POST", "/contact",
+        body=b"name=Ana&email=ana%40example.com&message=Hola+desde+ASGI",
+        headers=[("Content-Type", "application/x-www-form-urlencoded")],
+    )
+    assert status == 302
+    with isolated_app.app_context():
+        row = db.session.execute(db.select(ContactMessage)).scalar_one()
+        assert row.message == "Hola desde ASGI"
+
+
+def test_environ_translation():
+    """Query string, headers repetidos, IP del cliente y root_path."""
+    environ = WSGIAdapter.environ({
+        "type": "http", "method": "GET", "path": "/app/projects", "root_path": "/app",
+        "query_string": b"tech=Flask", "headers": [(b"accept", b"a"), (b"accept", b"b"),
+                                                  (b"content-type", b"text/plain"),
+                                                  (b"cookie", b"lang=es"), (b"cookie", b"session=abc")],
+        "client": ("10.0.0.7", 5000), "server": ("example.com", 443), "scheme": "https",
+    }, body=None)
+    assert environ["SCRIPT_NAME"] == "/app" and environ["PATH_INFO"] == "/projects"
+    assert environ["QUERY_STRING"] == "tech=Flask"
+    assert environ["HTTP_ACCEPT"] == "a,b"
+    assert environ["HTTP_COOKIE"] == "lang=es; session=abc"
+    assert environ["CONTENT_TYPE"] == "text/plain"
+    assert environ["REMOTE_ADDR"] == "10.0.0.7"
+    assert environ["wsgi.url_scheme"] == "https"
+
+
+def test_app_without_start_response_gets_500():
+    """Una app WSGI que no llama a start_response: 500, no KeyError en el hilo."""
+    def broken(environ, start_response):
+        return [b""]
+
+    status, _, body = _call(broken, "GET", "/")
+    assert status == 500
+    assert body == b"Internal Server Error"
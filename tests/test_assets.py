@@ -0,0 +1,117 @@
+# tests/test_assets.py
+import gzip
+import os
+import shutil
+
+import pytest
+from flask import Flask, render_template_string
+
+import assets
+
+STATIC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
+
+
+@pytest.fixture
+def built(tmp_path):
+    static = tmp_path / "static"
+    shutil.copytree(STATIC, static, ignore=shutil.ignore_patterns(assets.DIST))
+    (static / "js" / "sprites.js").write_text("export const HUT = '/static/img/mayan_house.png';\n")
+    manifest = assets.build(str(static), variants=False)
+    app = Flask(__name__, static_folder=str(static))
+    assets.init_app(app)
+    return app, manifest
+
+
+def test_manifest_rewrites_imports_and_urls(built):
+    """Los imports ES y los url() apuntan a los nombres con huella."""
+    app, manifest = built
+    files = manifest["files"]
+    dist = os.path.join(app.static_folder, assets.DIST)
+
+    main_js = open(os.path.join(dist, files["js/main.js"])).read()
+    assert "./modules/" + files["js/modules/SkySystem.js"].split("/")[-1] in main_js
+    assert "/*" not in main_js
+
+    css = open(os.path.join(dist, files["css/main.css"])).read()
+    assert files["img/cipitio_peek.png"].split("/")[-1] in css
+    assert "content:'>'" in css  # los strings no se tocan
+
+    sprites = open(os.path.join(dist, files["js/sprites.js"])).read()
+    assert "/static/dist/" + files["img/mayan_house.png"] in sprites
+
+
+def test_fingerprint_changes_with_dependency(tmp_path):
+    """Cambiar un módulo cambia la huella de quien lo importa."""
+    static = tmp_path / "static"
+    shutil.copytree(STATIC, static, ignore=shutil.ignore_patterns(assets.DIST))
+    before = assets.build(str(static), variants=False)["files"]
+    with open(static / "js" / "modules" / "Utils.js", "a") as fh:
+        fh.write("\nexport const changed = 1;\n")
+    after = assets.build(str(static), variants=False)["files"]
+    assert before["js/modules/Utils.js"] != after["js/modules/Utils.js"]
+    assert before["js/modules/SkySystem.js"] != after["js/modules/SkySystem.js"]
+    assert before["js/main.js"] != after["js/main.js"]
+    assert before["js/modules/CubeSystem.js"] == after["js/modules/CubeSystem.js"]
+
+
+def test_url_for_and_immutable_precompressed_serving(built):
+    """url_for('static') usa el manifest; dist/ se sirve immutable y con gzip."""
+    app, manifest = built
+    hashed = manifest["files"]["css/main.css"]
+    with app.test_request_context():
+        html = render_template_string(
+            "{{ url_for('static', filename='css/main.css') }}|{{ asset_preloads('js/main.js') }}")
+    assert html.startswith(f"/static/dist/{hashed}|")
+    assert html.count('rel="modulepreload"') == 9  # todo el grafo de main.js
+
+    client = app.test_client()
+    resp = client.get(f"/static/dist/{hashed}", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"] == assets.IMMUTABLE
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.mimetype == "text/css"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert gzip.decompress(resp.data).startswith(b"@import")
+
+    plain = client.get(f"/static/dist/{hashed}")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.data.startswith(b"@import")
+
+    # Los nombres lógicos siguen funcionando (sin caché immutable)
+    legacy = client.get("/static/css/main.css")
+    assert legacy.status_code == 200
+    assert "immutable" not in legacy.headers.get("Cache-Control", "")
+
+
+def test_without_manifest_nothing_changes(tmp_path):
+    """Sin `flask assets-build` las URLs son las de siempre."""
+    app = Flask(__name__, static_folder=str(tmp_path / "static"))
+    assets.init_app(app)
+    with app.test_request_context():
+        assert render_template_string(
+            "{{ url_for('static', filename='css/main.css') }}{{ asset_preloads('js/main.js') }}"
+        ) == "/static/css/main.css"
+
+
+@pytest.mark.parametrize("source, kept", [
+    # "/" después de return / typeof / case...: regex, aunque tenga "/*" o "//" dentro
+    ("function f(s){\n  return /[/*]/.test(s) // x\n}\nconst y = 1 /* c */ + 2\n", "return /[/*]/.test(s)"),
+    ("function g(p){ return /\\/*$/.test(p) }\n", "return /\\/*$/.test(p)"),
+    ("const t = typeof /x\\/\\//;\n", "typeof /x\\/\\//"),
+    ("switch (k) { case /a\\/*/.source: break }\n", "case /a\\/*/.source"),
+    ("function* h(){ yield /\\/\\/ok/ }\n", "yield /\\/\\/ok/"),
+    # y sigue siendo división después de un identificador o una propiedad .of / .in
+    ("const r = total / count / 2; // avg\n", "const r = total / count / 2;"),
+    ("const q = range.of / 2 /* half */\n", "const q = range.of / 2"),
+])
+def test_minify_js_regex_after_keywords(source, kept):
+    out = assets.minify_js(source)
+    assert kept in out
+    assert "const y = 1  + 2" in out or "const y" not in source
+
+
+@pytest.mark.parametrize("source", ["const s = 'abc\nx = 1 /* c */\n", "const t = `abc /* c */\n"])
+def test_minify_js_unterminated_literal_fails(source):
+    """Un literal sin cerrar corta el build en vez de borrar código como comentario."""
+    with pytest.raises(ValueError, match="Unterminated"):
+        assets.minify_js(source)
@@ -0,0 +1,93 @@
+# tests/test_conditional_get.py
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from models import db, Project
+
+
+def _seed(app):
+    with app.app_context():
+        p = Project(title="Etag", slug="etag", summary="v1")
+        db.session.add(p)
+        db.session.commit()
+        return p.id
+
+
+def test_detail_returns_304_for_matching_etag(isolated_app, isolated_client):
+    _seed(isolated_app)
+    first = isolated_client.get("/projects/etag")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert first.headers["Last-Modified"]
+
+    again = isolated_client.get("/projects/etag", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == etag
+
+
+def test_if_modified_since(isolated_app, isolated_client):
+    _seed(isolated_app)
+    future = (datetime.now(timezone.utc) + timedelta(hours=1)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    past = "Mon, 01 Jan 2001 00:00:00 GMT"
+    assert isolated_client.get("/projects", headers={"If-Modified-Since": future}).status_code == 304
+    assert isolated_client.get("/projects", headers={"If-Modified-Since": past}).status_code == 200
+
+
+def test_etag_changes_with_content_and_language(isolated_app, isolated_client):
+    pid = _seed(isolated_app)
+    etag = isolated_client.get("/projects/etag").headers["ETag"]
+    list_etag = isolated_client.get("/projects").headers["ETag"]
+
+    isolated_client.get("/switch_lang/es")
+    assert isolated_client.get("/projects/etag").headers["ETag"] != etag
+    isolated_client.get("/switch_lang/en")
+
+    with isolated_app.app_context():
+        db.session.get(Project, pid).summary = "v2"
+        db.session.commit()
+        # Un alta también debe cambiar el ETag del listado
+        db.session.add(Project(title="Other", slug="other"))
+        db.session.commit()
+
+    resp = isolated_client.get("/projects/etag", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert isolated_client.get("/projects").headers["ETag"] != list_etag
+
+
+def test_list_etag_changes_on_delete_and_bulk_update(isolated_app, isolated_client):
+    pid = _seed(isolated_app)
+    etag = isolated_client.get("/projects").headers["ETag"]
+
+    with isolated_app.app_context():
+        db.session.execute(db.update(Project).values(summary="masivo"))
+        db.session.commit()
+    bulk_etag = isolated_client.get("/projects").headers["ETag"]
+    assert bulk_etag != etag
+
+    with isolated_app.app_context():
+        db.session.delete(db.session.get(Project, pid))
+        db.session.commit()
+    assert isolated_client.get("/projects", headers={"If-None-Match": bulk_etag}).status_code == 200
+
+
+def test_list_version_does_not_scan_projects(isolated_app, isolated_client):
+    """Un 304 del listado no consulta la tabla projects (solo la fila de content_versions)."""
+    _seed(isolated_app)
+    etag = isolated_client.get("/projects").headers["ETag"]
+    seen = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    with isolated_app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        assert isolated_client.get("/projects", headers={"If-None-Match": etag}).status_code == 304
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+    assert seen and not any("FROM projects" in s for s in seen)
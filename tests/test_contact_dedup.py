@@ -0,0 +1,42 @@
+# tests/test_contact_dedup.py
+from datetime import datetime, timedelta
+
+from models import db, ContactMessage, message_hash
+
+
+def _post(client, message, email="ana@example.com"):
+    return client.post("/contact", data={"name": "Ana", "email": email, "message": message})
+
+
+def _count(app):
+    with app.app_context():
+        return db.session.query(ContactMessage).count()
+
+
+def test_content_hash_filled_on_insert(isolated_app):
+    with isolated_app.app_context():
+        row = ContactMessage(name="A", email="a@example.com", message="hola")
+        db.session.add(row)
+        db.session.commit()
+        assert row.content_hash == message_hash("hola")
+
+
+def test_duplicate_in_window_is_dropped(isolated_app, isolated_client):
+    _post(isolated_client, "Mismo texto")
+    _post(isolated_client, "Mismo texto")
+    assert _count(isolated_app) == 1
+
+    # Otro texto u otro remitente no son duplicados
+    _post(isolated_client, "Mismo texto!")
+    _post(isolated_client, "Mismo texto", email="otra@example.com")
+    assert _count(isolated_app) == 3
+
+
+def test_duplicate_outside_window_is_accepted(isolated_app, isolated_client):
+    _post(isolated_client, "Repetido más tarde")
+    with isolated_app.app_context():
+        row = db.session.execute(db.select(ContactMessage)).scalar_one()
+        row.created_at = datetime.utcnow() - timedelta(minutes=5)
+        db.session.commit()
+    _post(isolated_client, "Repetido más tarde")
+    assert _count(isolated_app) == 2
@@ -0,0 +1,87 @@
+# tests/test_db_profiles.py
+import threading
+
+from sqlalchemy import text
+
+import db_profiles
+from models import db, ContactMessage, Project
+
+
+def test_sqlite_pragmas_applied_on_connect(isolated_app):
+    """Cada conexión del pool sale en WAL, con busy_timeout y mmap."""
+    with isolated_app.app_context():
+        assert db.session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert db.session.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert db.session.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert db.session.execute(text("PRAGMA mmap_size")).scalar() == 256 * 1024 * 1024
+
+
+def test_postgres_pool_sized_by_workers():
+    """workers × (pool + overflow) nunca supera DB_MAX_CONNECTIONS."""
+    config = {"DB_WORKERS": 4, "DB_THREADS_PER_WORKER": 4, "JOB_WORKER_THREADS": 2, "DB_MAX_CONNECTIONS": 90}
+    opts = db_profiles.engine_options("postgresql://app@db/portfolio", config)
+    assert opts["pool_size"] == 6
+    assert opts["max_overflow"] == 16
+    assert opts["pool_pre_ping"] and opts["pool_recycle"] == 1800
+    assert db_profiles.engine_options("sqlite:////tmp/x.db", config) == {}
+
+    crowded = db_profiles.pool_options({**config, "DB_WORKERS": 30})
+    assert crowded["pool_size"] + crowded["max_overflow"] == 3
+
+
+def test_replica_pool_shares_or_owns_budget():
+    """Con réplica: mitad del presupuesto cada una, o DB_REPLICA_MAX_CONNECTIONS propio."""
+    config = {"DB_WORKERS": 4, "DB_THREADS_PER_WORKER": 4, "JOB_WORKER_THREADS": 2, "DB_MAX_CONNECTIONS": 90,
+              "DB_REPLICA_URI": "postgresql://app@replica/portfolio"}
+    primary = db_profiles.engine_options("postgresql://app@db/portfolio", config)
+    replica = db_profiles.replica_engine_options(config["DB_REPLICA_URI"], config)
+    per_worker = lambda o: o["pool_size"] + o["max_overflow"]
+    assert 4 * (per_worker(primary) + per_worker(replica)) <= 90
+    assert replica["pool_size"] == 4  # solo hilos de request
+
+    own = db_profiles.replica_engine_options(config["DB_REPLICA_URI"], {**config, "DB_REPLICA_MAX_CONNECTIONS": 40})
+    assert 4 * per_worker(own) <= 40
+    assert per_worker(db_profiles.engine_options("postgresql://app@db/portfolio",
+                                                 {**config, "DB_REPLICA_MAX_CONNECTIONS": 40})) == 22
+
+
+def test_concurrent_contact_writes_and_public_reads(isolated_app):
+    """Escritores (/contact) y lectores (/projects, detalle) a la vez: sin 'database is locked'."""
+    for limiter in isolated_app.extensions["limiter"]:
+        limiter.enabled = False
+    with isolated_app.app_context():
+        for i in range(20):
+            db.session.add(Project(title=f"P{i}", slug=f"p-{i}", tech_stack="Flask"))
+        db.session.commit()
+
+    errors, statuses = [], []
+
+    def writer(w):
+        client = isolated_app.test_client()
+        for i in range(15):
+            resp = client.post("/contact", data={
+                "name": "Ana", "email": f"w{w}@example.com", "message": f"Mensaje {w}-{i}"})
+            statuses.append(resp.status_code)
+
+    def reader(r):
+        client = isolated_app.test_client()
+        for i in range(15):
+            path = "/projects" if i % 2 else f"/projects/p-{(r + i) % 20}"
+            statuses.append(client.get(path).status_code)
+
+    def guarded(fn, arg):
+        try:
+            fn(arg)
+        except Exception as exc:  # noqa: BLE001 - se reporta abajo
+            errors.append(exc)
+
+    threads = [threading.Thread(target=guarded, args=(fn, n)) for n in range(4) for fn in (writer, reader)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert set(statuses) <= {200, 302}
+    with isolated_app.app_context():
+        assert db.session.query(ContactMessage).count() == 60
@@ -0,0 +1,56 @@
+# tests/test_i18n.py
+import pytest
+
+import i18n
+from models import db, Project
+
+
+def test_catalogs_are_frozen_and_complete():
+    """El catálogo es inmutable y cada idioma tiene todas las claves del idioma base."""
+    with pytest.raises(TypeError):
+        i18n.CATALOGS["es"]["home"] = "x"
+    base = set(i18n.CATALOGS[i18n.DEFAULT_LANG])
+    for catalog in i18n.CATALOGS.values():
+        assert set(catalog) >= base
+
+
+def test_language_resolved_once_per_request(isolated_app, isolated_client):
+    """g.lang sale de la sesión; un idioma desconocido cae al idioma base."""
+    with isolated_client.session_transaction() as sess:
+        sess["lang"] = "es"
+    html = isolated_client.get("/").get_data(as_text=True)
+    assert '<html lang="es">' in html
+    assert "Inicio" in html
+
+    with isolated_client.session_transaction() as sess:
+        sess["lang"] = "fr"
+    html = isolated_client.get("/").get_data(as_text=True)
+    assert '<html lang="en">' in html
+
+
+def test_localized_columns_with_fallback(isolated_app, isolated_client):
+    """title_es se muestra en español; vacío cae al título en inglés."""
+    with isolated_app.app_context():
+        db.session.add(Project(title="Weather App", slug="weather", title_es="App del Clima",
+                               summary="Forecasts", summary_es=""))
+        db.session.commit()
+
+    html = isolated_client.get("/projects/weather").get_data(as_text=True)
+    assert "Weather App" in html and "App del Clima" not in html
+
+    isolated_client.get("/switch_lang/es")
+    html = isolated_client.get("/projects/weather").get_data(as_text=True)
+    assert "App del Clima" in html
+    assert "Forecasts" in html
+
+
+def test_admin_form_saves_spanish_fields(isolated_app, admin_client):
+    """El formulario del admin guarda las columnas *_es."""
+    resp = admin_client.post("/admin/projects/new", data={
+        "title": "Chat Bot", "slug": "chat-bot", "title_es": "Bot de Chat",
+        "summary_es": "Resumen", "description_es": "Descripción",
+    })
+    assert resp.status_code == 302
+    with isolated_app.app_context():
+        p = db.session.execute(db.select(Project).filter_by(slug="chat-bot")).scalar_one()
+        assert (p.title_es, p.summary_es, p.description_es) == ("Bot de Chat", "Resumen", "Descripción")
@@ -0,0 +1,81 @@
+# tests/test_images.py
+import json
+import os
+import re
+import shutil
+
+import pytest
+from flask import Flask, render_template_string
+
+import assets
+import images
+
+STATIC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
+
+MANIFEST = {
+    "files": {"img/logo.png": "img/logo.abc.png"},
+    "imports": {},
+    "images": {
+        "img/logo.png": {
+            "width": 500, "height": 250, "type": "image/png",
+            "sources": {
+                "image/webp": [[240, "img/logo.240w.w1.webp"], [500, "img/logo.500w.w2.webp"]],
+                "image/png": [[240, "img/logo.240w.p1.png"], [500, "img/logo.500w.p2.png"]],
+            },
+        },
+    },
+}
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__, static_folder=str(tmp_path / "static"))
+    assets.init_app(app)
+    app.extensions["assets"] = MANIFEST
+    return app
+
+
+def test_picture_lists_sources_and_fallback(app):
+    """<picture> con <source> WebP y <img> PNG con srcset, tamaño intrínseco y lazy."""
+    with app.test_request_context():
+        html = render_template_string(
+            "{{ picture('img/logo.png', 'Logo', sizes='120px', class_='brand') }}")
+    assert html.startswith("<picture><source type=\"image/webp\"")
+    assert "/static/dist/img/logo.240w.w1.webp 240w, /static/dist/img/logo.500w.w2.webp 500w" in html
+    assert 'src="/static/dist/img/logo.500w.p2.png"' in html
+    assert 'width="500" height="250"' in html
+    assert 'class="brand"' in html and 'loading="lazy"' in html and 'sizes="120px"' in html
+
+
+def test_picture_without_variants_is_plain_img(app):
+    """Sin derivados (sin Pillow o sin build) queda un <img> normal."""
+    with app.test_request_context():
+        html = render_template_string("{{ picture('img/other.png', '<alt>') }}")
+    assert html.startswith('<img src="/static/img/other.png" alt="&lt;alt&gt;"')
+
+
+def test_asset_image_map_json(app):
+    """El mapa para AssetLoader.js es JSON válido y no puede cerrar el <script>."""
+    with app.test_request_context():
+        html = render_template_string("{{ asset_image_map('img/logo.png', 'img/</script>.png') }}")
+    payload = re.search(r'id="asset-images">(.*)</script>$', html).group(1)
+    assert "</script>.png" not in payload
+    data = json.loads(payload)
+    assert data["img/logo.png"]["sources"][0]["type"] == "image/webp"
+    assert data["img/logo.png"]["src"] == "/static/dist/img/logo.500w.p2.png"
+    assert data["img/</script>.png"]["src"].endswith(".png")
+
+
+def test_build_generates_smaller_variants(tmp_path):
+    """Con Pillow: anchos <= original, WebP presente y mucho más liviano en móvil."""
+    pytest.importorskip("PIL")
+    static = tmp_path / "static"
+    shutil.copytree(STATIC, static, ignore=shutil.ignore_patterns(assets.DIST))
+    manifest = assets.build(str(static))
+
+    entry = manifest["images"]["img/cadejo_face.png"]
+    assert entry["width"] == 500
+    webp = entry["sources"]["image/webp"]
+    assert [w for w, _ in webp] == [120, 240, 480, 500]
+    small = os.path.getsize(static / assets.DIST / webp[1][1])
+    assert small * 5 < os.path.getsize(static / "img" / "cadejo_face.png")
@@ -0,0 +1,72 @@
+# tests/test_jobs.py
+from datetime import datetime, timedelta, timezone
+
+import jobs
+from models import db, Job, ContactMessage
+
+
+def _post_contact(client, message="Hola, me interesa tu trabajo"):
+    return client.post("/contact", data={
+        "name": "Ana", "email": "ana@example.com", "message": message,
+    })
+
+
+def test_contact_enqueues_durable_job(isolated_app, isolated_client, smtp_stub):
+    """El POST no envía nada: deja el mensaje y su trabajo confirmados en la DB."""
+    assert _post_contact(isolated_client).status_code == 302
+    assert smtp_stub.messages == []
+
+    with isolated_app.app_context():
+        row = db.session.execute(db.select(ContactMessage)).scalar_one()
+        assert row.delivery_status == Job.PENDING
+
+        assert jobs.run_pending() == 1
+        db.session.refresh(row)
+        assert row.delivery_status == Job.DONE
+
+    assert len(smtp_stub.messages) == 1
+    assert smtp_stub.messages[0]["to"] == ["<owner@example.com>"]
+    assert b"Hola, me interesa tu trabajo" in smtp_stub.messages[0]["data"]
+
+
+def test_failed_job_backs_off_then_dies(isolated_app, isolated_client, smtp_stub):
+    isolated_app.config.update(JOB_MAX_ATTEMPTS=2, JOB_BACKOFF_BASE=60)
+    smtp_stub.fail_next = 10
+    _post_contact(isolated_client)
+
+    with isolated_app.app_context():
+        jobs.run_pending()
+        job = db.session.execute(db.select(Job)).scalar_one()
+        assert (job.status, job.attempts) == (Job.PENDING, 1)
+        assert "451" in job.last_error
+        run_at = job.run_at.replace(tzinfo=timezone.utc)
+        assert run_at > datetime.now(timezone.utc) + timedelta(seconds=50)
+
+        # Todavía no toca: el backoff lo mantiene fuera de la cola
+        assert jobs.run_pending() == 0
+
+        job.run_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.session.commit()
+        jobs.run_pending()
+        db.session.refresh(job)
+        assert (job.status, job.attempts) == (Job.DEAD, 2)
+    assert smtp_stub.messages == []
+
+
+def test_claim_is_exclusive_and_recovers_stale_locks(isolated_app):
+    with isolated_app.app_context():
+        for i in range(3):
+            jobs.enqueue("email", {"n": i})
+        db.session.commit()
+
+        first = jobs.claim("worker-a", limit=2)
+        second = jobs.claim("worker-b", limit=10)
+        assert len(first) == 2 and len(second) == 1
+        assert not {j.id for j in first} & {j.id for j in second}
+        assert jobs.claim("worker-c") == []
+
+        # Un worker que murió con el trabajo reservado: vuelve a la cola al vencer el lease
+        stale = first[0]
+        stale.locked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.session.commit()
+        assert [j.id for j in jobs.claim("worker-c")] == [stale.id]
@@ -0,0 +1,88 @@
+# tests/test_logging.py
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+import logging_setup
+
+
+@pytest.fixture
+def log_file(isolated_app, tmp_path):
+    path = tmp_path / "logs" / "app.log"
+    isolated_app.config.update(LOG_FILE=str(path), LOG_SAMPLE_RATES={})
+    logging_setup.configure(isolated_app.config)
+    yield path
+    isolated_app.config["LOG_FILE"] = ""
+    logging_setup.configure(isolated_app.config)
+
+
+def _entries(path):
+    logging_setup.shutdown()  # vacía la cola
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_request_id_generated_or_propagated(isolated_client):
+    """Cada respuesta lleva X-Request-ID; uno entrante válido se respeta."""
+    generated = isolated_client.get("/about").headers["X-Request-ID"]
+    assert len(generated) == 32
+    assert isolated_client.get("/about", headers={"X-Request-ID": "lb-42"}).headers["X-Request-ID"] == "lb-42"
+    assert isolated_client.get("/about", headers={"X-Request-ID": "a b<c>"}).headers["X-Request-ID"] != "a b<c>"
+
+
+def test_invalid_form_logs_json_with_field_names_only(log_file, isolated_client):
+    """El log del formulario inválido es JSON, lleva request_id y no los valores enviados."""
+    isolated_client.post("/contact", data={"name": "Ana", "email": "secreto-no-valido", "message": ""},
+                         headers={"X-Request-ID": "req-1"})
+    entry = next(e for e in _entries(log_file) if e.get("event") == "contact.invalid")
+    assert entry["request_id"] == "req-1"
+    assert entry["level"] == "INFO"
+    assert set(entry["fields"]) >= {"email", "message"}
+    assert "secreto" not in json.dumps(entry)
+
+
+def test_high_volume_events_are_sampled(isolated_app, log_file, isolated_client):
+    """Con tasa 0 los duplicados no se registran; el guardado sí."""
+    isolated_app.config["LOG_SAMPLE_RATES"] = {"contact.duplicate": 0.0}
+    logging_setup.configure(isolated_app.config)
+    for _ in range(3):
+        isolated_client.post("/contact", data={"name": "Ana", "email": "ana@example.com", "message": "Hola"})
+    events = [e.get("event") for e in _entries(log_file)]
+    assert events.count("contact.saved") == 1
+    assert "contact.duplicate" not in events
+
+
+def test_file_rotates_by_size(isolated_app, log_file):
+    """LOG_MAX_BYTES pequeño -> archivos de respaldo, nunca más de LOG_BACKUP_COUNT."""
+    isolated_app.config.update(LOG_MAX_BYTES=2000, LOG_BACKUP_COUNT=2)
+    logging_setup.configure(isolated_app.config)
+    log = logging.getLogger("test.rotation")
+    for i in range(200):
+        log.warning("line %d", i, extra={"event": "test.fill"})
+    logging_setup.shutdown()
+    names = sorted(p.name for p in log_file.parent.iterdir())
+    assert names == ["app.log", "app.log.1", "app.log.2"]
+
+
+def test_slow_sink_does_not_block_caller(isolated_app, log_file):
+    """La escritura ocurre en el listener: un destino lento no frena al que loguea."""
+    release = threading.Event()
+
+    class Slow(logging.Handler):
+        def emit(self, record):
+            release.wait(5)
+
+    handler = logging_setup.configure(isolated_app.config)
+    handler.stop()
+    handler.outputs.append(Slow())
+    try:
+        start = time.perf_counter()
+        for _ in range(50):
+            logging.getLogger("test.slow").warning("x")
+        assert time.perf_counter() - start < 0.5
+    finally:
+        release.set()
+        handler.outputs.pop()
+        handler.stop()
@@ -0,0 +1,43 @@
+# tests/test_mail_transport.py
+import jobs
+from models import db
+
+
+def _enqueue(app, n):
+    with app.app_context():
+        for i in range(n):
+            jobs.enqueue("email", {"subject": f"#{i}", "recipients": ["owner@example.com"], "body": "x"})
+        db.session.commit()
+
+
+def test_batch_reuses_one_connection(isolated_app, smtp_stub):
+    _enqueue(isolated_app, 5)
+    with isolated_app.app_context():
+        assert jobs.run_pending() == 5
+        isolated_app.extensions["smtp_pool"].close()
+    assert len(smtp_stub.messages) == 5
+    assert smtp_stub.connections == 1
+
+
+def test_reconnects_after_max_emails(isolated_app, smtp_stub):
+    isolated_app.extensions["mail"].max_emails = 2
+    _enqueue(isolated_app, 5)
+    with isolated_app.app_context():
+        jobs.run_pending()
+        isolated_app.extensions["smtp_pool"].close()
+    assert len(smtp_stub.messages) == 5
+    assert smtp_stub.connections == 3
+
+
+def test_dead_connection_is_replaced(isolated_app, smtp_stub):
+    """Si el servidor cerró la conexión keep-alive, se reabre y el correo sale igual."""
+    pool = isolated_app.extensions["smtp_pool"]
+    _enqueue(isolated_app, 1)
+    with isolated_app.app_context():
+        jobs.run_pending()
+        pool._local.conn.host.close()   # simula un timeout del proveedor
+        _enqueue(isolated_app, 1)
+        assert jobs.run_pending() == 1
+        pool.close()
+    assert len(smtp_stub.messages) == 2
+    assert smtp_stub.connections == 2
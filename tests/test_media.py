@@ -0,0 +1,105 @@
+# tests/test_media.py
+import io
+import os
+
+import pytest
+
+import jobs
+import media
+from models import db, Job, Project
+
+DIGEST = "ab" * 32
+
+
+@pytest.fixture
+def media_app(isolated_app, tmp_path):
+    isolated_app.config["MEDIA_ROOT"] = str(tmp_path / "media")
+    return isolated_app
+
+
+def _jpeg_with_exif(size=(2000, 1000)):
+    from PIL import Image
+    img = Image.new("RGB", size, (200, 40, 40))
+    exif = Image.Exif()
+    exif[0x010F] = "SecretCam"  # Make
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", exif=exif.tobytes())
+    return buf.getvalue()
+
+
+def test_cover_url_falls_back_to_manual_url(media_app):
+    """Sin archivo subido se usa la URL manual de siempre."""
+    with media_app.test_request_context():
+        assert media.cover_url(Project(cover_image="https://x/y.png", cover_hash="")) == "https://x/y.png"
+        assert media.cover_url(Project(cover_image="", cover_hash=DIGEST), "large") == f"/media/{DIGEST}/large.webp"
+
+
+def test_media_route_rejects_unknown(media_app, isolated_client):
+    """Hash inválido, variante desconocida u original inexistente -> 404."""
+    assert isolated_client.get("/media/../../etc/thumb.webp").status_code == 404
+    assert isolated_client.get(f"/media/{DIGEST}/huge.webp").status_code == 404
+    assert isolated_client.get(f"/media/{DIGEST}/thumb.webp").status_code == 404
+
+
+@pytest.mark.skipif(media.available(), reason="solo sin Pillow")
+def test_upload_without_pillow_is_rejected(media_app, admin_client):
+    """Sin Pillow la subida falla con un error en el formulario, no con un 500."""
+    resp = admin_client.post("/admin/projects/new", data={
+        "title": "Cover", "slug": "cover",
+        "cover_upload": (io.BytesIO(b"GIF89a"), "cover.gif"),
+    }, content_type="multipart/form-data")
+    assert resp.status_code == 200
+    assert b"require Pillow" in resp.data
+    with media_app.app_context():
+        assert db.session.execute(db.select(Project).filter_by(slug="cover")).scalar() is None
+
+
+def test_upload_stores_original_and_worker_builds_variants(media_app, admin_client):
+    """Subida -> original en el almacén + trabajo en cola; el worker genera WebP limpios."""
+    pytest.importorskip("PIL")
+    from PIL import Image
+
+    resp = admin_client.post("/admin/projects/new", data={
+        "title": "Cover", "slug": "cover",
+        "cover_upload": (io.BytesIO(_jpeg_with_exif()), "cover.jpg"),
+    }, content_type="multipart/form-data")
+    assert resp.status_code == 302
+
+    with media_app.app_context():
+        p = db.session.execute(db.select(Project).filter_by(slug="cover")).scalar_one()
+        digest = p.cover_hash
+        assert os.path.exists(media._original_path(digest))
+        job = db.session.execute(db.select(Job).filter_by(kind="cover_variants")).scalar_one()
+        assert job.status == Job.PENDING
+        jobs.run_pending()
+        for variant, width in media_app.config["MEDIA_VARIANTS"].items():
+            with Image.open(media._variant_path(digest, variant)) as img:
+                assert img.format == "WEBP"
+                assert img.width == width
+                assert not img.getexif()
+
+    resp = admin_client.get(f"/media/{digest}/thumb.webp")
+    assert resp.status_code == 200
+    assert resp.mimetype == "image/webp"
+    assert "immutable" in resp.headers["Cache-Control"]
+
+
+def test_variant_rendered_on_demand_before_worker(media_app, isolated_client):
+    """Si el worker aún no corrió, el primer request genera el derivado."""
+    pytest.importorskip("PIL")
+    with media_app.test_request_context():
+        from werkzeug.datastructures import FileStorage
+        digest = media.store_upload(FileStorage(io.BytesIO(_jpeg_with_exif((300, 200))), "c.jpg"))
+    resp = isolated_client.get(f"/media/{digest}/large.webp")
+    assert resp.status_code == 200
+    with media_app.app_context():
+        assert os.path.exists(media._variant_path(digest, "large"))
+
+
+def test_non_image_upload_is_rejected(media_app):
+    """Un archivo que no es imagen no llega al almacén."""
+    pytest.importorskip("PIL")
+    from werkzeug.datastructures import FileStorage
+    with media_app.test_request_context():
+        with pytest.raises(media.MediaError):
+            media.store_upload(FileStorage(io.BytesIO(b"<?php echo 1; ?>"), "x.png"))
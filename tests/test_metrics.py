@@ -0,0 +1,115 @@
+# tests/test_metrics.py
+import logging
+import re
+
+import pytest
+
+from models import db, Project
+
+
+def _sample(text, name, **labels):
+    selector = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    match = re.search(rf"^{name}\{{{re.escape(selector)}\}} ([0-9.]+)$", text, re.M)
+    return float(match.group(1)) if match else None
+
+
+def _scrape(app, client):
+    app.config["METRICS_TOKEN"] = "s3cret"
+    return client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).get_data(as_text=True)
+
+
+def _seed(app, n=3):
+    with app.app_context():
+        for i in range(n):
+            db.session.add(Project(title=f"P{i}", slug=f"p-{i}", tech_stack="Flask"))
+        db.session.commit()
+
+
+def test_metrics_count_requests_queries_and_cache(isolated_app, isolated_client):
+    """/metrics agrega por endpoint: requests, SQL, plantillas y resultado de caché."""
+    _seed(isolated_app)
+    isolated_client.get("/projects")
+    isolated_client.get("/projects")  # segundo: hit de page_cache
+    etag = isolated_client.get("/projects").headers["ETag"]
+    isolated_client.get("/projects", headers={"If-None-Match": etag})
+
+    text = _scrape(isolated_app, isolated_client)
+    assert _sample(text, "portfolio_http_requests_total", endpoint="projects_list", method="GET", status="200") == 3
+    assert _sample(text, "portfolio_http_requests_total", endpoint="projects_list", method="GET", status="304") == 1
+    assert _sample(text, "portfolio_http_request_duration_seconds_count", endpoint="projects_list") == 4
+    assert _sample(text, "portfolio_db_queries_total", endpoint="projects_list") >= 4
+    assert _sample(text, "portfolio_template_render_seconds_total", endpoint="projects_list") > 0
+    assert _sample(text, "portfolio_cache_requests_total", endpoint="projects_list", result="miss") == 1
+    assert _sample(text, "portfolio_cache_requests_total", endpoint="projects_list", result="hit") == 2
+    assert _sample(text, "portfolio_cache_requests_total", endpoint="projects_list", result="not_modified") == 1
+
+
+def test_metrics_token(isolated_app, isolated_client):
+    """Sin METRICS_TOKEN /metrics no existe (404); con token exige Bearer."""
+    assert isolated_client.get("/metrics").status_code == 404
+    isolated_app.config["METRICS_TOKEN"] = "s3cret"
+    assert isolated_client.get("/metrics").status_code == 403
+    assert isolated_client.get("/metrics", headers={"Authorization": "Bearer nope"}).status_code == 403
+    resp = isolated_client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    assert resp.headers["Cache-Control"] == "no-store"
+
+
+def test_failed_statements_leave_no_pending_start(isolated_app):
+    """Una sentencia que falla no deja su inicio en conn.info (conexión del pool)."""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    with isolated_app.app_context():
+        with db.engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM no_such_table"))
+            conn.execute(text("SELECT 1"))
+            assert conn.connection.info.get("_metrics_start") == []
+
+
+def test_metrics_exempt_from_rate_limit(isolated_app, isolated_client):
+    """El scrape no cuenta contra el límite por IP (default 50 por hora)."""
+    isolated_app.config["METRICS_TOKEN"] = "s3cret"
+    for _ in range(60):
+        resp = isolated_client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert resp.status_code == 200
+
+
+@pytest.mark.parametrize("propagate", [False, True])
+def test_unhandled_errors_are_counted(isolated_app, isolated_client, propagate):
+    """Una excepción no manejada cuenta como 500 (con o sin after_request)."""
+    @isolated_app.get("/_boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    isolated_app.config["PROPAGATE_EXCEPTIONS"] = propagate
+    if propagate:
+        with pytest.raises(RuntimeError):
+            isolated_client.get("/_boom")
+    else:
+        assert isolated_client.get("/_boom").status_code == 500
+    text = _scrape(isolated_app, isolated_app.test_client())
+    assert _sample(text, "portfolio_http_requests_total", endpoint="boom", method="GET", status="500") == 1
+
+
+def test_server_timing_only_when_enabled(isolated_app, isolated_client):
+    """Server-Timing solo en debug / METRICS_SERVER_TIMING."""
+    assert "Server-Timing" not in isolated_client.get("/about").headers
+    isolated_app.config["METRICS_SERVER_TIMING"] = True
+    header = isolated_client.get("/about").headers["Server-Timing"]
+    assert header.startswith("app;dur=")
+    assert 'db;dur=' in header and "tpl;dur=" in header
+
+
+def test_budget_warning(isolated_app, isolated_client, caplog):
+    """Superar el presupuesto de consultas deja un warning y un contador."""
+    _seed(isolated_app)
+    isolated_app.config["REQUEST_QUERY_BUDGET"] = 0
+    with caplog.at_level(logging.WARNING, logger="metrics"):
+        isolated_client.get("/projects/p-1")
+    assert any("over budget" in r.getMessage() for r in caplog.records)
+    text = _scrape(isolated_app, isolated_client)
+    assert _sample(text, "portfolio_request_budget_exceeded_total", endpoint="project_detail", budget="queries") == 1
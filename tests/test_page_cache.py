@@ -0,0 +1,110 @@
+# tests/test_page_cache.py
+from models import db, Project
+from page_cache import MemoryBackend, SQLiteBackend, LISTS_TAG
+
+
+def _state(app):
+    return app.extensions["page_cache"]
+
+
+def test_memory_backend_lru_and_ttl(monkeypatch):
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", b"A", 60, ["t"])
+    backend.set("b", b"B", 60, [])
+    backend.get("a")                 # 'a' pasa a ser el más reciente
+    backend.set("c", b"C", 60, [])   # desaloja 'b'
+    assert backend.get("b") is None
+    assert backend.get("a") == b"A"
+
+    backend.invalidate(["t"])
+    assert backend.get("a") is None
+
+    backend.set("d", b"D", -1, [])   # ya expirada
+    assert backend.get("d") is None
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    """Dos instancias (dos workers) sobre el mismo archivo ven las mismas entradas."""
+    path = str(tmp_path / "pages.db")
+    worker_a, worker_b = SQLiteBackend(path), SQLiteBackend(path)
+    worker_a.set("k", b"value", 60, [LISTS_TAG])
+    assert worker_b.get("k") == b"value"
+    worker_b.invalidate([LISTS_TAG])
+    assert worker_a.get("k") is None
+
+
+def test_public_pages_served_from_cache(isolated_app, isolated_client):
+    with isolated_app.app_context():
+        db.session.add(Project(title="Cached", slug="cached", tech_stack="Flask"))
+        db.session.commit()
+
+    first = isolated_client.get("/projects/cached")
+    second = isolated_client.get("/projects/cached")
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    assert (_state(isolated_app).hits, _state(isolated_app).misses) == (1, 1)
+
+    # Otro idioma = otra entrada
+    isolated_client.get("/switch_lang/es")
+    isolated_client.get("/projects/cached")
+    assert _state(isolated_app).misses == 2
+
+
+def test_admin_edit_invalidates_only_affected_pages(isolated_app, admin_client):
+    with isolated_app.app_context():
+        db.session.add_all([
+            Project(title="Alpha", slug="alpha", summary="old summary"),
+            Project(title="Beta", slug="beta"),
+        ])
+        db.session.commit()
+        pid = db.session.execute(db.select(Project.id).filter_by(slug="alpha")).scalar()
+
+    for url in ("/projects", "/projects/alpha", "/projects/beta", "/about"):
+        admin_client.get(url)
+
+    resp = admin_client.post(f"/admin/projects/{pid}/edit", data={
+        "title": "Alpha", "slug": "alpha", "summary": "new summary",
+    })
+    assert resp.status_code == 302
+    admin_client.get("/admin")  # consume el flash
+
+    misses = _state(isolated_app).misses
+    assert "new summary" in admin_client.get("/projects/alpha").get_data(as_text=True)
+    assert "new summary" in admin_client.get("/projects").get_data(as_text=True)
+    assert _state(isolated_app).misses == misses + 2
+
+    hits = _state(isolated_app).hits
+    admin_client.get("/projects/beta")
+    admin_client.get("/about")
+    assert _state(isolated_app).hits == hits + 2
+
+
+def test_key_keeps_escaped_query_distinct():
+    """Un & escapado dentro de un valor no se confunde con dos parámetros."""
+    from werkzeug.datastructures import MultiDict
+    from page_cache import PageCache
+    escaped = PageCache.make_key("projects_list", MultiDict([("tech", "a&page=2")]), "en")
+    split = PageCache.make_key("projects_list", MultiDict([("tech", "a"), ("page", "2")]), "en")
+    assert escaped != split
+
+
+def test_hit_keeps_view_headers(isolated_app, isolated_client):
+    """Los headers que pone la vista (Vary, Content-Language...) también salen en un hit."""
+    from page_cache import page_cache
+
+    @isolated_app.get("/_headers")
+    @page_cache.cached()
+    def with_headers():
+        resp = isolated_app.make_response("ok")
+        resp.headers["Content-Language"] = "es"
+        resp.headers["Cache-Control"] = "public, max-age=60"
+        resp.vary.add("Accept-Encoding")
+        resp.set_cookie("personal", "1")
+        return resp
+
+    miss = isolated_client.get("/_headers")
+    hit = isolated_client.get("/_headers")
+    assert _state(isolated_app).hits == 1
+    for name in ("Content-Type", "Content-Language", "Cache-Control", "Vary"):
+        assert hit.headers[name] == miss.headers[name]
+    assert "personal=" not in hit.headers.get("Set-Cookie", "")
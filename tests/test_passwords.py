@@ -0,0 +1,69 @@
+# tests/test_passwords.py
+from werkzeug.security import generate_password_hash
+
+from models import db, User
+
+LOGIN = "/admin/login"
+FAST_POLICY = "pbkdf2:sha256:1000"
+
+
+def _admin(app, password_hash):
+    with app.app_context():
+        db.session.add(User(email="admin@example.com", name="Admin", is_admin=True, password_hash=password_hash))
+        db.session.commit()
+
+
+def _stored_hash(app):
+    with app.app_context():
+        return db.session.execute(db.select(User.password_hash)).scalar_one()
+
+
+def _login(client, password):
+    return client.post(LOGIN, data={"email": "admin@example.com", "password": password})
+
+
+def test_set_password_follows_policy(isolated_app):
+    isolated_app.config["PASSWORD_HASH_METHOD"] = FAST_POLICY
+    with isolated_app.app_context():
+        user = User(email="a@example.com", name="A")
+        user.set_password("s3cret")
+        method, salt, _ = user.password_hash.split("$", 2)
+        assert method == FAST_POLICY and len(salt) == 16
+        assert user.check_password("s3cret") and not user.check_password("nope")
+
+
+def test_login_upgrades_legacy_hash(isolated_app):
+    """Hash viejo (pbkdf2, sal de 8): el login funciona y deja el hash con la política actual."""
+    isolated_app.config["PASSWORD_HASH_METHOD"] = FAST_POLICY
+    _admin(isolated_app, generate_password_hash("admin123", method="pbkdf2:sha256:2000", salt_length=8))
+
+    assert _login(isolated_app.test_client(), "admin123").status_code == 302
+    assert _stored_hash(isolated_app).startswith(FAST_POLICY + "$")
+    # Con el hash nuevo sigue entrando y ya no se re-escribe
+    upgraded = _stored_hash(isolated_app)
+    assert _login(isolated_app.test_client(), "admin123").headers["Location"].endswith("/admin")
+    assert _stored_hash(isolated_app) == upgraded
+
+
+def test_wrong_password_does_not_rehash(isolated_app):
+    isolated_app.config["PASSWORD_HASH_METHOD"] = FAST_POLICY
+    legacy = generate_password_hash("admin123", method="pbkdf2:sha256:2000", salt_length=8)
+    _admin(isolated_app, legacy)
+    assert _login(isolated_app.test_client(), "wrong").headers["Location"].endswith(LOGIN)
+    assert _stored_hash(isolated_app) == legacy
+
+
+def test_busy_hash_slots_return_503(isolated_app):
+    """Sin ranuras libres el login responde 503 + Retry-After en vez de bloquear el hilo."""
+    isolated_app.config.update(PASSWORD_HASH_METHOD=FAST_POLICY, PASSWORD_HASH_WAIT=0.01)
+    _admin(isolated_app, generate_password_hash("admin123", method=FAST_POLICY))
+    slots = isolated_app.extensions["password_slots"]
+    while slots.acquire(blocking=False):
+        pass
+    try:
+        resp = _login(isolated_app.test_client(), "admin123")
+    finally:
+        for _ in range(isolated_app.config["PASSWORD_HASH_CONCURRENCY"]):
+            slots.release()
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"]
@@ -0,0 +1,103 @@
+# tests/test_project_pagination.py
+import base64
+import json
+import re
+from datetime import datetime, timedelta
+
+from models import db, Project
+
+
+def _seed(app, n, tech_every=None):
+    base = datetime(2026, 1, 1)
+    with app.app_context():
+        for i in range(n):
+            stack = "Flask" if tech_every and i % tech_every == 0 else "React"
+            db.session.add(Project(
+                title=f"P{i:03d}", slug=f"p-{i:03d}", tech_stack=stack,
+                created_at=base + timedelta(minutes=i // 2),  # timestamps repetidos a propósito
+            ))
+        db.session.commit()
+        return db.session.execute(
+            db.select(Project.slug).order_by(Project.created_at.desc(), Project.id.desc())
+        ).scalars().all()
+
+
+def _slugs(html):
+    return re.findall(r'href="/projects/(p-\d{3})"', html)
+
+
+def test_archive_first_page_and_json_chain(isolated_app, isolated_client):
+    """Primera página en HTML y el resto por el fragmento JSON, sin huecos ni repetidos."""
+    isolated_app.config["PROJECTS_PAGE_SIZE"] = 4
+    expected = _seed(isolated_app, 10)
+
+    html = isolated_client.get("/projects").get_data(as_text=True)
+    seen = _slugs(html)
+    assert len(seen) == 4
+    nxt = re.search(r'data-next="([^"]+)"', html).group(1).replace("&amp;", "&")
+
+    pages = 1
+    while nxt:
+        data = isolated_client.get(nxt).get_json()
+        seen += _slugs(data["html"])
+        nxt = data["next"]
+        pages += 1
+    assert pages == 3
+    assert seen == expected
+
+
+def test_archive_tech_filter_is_kept_across_pages(isolated_app, isolated_client):
+    """El filtro ?tech= viaja en el enlace de la página siguiente."""
+    isolated_app.config["PROJECTS_PAGE_SIZE"] = 2
+    _seed(isolated_app, 9, tech_every=2)  # 5 proyectos con Flask
+
+    seen, url = [], "/projects/_page?tech=flask"
+    while url:
+        data = isolated_client.get(url).get_json()
+        seen += _slugs(data["html"])
+        url = data["next"]
+    assert sorted(seen) == [f"p-{i:03d}" for i in range(0, 9, 2)]
+
+
+def test_bad_cursor_falls_back_to_first_page(isolated_app, isolated_client):
+    """Un cursor inválido no rompe la página."""
+    isolated_app.config["PROJECTS_PAGE_SIZE"] = 3
+    expected = _seed(isolated_app, 5)
+    resp = isolated_client.get("/projects?after=not-a-cursor")
+    assert resp.status_code == 200
+    assert _slugs(resp.get_data(as_text=True)) == expected[:3]
+
+
+def _cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_mistyped_cursor_falls_back_to_first_page(isolated_app, isolated_client):
+    """JSON válido con tipos que no son los de la columna (objeto, bool por id, null): primera página."""
+    isolated_app.config["PROJECTS_PAGE_SIZE"] = 3
+    expected = _seed(isolated_app, 5)
+    for values in (["2020-01-01T00:00:00", {"a": 1}], ["2020-01-01T00:00:00", True],
+                   [None, 1], [1, 1], ["2020-01-01T00:00:00", "1"]):
+        token = _cursor(values)
+        resp = isolated_client.get(f"/projects?after={token}")
+        assert resp.status_code == 200, values
+        assert _slugs(resp.get_data(as_text=True)) == expected[:3]
+        page = isolated_client.get(f"/projects/_page?after={token}")
+        assert page.status_code == 200, values
+        assert _slugs(page.get_json()["html"]) == expected[:3]
+
+
+def test_admin_dashboard_pages(isolated_app, admin_client):
+    """El dashboard pagina con cursor y recorre todos los proyectos."""
+    isolated_app.config["ADMIN_PAGE_SIZE"] = 4
+    expected = _seed(isolated_app, 9)
+
+    seen, pages, url = [], 0, "/admin"
+    while url:
+        html = admin_client.get(url).get_data(as_text=True)
+        seen += re.findall(r"<td>(p-\d{3})</td>", html)
+        pages += 1
+        nxt = re.search(r'href="([^"]*after=[^"]*)"[^>]*>Next', html)
+        url = nxt.group(1).replace("&amp;", "&") if nxt else None
+    assert pages == 3
+    assert seen == expected
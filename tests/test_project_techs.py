@@ -0,0 +1,43 @@
+# tests/test_project_techs.py
+from models import db, Project, ProjectTech
+
+
+def _add(app, **kwargs):
+    with app.app_context():
+        p = Project(**kwargs)
+        db.session.add(p)
+        db.session.commit()
+        return p.id
+
+
+def test_tech_tags_follow_tech_stack(isolated_app):
+    """Los tags normalizados se crean y se actualizan junto con el CSV."""
+    pid = _add(isolated_app, title="API", slug="api", tech_stack="Python, Flask ,python,")
+    with isolated_app.app_context():
+        p = db.session.get(Project, pid)
+        assert sorted(t.key for t in p.techs) == ["flask", "python"]
+
+        p.tech_stack = "Flask, React"
+        db.session.commit()
+        keys = db.session.execute(
+            db.select(ProjectTech.key).where(ProjectTech.project_id == pid)
+        ).scalars().all()
+        assert sorted(keys) == ["flask", "react"]
+
+        db.session.delete(p)
+        db.session.commit()
+        assert db.session.execute(db.select(ProjectTech)).first() is None
+
+
+def test_tech_filter_is_exact_match(isolated_app, isolated_client):
+    """'Java' no debe devolver proyectos que solo usan JavaScript."""
+    _add(isolated_app, title="Backend Java", slug="backend-java", tech_stack="Java, Spring")
+    _add(isolated_app, title="Frontend JS", slug="frontend-js", tech_stack="JavaScript, React")
+
+    body = isolated_client.get("/projects?tech=java").get_data(as_text=True)
+    assert "Backend Java" in body
+    assert "Frontend JS" not in body
+
+    body = isolated_client.get("/projects?tech=JavaScript").get_data(as_text=True)
+    assert "Frontend JS" in body
+    assert "Backend Java" not in body
@@ -0,0 +1,46 @@
+# tests/test_rate_limit.py
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+import ratelimit_storage  # noqa: F401  (registra sqlite://)
+
+
+def test_contact_post_returns_429_with_retry_after(isolated_app, isolated_client):
+    isolated_app.config["CONTACT_RATE_LIMIT"] = "2 per minute"
+    for i in range(2):
+        resp = isolated_client.post("/contact", data={
+            "name": "Bot", "email": "bot@example.com", "message": f"spam {i}",
+        })
+        assert resp.status_code == 302
+
+    # Los GET no consumen el cupo del formulario
+    assert isolated_client.get("/contact").status_code == 200
+
+    resp = isolated_client.post("/contact", data={
+        "name": "Bot", "email": "bot@example.com", "message": "spam 3",
+    })
+    assert resp.status_code == 429
+    assert 0 < int(resp.headers["Retry-After"]) <= 60
+
+
+def test_sqlite_storage_is_shared_between_workers(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'limits.db'}"
+    worker_a = FixedWindowRateLimiter(storage_from_string(uri))
+    worker_b = FixedWindowRateLimiter(storage_from_string(uri))
+    limit = parse("3 per minute")
+
+    assert worker_a.hit(limit, "1.2.3.4")
+    assert worker_b.hit(limit, "1.2.3.4")
+    assert worker_a.hit(limit, "1.2.3.4")
+    assert not worker_b.hit(limit, "1.2.3.4")
+    assert worker_a.hit(limit, "5.6.7.8")
+    assert worker_b.get_window_stats(limit, "1.2.3.4").remaining == 0
+
+
+def test_admin_login_limit_is_enforced(isolated_client):
+    """El límite de login ya no se pierde al leer app.extensions['limiter'] (un set)."""
+    data = {"email": "x@example.com", "password": "wrong"}
+    codes = [isolated_client.post("/admin/login", data=data).status_code for _ in range(6)]
+    assert codes[:5] == [302] * 5
+    assert codes[5] == 429
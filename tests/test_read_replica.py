@@ -0,0 +1,67 @@
+# tests/test_read_replica.py
+import importlib
+
+import pytest
+
+from models import db, ContactMessage, Project, User
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """Dos SQLite: primaria y "réplica" (sin replicación real: el contenido distinto delata quién respondió)."""
+    monkeypatch.setenv("DB_URI", f"sqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setenv("DB_REPLICA_URI", f"sqlite:///{tmp_path / 'replica.db'}")
+    app = importlib.import_module("app").create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False, JOB_WORKER_THREADS=0)
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(app.extensions["db_replica"])
+        db.session.add(Project(title="Desde primaria", slug="demo", tech_stack="Flask"))
+        db.session.add(User(email="admin@example.com", name="Admin", is_admin=True, password_hash="x"))
+        db.session.commit()
+        with app.extensions["db_replica"].begin() as conn:
+            conn.execute(db.insert(Project), [{"title": "Desde réplica", "slug": "demo", "tech_stack": "Flask"}])
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    app.extensions["db_replica"].dispose()
+
+
+def _admin(app):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = "1"
+        sess["_fresh"] = True
+    return client
+
+
+def test_public_reads_go_to_replica(replica_app):
+    """index / projects_list / project_detail leen de la réplica."""
+    client = replica_app.test_client()
+    assert "Desde réplica" in client.get("/projects/demo").get_data(as_text=True)
+    assert "Desde réplica" in client.get("/projects").get_data(as_text=True)
+
+
+def test_admin_and_contact_stay_on_primary(replica_app):
+    """El admin lee de la primaria y el INSERT de /contact nunca toca la réplica."""
+    assert "Desde primaria" in _admin(replica_app).get("/admin").get_data(as_text=True)
+
+    visitor = replica_app.test_client()
+    visitor.post("/contact", data={"name": "Ana", "email": "ana@example.com", "message": "Hola"})
+    # Anónimo: no vuelve a leer su mensaje, así que no queda fijado a la primaria
+    with visitor.session_transaction() as sess:
+        assert "db_pin" not in sess
+    with replica_app.app_context():
+        assert db.session.query(ContactMessage).count() == 1
+        with replica_app.extensions["db_replica"].connect() as conn:
+            assert conn.execute(db.select(db.func.count()).select_from(ContactMessage)).scalar() == 0
+
+
+def test_admin_reads_own_write_after_save(replica_app):
+    """Tras guardar, el admin queda fijado a la primaria; otro visitante sigue en la réplica."""
+    admin = _admin(replica_app)
+    resp = admin.post("/admin/projects/1/edit", data={"title": "Editado", "slug": "demo", "tech_stack": "Flask"})
+    assert resp.status_code == 302
+    assert "Editado" in admin.get("/projects/demo").get_data(as_text=True)
+    assert "Desde réplica" in replica_app.test_client().get("/projects/demo").get_data(as_text=True)
@@ -0,0 +1,84 @@
+# tests/test_search.py
+import os
+
+import pytest
+
+from models import db, Project
+import search
+
+
+def _seed(app, rows):
+    with app.app_context():
+        for row in rows:
+            db.session.add(Project(**row))
+        db.session.commit()
+
+
+ROWS = [
+    {"title": "Flask Portfolio", "slug": "flask-portfolio", "summary": "Personal site",
+     "description": "Built with Jinja templates", "tech_stack": "Python, Flask"},
+    {"title": "Weather App", "slug": "weather-app", "summary": "Forecast dashboard",
+     "description": "Consumes a Flask API", "tech_stack": "React"},
+    {"title": "Game Engine", "slug": "game-engine", "summary": "Motor 2D",
+     "description": "Renderizado en canvas", "tech_stack": "JavaScript"},
+]
+
+
+def test_search_ranks_title_matches_first(isolated_app):
+    _seed(isolated_app, ROWS)
+    with isolated_app.app_context():
+        results = search.search_projects("flask")
+        assert results.total == 2
+        assert [p.slug for p in results.items] == ["flask-portfolio", "weather-app"]
+
+
+def test_search_prefix_and_pagination(isolated_app):
+    _seed(isolated_app, [
+        {"title": f"Widget {i}", "slug": f"widget-{i}", "tech_stack": "Python"} for i in range(5)
+    ])
+    with isolated_app.app_context():
+        first = search.search_projects("widg", page=1, per_page=2)
+        last = search.search_projects("widg", page=3, per_page=2)
+        assert (first.total, first.pages, first.has_next) == (5, 3, True)
+        assert len(last.items) == 1 and not last.has_next
+
+
+def test_index_follows_edit_and_delete(isolated_app):
+    """Los triggers mantienen el índice al editar y borrar desde el admin."""
+    _seed(isolated_app, ROWS)
+    with isolated_app.app_context():
+        p = db.session.execute(db.select(Project).filter_by(slug="game-engine")).scalar()
+        p.summary = "Physics sandbox"
+        db.session.commit()
+        assert search.search_projects("motor").total == 0
+        assert search.search_projects("physics").total == 1
+
+        db.session.delete(p)
+        db.session.commit()
+        assert search.search_projects("physics").total == 0
+
+
+def test_search_ignores_query_operators(isolated_client):
+    """La entrada del usuario nunca llega cruda al MATCH de FTS5."""
+    resp = isolated_client.get('/search?q=" OR NEAR( *')
+    assert resp.status_code == 200
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URI"), reason="TEST_POSTGRES_URI not set")
+def test_search_postgres(tmp_path, monkeypatch):
+    """Mismo comportamiento con tsvector + GIN (requiere un Postgres local)."""
+    monkeypatch.setenv("DB_URI", os.environ["TEST_POSTGRES_URI"])
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        try:
+            for row in ROWS:
+                db.session.add(Project(**row))
+            db.session.commit()
+            results = search.search_projects("flask")
+            assert [p.slug for p in results.items] == ["flask-portfolio", "weather-app"]
+        finally:
+            db.session.remove()
+            db.drop_all()
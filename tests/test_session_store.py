@@ -0,0 +1,115 @@
+# tests/test_session_store.py
+import pytest
+from flask import flash, get_flashed_messages, redirect
+
+import session_store
+from models import db, User
+
+FAST_POLICY = "pbkdf2:sha256:1000"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store_app(request, tmp_path, isolated_app):
+    """App aislada con SESSION_STORE_URL (memoria y archivo SQLite)."""
+    url = "memory://" if request.param == "memory" else f"sqlite:///{tmp_path / 'sessions.db'}"
+    isolated_app.config["SESSION_STORE_URL"] = url
+    session_store.init_app(isolated_app)
+    return isolated_app
+
+
+def _session_cookie(client, app):
+    return client.get_cookie(app.config.get("SESSION_COOKIE_NAME", "session"))
+
+
+def _session_set_cookies(resp, app):
+    name = app.config.get("SESSION_COOKIE_NAME", "session") + "="
+    return [h for h in resp.headers.getlist("Set-Cookie") if h.startswith(name)]
+
+
+def test_cookie_is_opaque_id(store_app):
+    """La cookie lleva solo el id; lang queda en el store."""
+    client = store_app.test_client()
+    client.get("/switch_lang/en")
+    cookie = _session_cookie(client, store_app)
+    assert cookie is not None and len(cookie.value) == 43
+    raw, _ = store_app.extensions["session_store"].get(cookie.value)
+    assert b'"lang"' in raw and b'"en"' not in cookie.value.encode()
+
+
+def test_unchanged_cookie_not_resent(store_app):
+    """Un segundo /switch_lang actualiza la fila, sin Set-Cookie de sesión."""
+    client = store_app.test_client()
+    first = client.get("/switch_lang/en")
+    assert _session_set_cookies(first, store_app)
+    sid = _session_cookie(client, store_app).value
+    second = client.get("/switch_lang/es")
+    assert not _session_set_cookies(second, store_app)
+    raw, _ = store_app.extensions["session_store"].get(sid)
+    assert b'"es"' in raw
+
+
+def test_flash_survives_redirect(store_app):
+    @store_app.route("/_flash")
+    def _flash():
+        flash("hola", "info")
+        return redirect("/_read")
+
+    @store_app.route("/_read")
+    def _read():
+        return ",".join(get_flashed_messages())
+
+    client = store_app.test_client()
+    assert client.get("/_flash", follow_redirects=True).get_data(as_text=True) == "hola"
+    assert client.get("/_read").get_data(as_text=True) == ""
+
+
+def test_unknown_sid_is_not_adopted(store_app):
+    """Un id que no está en el store (fijación) se ignora y el servidor emite otro."""
+    client = store_app.test_client()
+    planted = "A" * 43
+    client.set_cookie(store_app.config.get("SESSION_COOKIE_NAME", "session"), planted)
+    client.get("/switch_lang/en")
+    assert _session_cookie(client, store_app).value != planted
+    assert store_app.extensions["session_store"].get(planted) is None
+
+
+def test_login_rotates_sid(store_app):
+    store_app.config["PASSWORD_HASH_METHOD"] = FAST_POLICY
+    with store_app.app_context():
+        user = User(email="admin@example.com", name="Admin", is_admin=True)
+        user.set_password("admin123")
+        db.session.add(user)
+        db.session.commit()
+
+    client = store_app.test_client()
+    client.get("/switch_lang/en")
+    before = _session_cookie(client, store_app).value
+    client.post("/admin/login", data={"email": "admin@example.com", "password": "admin123"})
+    after = _session_cookie(client, store_app).value
+    assert after != before
+    assert store_app.extensions["session_store"].get(before) is None
+    assert client.get("/admin").status_code == 200
+
+
+def test_expired_sessions_ignored_and_swept(store_app):
+    store = store_app.extensions["session_store"]
+    store.set("x" * 43, b'{"lang": "en"}', ttl=-1)
+    store.set("y" * 43, b'{"lang": "en"}', ttl=60)
+    assert store.get("x" * 43) is None
+    assert store.sweep() == 1
+    assert store.get("y" * 43) is not None
+
+
+def test_admin_client_works_with_store(tmp_path, isolated_app):
+    """session_transaction (fixture admin_client) también pasa por el store."""
+    isolated_app.config["SESSION_STORE_URL"] = f"sqlite:///{tmp_path / 'sessions.db'}"
+    session_store.init_app(isolated_app)
+    with isolated_app.app_context():
+        db.session.add(User(email="admin@example.com", name="Admin", is_admin=True, password_hash="x"))
+        db.session.commit()
+    client = isolated_app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = "1"
+        sess["_fresh"] = True
+    assert len(_session_cookie(client, isolated_app).value) == 43
+    assert client.get("/admin").status_code == 200
@@ -0,0 +1,27 @@
+# tests/test_startup.py
+import importlib
+
+import click
+from flask.cli import FlaskGroup
+
+
+def test_migrate_only_under_flask_cli(isolated_app, monkeypatch, tmp_path):
+    """Los workers no registran Flask-Migrate; el comando `flask` sí."""
+    assert "migrate" not in isolated_app.extensions
+
+    monkeypatch.setenv("DB_URI", f"sqlite:///{tmp_path / 'cli.db'}")
+    with click.Context(FlaskGroup()):
+        cli_app = importlib.import_module("app").create_app()
+    assert "migrate" in cli_app.extensions
+
+
+def test_jinja_bytecode_cache(monkeypatch, tmp_path):
+    """El primer render deja el bytecode en disco para el próximo worker."""
+    cache_dir = tmp_path / "jinja"
+    monkeypatch.setenv("DB_URI", f"sqlite:///{tmp_path / 'x.db'}")
+    monkeypatch.setenv("JINJA_BYTECODE_CACHE_DIR", str(cache_dir))
+    app = importlib.import_module("app").create_app()
+    app.config.update(TESTING=True, JOB_WORKER_THREADS=0)
+
+    assert app.test_client().get("/about").status_code == 200
+    assert any(cache_dir.iterdir())
@@ -0,0 +1,86 @@
+# tests/test_static_export.py
+import json
+
+from models import db, Project
+import static_export
+
+
+def _seed(app):
+    with app.app_context():
+        db.session.add_all([
+            Project(title="Uno", slug="uno", summary="v1", tech_stack="Flask"),
+            Project(title="Dos", slug="dos", summary="v1", title_es="Dos (ES)", tech_stack="Flask"),
+        ])
+        db.session.commit()
+
+
+def test_export_writes_both_languages_with_live_etags(isolated_app, tmp_path):
+    """Árbol por idioma; el manifest guarda el mismo ETag que sirve Flask."""
+    _seed(isolated_app)
+    stats = static_export.export_site(isolated_app, str(tmp_path))
+    assert stats == {"rendered": 10, "unchanged": 0, "removed": 0, "skipped": 0}  # 2 idiomas x 5 páginas
+
+    assert "Dos (ES)" in (tmp_path / "es/projects/dos/index.html").read_text()
+    assert "Dos (ES)" not in (tmp_path / "en/projects/dos/index.html").read_text()
+    assert (tmp_path / "en/index.html").exists() and (tmp_path / "en/about/index.html").exists()
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())["pages"]
+    live = isolated_app.test_client().get("/projects/uno").headers["ETag"].strip('"')
+    assert manifest["en/projects/uno/index.html"] == live
+
+
+def test_export_is_incremental(isolated_app, tmp_path):
+    """Sin cambios no se renderiza nada; editar un proyecto re-renderiza solo sus páginas."""
+    _seed(isolated_app)
+    static_export.export_site(isolated_app, str(tmp_path))
+    untouched = (tmp_path / "en/projects/dos/index.html").stat().st_mtime_ns
+    assert static_export.export_site(isolated_app, str(tmp_path))["rendered"] == 0
+
+    with isolated_app.app_context():
+        db.session.execute(db.select(Project).filter_by(slug="uno")).scalar_one().summary = "v2"
+        db.session.commit()
+    stats = static_export.export_site(isolated_app, str(tmp_path))
+    # detalle de "uno" + home + listado, en los dos idiomas
+    assert stats["rendered"] == 6
+    assert "v2" in (tmp_path / "en/projects/uno/index.html").read_text()
+    assert (tmp_path / "en/projects/dos/index.html").stat().st_mtime_ns == untouched
+
+
+def test_export_removes_deleted_projects(isolated_app, tmp_path):
+    _seed(isolated_app)
+    static_export.export_site(isolated_app, str(tmp_path))
+    with isolated_app.app_context():
+        db.session.delete(db.session.execute(db.select(Project).filter_by(slug="dos")).scalar_one())
+        db.session.commit()
+    stats = static_export.export_site(isolated_app, str(tmp_path))
+    assert stats["removed"] == 2
+    assert not (tmp_path / "en/projects/dos").exists()
+
+
+def test_export_skips_unsafe_slugs(isolated_app, tmp_path):
+    """Slugs viejos como ".." o "a/b" no pisan la home ni cortan la exportación."""
+    _seed(isolated_app)
+    with isolated_app.app_context():
+        db.session.add_all([Project(title="Dot", slug=".."), Project(title="Nested", slug="a/b")])
+        db.session.commit()
+    stats = static_export.export_site(isolated_app, str(tmp_path))
+    assert stats["rendered"] == 10
+    assert "Dot" not in (tmp_path / "en/index.html").read_text()  # sigue siendo la home
+    assert not (tmp_path / "en/projects/a").exists()
+    pages = json.loads((tmp_path / "manifest.json").read_text())["pages"]
+    assert all(".." not in key.split("/") for key in pages)
+
+
+def test_project_form_rejects_path_like_slugs(isolated_app):
+    from werkzeug.datastructures import MultiDict
+    from forms import ProjectForm
+    with isolated_app.test_request_context():
+        for slug, ok in (("mi-proyecto-2", True), ("..", False), ("a/b", False), ("Upper", False)):
+            form = ProjectForm(formdata=MultiDict({"title": "T", "slug": slug}), meta={"csrf": False})
+            assert form.validate() is ok, slug
+
+
+def test_switch_lang_sets_plain_cookie(isolated_client):
+    """El servidor estático elige el árbol con la cookie `lang` (la sesión va firmada)."""
+    resp = isolated_client.get("/switch_lang/es")
+    assert any(c.startswith("lang=es;") for c in resp.headers.getlist("Set-Cookie"))
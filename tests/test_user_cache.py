@@ -0,0 +1,70 @@
+# tests/test_user_cache.py
+import pytest
+from sqlalchemy import event
+
+from models import db, User
+
+
+@pytest.fixture
+def user_queries(isolated_app):
+    """Lista de SELECT contra users ejecutados durante el test."""
+    seen = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            seen.append(statement)
+
+    with isolated_app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _capture)
+    yield seen
+    event.remove(engine, "before_cursor_execute", _capture)
+
+
+def test_admin_requests_reuse_cached_identity(isolated_app, admin_client, user_queries):
+    """Solo el primer request del admin consulta users; los siguientes salen de la caché."""
+    for _ in range(3):
+        assert admin_client.get("/admin").status_code == 200
+    assert len(user_queries) == 1
+    state = isolated_app.extensions["user_cache"]
+    assert (state.hits, state.misses) == (2, 1)
+
+
+def test_user_change_invalidates(isolated_app, admin_client, user_queries):
+    """Quitar is_admin (o cambiar la contraseña) se nota en el request siguiente, sin esperar el TTL."""
+    assert admin_client.get("/admin").status_code == 200
+    with isolated_app.app_context():
+        db.session.execute(db.select(User)).scalar_one().is_admin = False
+        db.session.commit()
+    assert admin_client.get("/admin").status_code == 403
+    assert isolated_app.extensions["user_cache"].invalidations == 1
+
+
+def test_logout_invalidates(isolated_app, admin_client):
+    admin_client.get("/admin")
+    admin_client.get("/admin/logout")
+    assert isolated_app.extensions["user_cache"].invalidations == 1
+    assert admin_client.get("/admin").status_code in (302, 401, 403)
+
+
+def test_ttl_expiry_and_disable(isolated_app, admin_client, user_queries):
+    """Vencido el TTL se vuelve a consultar; TTL=0 consulta siempre."""
+    admin_client.get("/admin")
+    state = isolated_app.extensions["user_cache"]
+    state._entries = {uid: (0, cached) for uid, (_, cached) in state._entries.items()}  # vencidas
+    admin_client.get("/admin")
+    assert len(user_queries) == 2
+
+    state.ttl = 0
+    admin_client.get("/admin")
+    admin_client.get("/admin")
+    assert len(user_queries) == 4
+
+
+def test_metrics_export_user_cache(isolated_app, admin_client):
+    admin_client.get("/admin")
+    admin_client.get("/admin")
+    isolated_app.config["METRICS_TOKEN"] = "s3cret"
+    body = isolated_app.test_client().get("/metrics", headers={"Authorization": "Bearer s3cret"}).get_data(as_text=True)
+    assert "portfolio_user_cache_hits_total 1" in body
+    assert "portfolio_user_cache_misses_total 1" in body
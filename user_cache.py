@@ -0,0 +1,111 @@
+# user_cache.py
+"""
+Identidad del usuario logueado en caché (TTL corto) para el user_loader de Flask-Login.
+
+Sin caché, cada request con sesión (todo el admin) paga db.session.get(User, id).
+Se guarda una copia inmutable (CachedUser: id, email, name, is_admin), no la
+instancia ORM: no queda atada a la sesión de SQLAlchemy de un request ni a un hilo.
+
+Invalidación en este proceso: logout (señal user_logged_out) y cualquier UPDATE o
+DELETE de la fila (set_password, rehash del login, cambio de is_admin). En los demás
+workers la entrada vence a los USER_CACHE_TTL segundos: esa es la cota de cuánto
+sigue vigente un cambio hecho en otro proceso (p. ej. `flask create-admin`).
+USER_CACHE_TTL=0 desactiva la caché (consulta en cada request, como antes).
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+from flask import current_app, has_app_context
+from flask_login import UserMixin, user_logged_out
+from sqlalchemy import event
+
+from models import db, User
+
+
+@dataclass(frozen=True)
+class CachedUser(UserMixin):
+    id: int
+    email: str
+    name: str
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(id=user.id, email=user.email, name=user.name, is_admin=bool(user.is_admin))
+
+
+class _UserCacheState:
+    """Entradas {user_id: (vence, CachedUser)} + contadores, en app.extensions["user_cache"]."""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, user):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Pocos usuarios (admins): basta con tirar la entrada que vence antes
+                del self._entries[min(self._entries, key=lambda k: self._entries[k][0])]
+            self._entries[user.id] = (time.monotonic() + self.ttl, user)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+
+def load_user(user_id: int):
+    """user_loader: copia en caché si está vigente; si no, una consulta y se guarda."""
+    state = current_app.extensions.get("user_cache")
+    if state is None or state.ttl <= 0:
+        return db.session.get(User, user_id)
+    cached = state.get(user_id)
+    if cached is not None:
+        return cached
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    cached = CachedUser.from_user(user)
+    state.put(cached)
+    return cached
+
+
+def invalidate(user_id) -> None:
+    state = current_app.extensions.get("user_cache")
+    if state is not None and user_id is not None:
+        state.invalidate(int(user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    # Fuera de un app context (scripts sin create_app) no hay caché que limpiar
+    if has_app_context():
+        invalidate(target.id)
+
+
+def _on_logout(sender, user, **extra):
+    invalidate(user.get_id() if user is not None else None)
+
+
+def init_app(app):
+    app.config.setdefault("USER_CACHE_TTL", 30)
+    app.config.setdefault("USER_CACHE_MAX_ENTRIES", 256)
+    app.extensions["user_cache"] = _UserCacheState(int(app.config["USER_CACHE_TTL"]),
+                                                   int(app.config["USER_CACHE_MAX_ENTRIES"]))
+    user_logged_out.connect(_on_logout, app)